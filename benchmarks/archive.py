@@ -0,0 +1,102 @@
+"""Board export and import throughput, and their memory use.
+
+    python -m benchmarks.archive [--tasks N ...]
+
+For each ``--tasks`` size, fills one seeded board up to that many
+tasks (two comments each), then streams its export and imports the
+result as a new board. Prints rows per second and the peak of Python
+allocations (tracemalloc) of each direction; the peak should stay
+about the same as the board grows.
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.common import test_database
+
+
+def grow(board, tasks):
+    from kanmind_app.counters import rebuild_board_stats
+    from kanmind_app.models import Board, Comment, Task
+
+    missing = tasks - board.tasks.count()
+    created = Task.objects.bulk_create(
+        (
+            Task(
+                board=board,
+                title=f"Extra {i}",
+                description="Generated task " * 5,
+                created_by=board.owner,
+            )
+            for i in range(missing)
+        ),
+        batch_size=2000,
+    )
+    Comment.objects.bulk_create(
+        (
+            Comment(task=task, author=board.owner, content="c")
+            for task in created
+            for _ in range(2)
+        ),
+        batch_size=2000,
+    )
+    rebuild_board_stats(Board.objects.filter(pk=board.pk))
+
+
+def timed(fn):
+    """Run ``fn``; returns its result, seconds and peak bytes."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = fn()
+        elapsed = time.perf_counter() - start
+        return result, elapsed, tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--tasks", type=int, nargs="+", default=[5_000, 50_000]
+    )
+    args = parser.parse_args()
+
+    from django.db import transaction
+
+    from kanmind_app.archive import export_board, import_board
+    from kanmind_app.seeding import seed
+
+    with test_database():
+        data = seed()
+        print(
+            f"\n{'tasks':>8}{'rows':>10}{'export rows/s':>16}"
+            f"{'peak MiB':>10}{'import rows/s':>16}{'peak MiB':>10}"
+        )
+        for tasks in sorted(args.tasks):
+            grow(data.board, tasks)
+            rows, export_seconds, export_peak = timed(
+                lambda: sum(
+                    chunk.count(b"\n") for chunk in export_board(data.board)
+                )
+            )
+            # Read before measuring, as a client upload would be
+            archive = b"".join(export_board(data.board)).splitlines()
+            with transaction.atomic():
+                _, import_seconds, import_peak = timed(
+                    lambda: import_board(
+                        iter(archive), data.owner, title="Imported"
+                    )
+                )
+                transaction.set_rollback(True)
+            print(
+                f"{tasks:>8}{rows:>10}{rows / export_seconds:>16,.0f}"
+                f"{export_peak / 2**20:>10.1f}"
+                f"{rows / import_seconds:>16,.0f}"
+                f"{import_peak / 2**20:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Throughput and tail latency of the async views under ASGI vs. WSGI.
+
+    python -m benchmarks.asgi [--clients N] [--requests N]
+                              [--wsgi-workers N] [--db-latency MS]
+
+``--clients`` concurrent clients each send ``--requests`` GETs, one
+after the other. The WSGI path serves them with ``--wsgi-workers``
+threads, like as many sync gunicorn workers; the ASGI path serves all
+of them from one event loop, like one uvicorn worker. ``--db-latency``
+adds a delay to every query to stand in for a database on the network.
+Latencies include the time a request waits for a free worker.
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import test_database
+
+
+def add_db_latency(seconds):
+    """Delay every query on every connection by ``seconds``."""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def delay(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(delay)
+
+    connection_created.connect(install, weak=False)
+    for connection in connections.all():
+        if connection.connection is not None:
+            install(None, connection)
+
+
+def summarize(timings, elapsed):
+    timings.sort()
+    return {
+        "rps": len(timings) / elapsed,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "p99_ms": timings[max(int(len(timings) * 0.99) - 1, 0)] * 1000,
+    }
+
+
+def run_wsgi(path, token, args):
+    from django.test import Client
+
+    workers = threading.Semaphore(args.wsgi_workers)
+    timings = []
+
+    def client():
+        http = Client(headers={"Authorization": f"Token {token}"})
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            with workers:
+                response = http.get(path)
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(args.clients) as pool:
+        for future in [pool.submit(client) for _ in range(args.clients)]:
+            future.result()
+    return summarize(timings, time.perf_counter() - start)
+
+
+async def asgi_get(application, path, token):
+    """Send one GET through ``application``; returns the status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"testserver"),
+            (b"authorization", f"Token {token}".encode()),
+        ],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    body_sent = False
+    done = asyncio.Event()
+    status = None
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif not message.get("more_body"):
+            done.set()
+
+    await application(scope, receive, send)
+    return status
+
+
+def run_asgi(path, token, args):
+    from core.asgi import application
+
+    timings = []
+
+    async def client():
+        for _ in range(args.requests):
+            start = time.perf_counter()
+            status = await asgi_get(application, path, token)
+            timings.append(time.perf_counter() - start)
+            assert status == 200, status
+
+    async def main():
+        start = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(args.clients)))
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(main())
+    return summarize(timings, elapsed)
+
+
+def seed():
+    from rest_framework.authtoken.models import Token
+
+    from kanmind_app.models import Board, Task, User
+
+    user = User.objects.create_user(
+        email="bench@example.com", password="pw", fullname="Bench User"
+    )
+    board = Board.objects.create(owner=user, title="Bench")
+    board.members.add(user)
+    for i in range(20):
+        Task.objects.create(
+            board=board,
+            title=f"Task {i}",
+            description="",
+            assignee=user,
+            created_by=user,
+        )
+    return board, Token.objects.create(user=user).key
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--wsgi-workers", type=int, default=4)
+    parser.add_argument("--db-latency", type=float, default=5.0)
+    args = parser.parse_args()
+
+    from django.conf import settings
+    from django.test import override_settings
+
+    no_throttles = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_CLASSES": []}
+    with test_database(), override_settings(REST_FRAMEWORK=no_throttles):
+        board, token = seed()
+        add_db_latency(args.db_latency / 1000)
+
+        print(
+            f"\n{args.clients} clients x {args.requests} requests, "
+            f"{args.db_latency:g} ms per query, "
+            f"{args.wsgi_workers} WSGI workers vs. 1 ASGI worker"
+        )
+        print(f"{'':<40}{'req/s':>10}{'mean ms':>10}{'p99 ms':>10}")
+        for path in [
+            "boards/",
+            f"boards/{board.pk}/",
+            "tasks/assigned-to-me/",
+        ]:
+            for label, run, prefix in (
+                ("WSGI", run_wsgi, "/api/"),
+                ("ASGI", run_asgi, "/api/async/"),
+            ):
+                stats = run(prefix + path, token, args)
+                print(
+                    f"{label + ' ' + prefix + path:<40}{stats['rps']:>10.1f}"
+                    f"{stats['mean_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
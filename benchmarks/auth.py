@@ -0,0 +1,47 @@
+"""Per-request cost of token authentication, stock vs. cached.
+
+    python -m benchmarks.auth [--requests N]
+"""
+
+import argparse
+
+from benchmarks.common import measure, report, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+
+    from rest_framework.authentication import TokenAuthentication
+    from rest_framework.authtoken.models import Token
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    from kanmind_app.api.authentication import CachedTokenAuthentication
+    from kanmind_app.models import User
+
+    with test_database():
+        user = User.objects.create_user(
+            email="bench@example.com", password="pw", fullname="Bench User"
+        )
+        token = Token.objects.create(user=user)
+        request = Request(
+            APIRequestFactory().get(
+                "/api/boards/", HTTP_AUTHORIZATION=f"Token {token.key}"
+            )
+        )
+
+        results = {}
+        for label, backend in (
+            ("TokenAuthentication", TokenAuthentication()),
+            ("CachedTokenAuthentication", CachedTokenAuthentication()),
+        ):
+            results[label] = measure(
+                lambda: backend.authenticate(request), args.requests
+            )
+        report(f"Authenticating {args.requests} requests", results)
+
+
+if __name__ == "__main__":
+    main()
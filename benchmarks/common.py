@@ -0,0 +1,68 @@
+"""Shared setup for the benchmark scripts in this package.
+
+Each script runs against a throwaway test database, so it never touches
+db.sqlite3 or DATABASE_URL data:
+
+    python -m benchmarks.auth
+"""
+
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("ALLOWED_HOSTS", "localhost,testserver")
+os.environ.setdefault("CORS_ALLOWED_ORIGINS", "http://localhost")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+
+@contextmanager
+def test_database():
+    """Create a fresh test database for the duration of the block."""
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def measure(fn, repeat):
+    """Call ``fn`` ``repeat`` times; return timing and query stats."""
+    timings = []
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "p99_ms": timings[int(len(timings) * 0.99) - 1] * 1000,
+        "queries_per_call": len(ctx.captured_queries) / repeat,
+    }
+
+
+def report(title, results):
+    """Print a table of ``{label: measure() result}``."""
+    width = max(28, *(len(label) + 2 for label in results))
+    print(f"\n{title}")
+    print(f"{'':<{width}}{'mean ms':>10}{'p99 ms':>10}{'queries':>10}")
+    for label, stats in results.items():
+        print(
+            f"{label:<{width}}{stats['mean_ms']:>10.3f}"
+            f"{stats['p99_ms']:>10.3f}{stats['queries_per_call']:>10.2f}"
+        )
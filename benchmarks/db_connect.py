@@ -0,0 +1,87 @@
+"""Per-request connection overhead against DATABASE_URL (PostgreSQL).
+
+    DATABASE_URL=postgres://... \
+        python -m benchmarks.db_connect [--requests N]
+
+Each simulated request does what a real one does around its queries:
+connections are checked at request start and end (as Django's
+request_started/request_finished handlers do) and one ``SELECT 1`` runs
+in between. Compared are a new connection per request, a persistent
+connection and the psycopg pool configured in settings. Only reads;
+nothing is written to the database.
+"""
+
+import argparse
+import copy
+import statistics
+import time
+
+import benchmarks.common  # noqa: F401 - sets up Django
+
+
+def handler(**overrides):
+    """A connection to the default database, with ``overrides`` set."""
+    from django.conf import settings
+    from django.db.utils import ConnectionHandler
+
+    config = copy.deepcopy(settings.DATABASES["default"])
+    config.setdefault("OPTIONS", {}).pop("pool", None)
+    for key, value in overrides.items():
+        if key == "pool":
+            config["OPTIONS"]["pool"] = value
+        else:
+            config[key] = value
+    return ConnectionHandler({"default": config})["default"]
+
+
+def simulate(db, requests):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        db.close_if_unusable_or_obsolete()
+        with db.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        db.close_if_unusable_or_obsolete()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return {
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "p99_ms": timings[max(int(len(timings) * 0.99) - 1, 0)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    from django.conf import settings
+    from django.db import connection
+
+    if connection.vendor != "postgresql":
+        raise SystemExit("Set DATABASE_URL to a PostgreSQL database.")
+
+    modes = {
+        "connect per request": handler(CONN_MAX_AGE=0),
+        "persistent": handler(CONN_MAX_AGE=600, CONN_HEALTH_CHECKS=True),
+    }
+    pool = settings.DATABASES["default"]["OPTIONS"].get("pool")
+    if pool:
+        modes["pool"] = handler(CONN_MAX_AGE=0, pool=pool)
+    else:
+        print("No pool configured (DB_POOL_MAX_SIZE=0 or no psycopg_pool).")
+
+    print(f"\n{args.requests} requests with one query each")
+    print(f"{'':<24}{'mean ms':>10}{'p99 ms':>10}")
+    for label, db in modes.items():
+        try:
+            stats = simulate(db, args.requests)
+        finally:
+            db.close()
+            if label == "pool":
+                db.close_pool()
+        print(f"{label:<24}{stats['mean_ms']:>10.3f}{stats['p99_ms']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
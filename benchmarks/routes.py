@@ -0,0 +1,50 @@
+"""Every API route on seeded data of a given size.
+
+    python -m benchmarks.routes [--scale N] [--repeat N]
+
+Seeds kanmind_app.seeding data ``--scale`` times the default size and
+replays each route's request ``--repeat`` times, caches cold and writes
+rolled back, as the RouteBudgetTests do.
+"""
+
+import argparse
+import statistics
+
+from benchmarks.common import report, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    from rest_framework.test import APIClient
+
+    from kanmind_app.seeding import replay, route_requests, seed
+
+    with test_database():
+        data = seed(args.scale)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {data.token.key}")
+        results = {}
+        for request in route_requests(data):
+            timings, queries = [], 0
+            for _ in range(args.repeat):
+                _, queries, elapsed = replay(client, request)
+                timings.append(elapsed)
+            timings.sort()
+            results[f"{request.method} {request.route}"] = {
+                "mean_ms": statistics.fmean(timings) * 1000,
+                "p99_ms": timings[int(len(timings) * 0.99) - 1] * 1000,
+                "queries_per_call": queries,
+            }
+        report(
+            f"{data.users} users, {data.boards} boards, {data.tasks} tasks,"
+            f" {data.comments} comments",
+            results,
+        )
+
+
+if __name__ == "__main__":
+    main()
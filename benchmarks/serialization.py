@@ -0,0 +1,95 @@
+"""Board detail rendering, DRF serializers vs. the compiled read path.
+
+    python -m benchmarks.serialization [--tasks N] [--repeat N]
+
+Times building and encoding the GET /boards/{id}/ body of one board
+with ``--tasks`` tasks, database queries included, and the
+``?view=summary`` and ``?view=columns`` bodies next to it.
+"""
+
+import argparse
+
+from benchmarks.common import measure, report, test_database
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    from django.db.models import prefetch_related_objects
+    from rest_framework.renderers import JSONRenderer
+
+    from kanmind_app.api.compiled import (
+        board_columns_data,
+        board_full_data,
+        board_summary_data,
+    )
+    from kanmind_app.api.querysets import board_detail_prefetches
+    from kanmind_app.api.renderers import FastJSONRenderer, orjson
+    from kanmind_app.api.serializers import BoardFullSerializer
+    from kanmind_app.bulk import create_tasks
+    from kanmind_app.models import Board, Task, User
+
+    with test_database():
+        users = [
+            User.objects.create_user(
+                email=f"user{i}@example.com", password="pw", fullname="U Ser"
+            )
+            for i in range(10)
+        ]
+        board = Board.objects.create(owner=users[0], title="Bench")
+        board.members.set(users)
+        create_tasks(
+            [
+                Task(
+                    board=board,
+                    title=f"Task {i}",
+                    description="Some description",
+                    status=Task.STATUS_CHOICES[i % 4][0],
+                    priority="medium",
+                    assignee=users[i % 10],
+                    reviewer=users[(i + 1) % 10] if i % 2 else None,
+                    created_by=users[0],
+                )
+                for i in range(args.tasks)
+            ]
+        )
+
+        def drf():
+            board = Board.objects.get(pk=board_id)
+            prefetch_related_objects([board], *board_detail_prefetches())
+            return JSONRenderer().render(BoardFullSerializer(board).data)
+
+        def compiled():
+            board = Board.objects.get(pk=board_id)
+            return FastJSONRenderer().render(board_full_data(board))
+
+        def summary():
+            board = Board.objects.select_related("stats").get(pk=board_id)
+            return FastJSONRenderer().render(board_summary_data(board))
+
+        def columns():
+            board = Board.objects.select_related("stats").get(pk=board_id)
+            data = board_columns_data(board, 20, lambda *args: "next")
+            return FastJSONRenderer().render(data)
+
+        board_id = board.pk
+        assert drf() == compiled()
+        encoder = "orjson" if orjson else "json"
+        results = {
+            "DRF + json": measure(drf, args.repeat),
+            f"compiled + {encoder}": measure(compiled, args.repeat),
+            "?view=summary": measure(summary, args.repeat),
+            "?view=columns (20 per column)": measure(columns, args.repeat),
+        }
+        report(f"Board detail with {args.tasks} tasks", results)
+        print(
+            f"\nBody bytes: full {len(compiled()):,},"
+            f" summary {len(summary()):,}, columns {len(columns()):,}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
 """
 ASGI config for core project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+It exposes the ASGI callable as a module-level variable named
+``application``. Serve it with an ASGI worker (uvicorn, see the
+Procfile) for the event streams and the async read endpoints under
+/api/async/.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
 import dj_database_url
@@ -55,6 +56,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "kanmind_app.instrumentation.RequestMetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -63,6 +65,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "kanmind_app.routers.ReplicaRoutingMiddleware",
 ]
 
 
@@ -70,13 +73,49 @@ ALLOWED_HOSTS = os.environ.get("ALLOWED_HOSTS").split(",")
 # Database - Render PostgreSQL
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
+# Each worker process keeps a psycopg (3) connection pool of
+# DB_POOL_MIN_SIZE..DB_POOL_MAX_SIZE connections; size them so that
+# workers x DB_POOL_MAX_SIZE stays below the server's connection limit.
+# DB_POOL_MAX_SIZE=0, or psycopg2 instead of psycopg with its pool
+# extra, falls back to one persistent connection per worker thread.
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 4))
+DB_POOL = DB_POOL_MAX_SIZE > 0 and find_spec("psycopg_pool") is not None
+
+
+def database(url):
+    """DATABASES entry for a DATABASE_URL-style ``url``."""
+    config = dj_database_url.parse(
+        url,
+        # Pooled connections are returned to the pool instead
+        conn_max_age=0 if DB_POOL else 600,
+        conn_health_checks=not DB_POOL,
+    )
+    if config["ENGINE"] != "django.db.backends.postgresql":
+        return config
+    options = config.setdefault("OPTIONS", {})
+    options["connect_timeout"] = int(os.getenv("DB_CONNECT_TIMEOUT", 5))
+    # Server-side limit per statement, in milliseconds (0 disables)
+    options["options"] = "-c statement_timeout={}".format(
+        int(os.getenv("DB_STATEMENT_TIMEOUT", 30000))
+    )
+    if DB_POOL:
+        from psycopg_pool import ConnectionPool
+
+        options["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 1)),
+            "max_size": DB_POOL_MAX_SIZE,
+            # Seconds a request waits for a free connection
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", 300)),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", 1800)),
+            # Health check when a connection is handed out
+            "check": ConnectionPool.check_connection,
+        }
+    return config
+
+
 if DATABASE_URL:
-    DATABASES = {
-        "default": dj_database_url.config(
-            default=DATABASE_URL,
-            conn_max_age=600,
-        )
-    }
+    DATABASES = {"default": database(DATABASE_URL)}
 else:
     # Local development (SQLite)
     DATABASES = {
@@ -85,6 +124,57 @@ else:
             "NAME": BASE_DIR / "db.sqlite3",
         }
     }
+
+# Read replicas, as comma-separated DATABASE_URL-style URLs. Safe API
+# requests read from one of them (kanmind_app.routers); a caller that
+# wrote stays on the primary for REPLICA_PIN_SECONDS.
+for number, url in enumerate(
+    filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(",")), 1
+):
+    DATABASES[f"replica{number}"] = {
+        **database(url.strip()),
+        "TEST": {"MIRROR": "default"},
+    }
+KANMIND_READ_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+KANMIND_REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+DATABASE_ROUTERS = ["kanmind_app.routers.ReplicaRouter"]
+
+# Cache - shared between workers when REDIS_URL is set (needs `redis`),
+# otherwise per-process memory
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+
+# Seconds a user's accessible board ids stay cached (kanmind_app.access)
+# Without REDIS_URL an access change is only invalidated in the worker
+# process that made it; the others keep the old access until the entry
+# expires, hence the shorter default.
+KANMIND_BOARD_ACCESS_TTL = int(
+    os.getenv("BOARD_ACCESS_TTL", 60 if REDIS_URL else 5)
+)
+
+# Token -> user resolutions (kanmind_app.api.authentication): a
+# per-process LRU, plus the shared cache when there is one. Logout and
+# deactivation only evict from the LRU of the process that handled
+# them; other workers accept the token until their entry expires, so
+# keep the TTL short.
+KANMIND_TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+KANMIND_TOKEN_CACHE_TTL = int(os.getenv("TOKEN_CACHE_TTL", 5))
+KANMIND_TOKEN_CACHE_ALIAS = "default" if REDIS_URL else None
+
+# Rendered board detail bodies (kanmind_app.board_cache): a per-process
+# LRU capped by entries and bytes, plus the shared cache if there is one
+KANMIND_BOARD_CACHE_ENTRIES = int(os.getenv("BOARD_CACHE_ENTRIES", 1000))
+KANMIND_BOARD_CACHE_BYTES = int(os.getenv("BOARD_CACHE_BYTES", 64 << 20))
+KANMIND_BOARD_CACHE_TTL = int(os.getenv("BOARD_CACHE_TTL", 300))
+KANMIND_BOARD_CACHE_ALIAS = "default" if REDIS_URL else None
+
 CORS_ALLOWED_ORIGINS = os.environ.get(
     "CORS_ALLOWED_ORIGINS",
 ).split(",")
@@ -127,6 +217,77 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# The first hasher hashes new passwords; on login, hashes made by any
+# other hasher (or another PBKDF2 iteration count) are replaced.
+PASSWORD_HASHERS = list(
+    dict.fromkeys(
+        [
+            os.getenv(
+                "PASSWORD_HASHER",
+                "kanmind_app.hashing.KanMindPBKDF2PasswordHasher",
+            ),
+            "kanmind_app.hashing.KanMindPBKDF2PasswordHasher",
+            "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+            "django.contrib.auth.hashers.Argon2PasswordHasher",
+            "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+            "django.contrib.auth.hashers.ScryptPasswordHasher",
+        ]
+    )
+)
+# 0 keeps Django's default iteration count
+KANMIND_PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", 0))
+
+# Hashing pool (kanmind_app.hashing): caps concurrent hashes per process
+# and answers 503 past the queue; 0 workers hashes inline
+KANMIND_AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", 0))
+KANMIND_AUTH_HASH_QUEUE = int(os.getenv("AUTH_HASH_QUEUE", 16))
+KANMIND_AUTH_HASH_TIMEOUT = float(os.getenv("AUTH_HASH_TIMEOUT", 5))
+
+# Board event streams (kanmind_app.events, served under ASGI only). The
+# in-process broker only sees writes made by the same worker process.
+KANMIND_EVENT_BROKER = "kanmind_app.events.InProcessBroker"
+KANMIND_EVENT_BUFFER = int(os.getenv("EVENT_BUFFER", 256))
+KANMIND_EVENT_QUEUE = int(os.getenv("EVENT_QUEUE", 100))
+KANMIND_EVENT_HEARTBEAT = int(os.getenv("EVENT_HEARTBEAT", 15))
+KANMIND_EVENT_STREAM_MAX_AGE = int(os.getenv("EVENT_STREAM_MAX_AGE", 600))
+# Lifetime of the ?ticket= a stream is opened with, in seconds
+KANMIND_EVENT_TICKET_MAX_AGE = int(os.getenv("EVENT_TICKET_MAX_AGE", 60))
+
+# Most items accepted by one request to /api/tasks/bulk/
+KANMIND_BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 500))
+
+# GET /boards/{id}/changes/ (kanmind_app.sync): look-back for late
+# commits, tombstone retention and the most changes sent per call
+KANMIND_SYNC_OVERLAP_SECONDS = int(os.getenv("SYNC_OVERLAP_SECONDS", 5))
+KANMIND_SYNC_RETENTION_DAYS = int(os.getenv("SYNC_RETENTION_DAYS", 30))
+KANMIND_SYNC_MAX_CHANGES = int(os.getenv("SYNC_MAX_CHANGES", 1000))
+
+# Rows read or inserted at a time by board export/import
+KANMIND_ARCHIVE_CHUNK_SIZE = int(os.getenv("ARCHIVE_CHUNK_SIZE", 2000))
+
+# Bearer token for /metrics; unset disables the endpoint. Metrics are
+# per process: run one worker per instance (WEB_CONCURRENCY=1)
+KANMIND_METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+# Runs of one query shape per request that are reported as N+1
+KANMIND_N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
+
+# One JSON line per request on stdout (kanmind_app.instrumentation)
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {"message": {"format": "%(message)s"}},
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "message"},
+    },
+    "loggers": {
+        "kanmind": {
+            "handlers": ["console"],
+            "level": os.getenv("LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
 
 LANGUAGE_CODE = "en-us"
 
@@ -141,7 +302,7 @@ STATIC_URL = "static/"
 STATIC_ROOT = "/var/www/KanMind/static/"
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "kanmind_app.api.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
@@ -154,6 +315,20 @@ REST_FRAMEWORK = {
         "anon": "30/hour",
         "user": "200/hour",
     },
+    "DEFAULT_PAGINATION_CLASS": (
+        "kanmind_app.api.pagination.IdCursorPagination"
+    ),
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", 50)),
+    # orjson-backed JSON (falls back to the stdlib when not installed)
+    "DEFAULT_RENDERER_CLASSES": [
+        "kanmind_app.api.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "kanmind_app.api.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 
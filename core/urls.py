@@ -18,7 +18,10 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import include, path
 
+from kanmind_app.views import metrics
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("kanmind_app.api.urls")),
+    path("metrics", metrics),
 ]
@@ -0,0 +1,119 @@
+"""Board access resolution shared by all permission classes.
+
+A user's accessible board ids are loaded with one query, memoized on
+the request and kept in the cache between requests, so a permission
+check is a set lookup. Entries are invalidated by the signal handlers
+in ``kanmind_app.signals`` whenever ownership or membership changes.
+When the cache is not shared between worker processes, that only
+reaches the process that made the change: the others keep the old
+access until ``KANMIND_BOARD_ACCESS_TTL`` expires it.
+"""
+
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import (
+    BooleanField,
+    Exists,
+    ExpressionWrapper,
+    OuterRef,
+    Q,
+)
+
+from kanmind_app.models import Board
+
+CACHE_KEY = "kanmind:board-access:{}"
+
+
+@dataclass(frozen=True)
+class BoardAccess:
+    """Ids of the boards a user owns and of all boards they can view."""
+
+    owned: frozenset
+    visible: frozenset
+
+    def owns(self, board_id):
+        return board_id in self.owned
+
+    def can_view(self, board_id):
+        return board_id in self.visible
+
+
+def load_board_access(user_id):
+    """Resolve a user's boards from the database in a single query.
+
+    Always read from the primary: the result is cached for every
+    request, so it must not come from a lagging replica.
+    """
+    member_board_ids = Board.members.through.objects.filter(
+        user_id=user_id
+    ).values("board_id")
+    rows = Board.objects.using(DEFAULT_DB_ALIAS).filter(
+        Q(owner_id=user_id) | Q(id__in=member_board_ids)
+    ).values_list("id", "owner_id")
+    return BoardAccess(
+        owned=frozenset(pk for pk, owner in rows if owner == user_id),
+        visible=frozenset(pk for pk, _ in rows),
+    )
+
+
+def board_access_for_user(user_id):
+    """Cached variant of load_board_access."""
+    key = CACHE_KEY.format(user_id)
+    access = cache.get(key)
+    if access is None:
+        access = load_board_access(user_id)
+        cache.set(
+            key,
+            access,
+            getattr(settings, "KANMIND_BOARD_ACCESS_TTL", 60),
+        )
+    return access
+
+
+def get_board_access(request):
+    """The requesting user's board access, resolved once per request."""
+    access = getattr(request, "_board_access", None)
+    if access is None:
+        access = board_access_for_user(request.user.pk)
+        request._board_access = access
+    return access
+
+
+def with_board_access(queryset, user_id, board=None):
+    """Annotate rows with ``user_id``'s access to their board.
+
+    ``board`` is the path from the rows to their board (``"board"``,
+    ``"task__board"``), None for boards themselves. The rows get
+    ``board_owned`` and ``board_visible``, computed in the same query,
+    so fetching an object and checking access to it takes one query;
+    the object is still found when access is denied, keeping 403 apart
+    from 404.
+    """
+    prefix = "" if board is None else f"{board}__"
+    board_id = "pk" if board is None else f"{board}_id"
+    is_member = Exists(
+        Board.members.through.objects.filter(
+            board_id=OuterRef(board_id), user_id=user_id
+        )
+    )
+    owns = Q(**{f"{prefix}owner_id": user_id})
+    return queryset.annotate(
+        board_owned=ExpressionWrapper(owns, output_field=BooleanField()),
+        board_visible=ExpressionWrapper(
+            owns | Q(is_member), output_field=BooleanField()
+        ),
+    )
+
+
+def invalidate_board_access(user_ids):
+    """Forget cached board access for the given users."""
+    keys = [CACHE_KEY.format(user_id) for user_id in set(user_ids)]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # Delete again once committed, so a concurrent request cannot keep
+    # a value it cached from the pre-commit state.
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,213 @@
+"""Async counterparts of the read-heavy API endpoints.
+
+Served under /api/async/ with the same permissions and response bodies
+as the DRF views, but with the database reached through Django's async
+ORM. Under an ASGI server (see core/asgi.py) a request waiting on the
+database no longer occupies a worker. Under WSGI they still answer,
+just without that benefit.
+
+DRF does not dispatch async views, so authentication, throttling and
+error responses are done by ``async_api_view``. Those two are sync
+code and still run in the thread pool (sync_to_async). Pagination is
+keyset based (api.pagination.apaginate); its cursors are not
+interchangeable with the DRF views' cursors.
+"""
+
+import functools
+
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    MethodNotAllowed,
+    NotAuthenticated,
+    NotFound,
+    PermissionDenied,
+    Throttled,
+)
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from kanmind_app.access import with_board_access
+from kanmind_app.api.authentication import (
+    CachedTokenAuthentication,
+    authenticate_async,
+)
+from kanmind_app.api.compiled import (
+    CompiledCommentSerializer,
+    CompiledTaskSerializer,
+    aboard_view_body,
+    board_view_etag,
+)
+from kanmind_app.api.conditional import add_validators, not_modified
+from kanmind_app.api.pagination import (
+    CreatedAtCursorPagination,
+    IdCursorPagination,
+    apaginate,
+    sort_fields,
+)
+from kanmind_app.api.querysets import board_list_queryset, task_queryset
+from kanmind_app.api.renderers import PrerenderedJSONResponse
+from kanmind_app.api.serializers import (
+    BoardListSerializer,
+    BoardViewSerializer,
+    requested_fields,
+)
+from kanmind_app.instrumentation import phase
+from kanmind_app.models import Board, Comment, Task
+
+
+def check_throttles(request):
+    """Apply the default DRF throttles, like APIView.check_throttles."""
+    waits = [
+        throttle.wait()
+        for throttle in (
+            cls() for cls in api_settings.DEFAULT_THROTTLE_CLASSES
+        )
+        if not throttle.allow_request(request, None)
+    ]
+    if waits:
+        waits = [wait for wait in waits if wait is not None]
+        raise Throttled(max(waits, default=None))
+
+
+def render(request, response):
+    """Render a DRF Response outside of APIView."""
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    response.accepted_renderer = renderer
+    response.accepted_media_type = renderer.media_type
+    response.renderer_context = {"request": request, "response": response}
+    return response.render()
+
+
+def async_api_view(view):
+    """Authenticate and throttle ``view``, and render its Response.
+
+    The view receives a DRF Request and returns a Response; API
+    exceptions become the same error responses the DRF views send.
+    The async endpoints are read-only.
+    """
+
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        request = Request(request)
+        try:
+            if request.method not in ("GET", "HEAD"):
+                raise MethodNotAllowed(request.method)
+            request.user = await authenticate_async(request._request)
+            await sync_to_async(check_throttles)(request)
+            response = await view(request, *args, **kwargs)
+        except APIException as exc:
+            if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+                # As APIView.handle_exception: 401 with the auth scheme
+                exc.auth_header = CachedTokenAuthentication().keyword
+            response = exception_handler(exc, {"request": request})
+        if isinstance(response, Response):
+            response = render(request, response)
+        return response
+
+    return wrapper
+
+
+async def paginated(request, queryset, pagination_class, serializer=None):
+    """A page of ``queryset``, rendered by a compiled ``serializer``.
+
+    Without one, the items are model instances for the caller to render.
+    """
+    if serializer is not None:
+        ordering = sort_fields(pagination_class.ordering)
+        queryset = serializer.values(queryset, ordering)
+    items, next_url, previous_url = await apaginate(
+        request, queryset, pagination_class
+    )
+    if serializer is not None:
+        with phase("serialize"):
+            items = serializer.data(items)
+    return {"next": next_url, "previous": previous_url, "results": items}
+
+
+@async_api_view
+async def board_list(request):
+    """Async GET /boards/."""
+    page = await paginated(
+        request, board_list_queryset(request.user), IdCursorPagination
+    )
+    page["results"] = BoardListSerializer(
+        page["results"], many=True, context={"request": request}
+    ).data
+    return Response(page)
+
+
+@async_api_view
+async def board_detail(request, board_id):
+    """Async GET /boards/{board_id}/, with conditional GET support."""
+    board = await with_board_access(
+        Board.objects.select_related("stats").filter(pk=board_id),
+        request.user.pk,
+    ).afirst()
+    if board is None:
+        raise NotFound("No Board matches the given query.")
+    if not board.board_visible:
+        raise PermissionDenied()
+    params = BoardViewSerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    params = params.validated_data
+
+    etag = board_view_etag(board, params)
+    response = not_modified(request, etag, board.updated_at)
+    if response is None:
+        body = await aboard_view_body(request, board, params)
+        response = PrerenderedJSONResponse(body)
+    return add_validators(response, etag, board.updated_at)
+
+
+async def user_tasks(request, **filters):
+    fields = requested_fields(request)
+    queryset = task_queryset(fields).filter(**filters)
+    return Response(
+        await paginated(
+            request,
+            queryset,
+            IdCursorPagination,
+            CompiledTaskSerializer(fields),
+        )
+    )
+
+
+@async_api_view
+async def assigned_to_me(request):
+    """Async GET /tasks/assigned-to-me/."""
+    return await user_tasks(request, assignee=request.user)
+
+
+@async_api_view
+async def reviewing(request):
+    """Async GET /tasks/reviewing/."""
+    return await user_tasks(request, reviewer=request.user)
+
+
+@async_api_view
+async def comment_list(request, task_id):
+    """Async GET /tasks/{task_id}/comments/."""
+    task = await with_board_access(
+        Task.objects.filter(pk=task_id).only("board_id"),
+        request.user.pk,
+        board="board",
+    ).afirst()
+    if task is None:
+        raise NotFound("No Task matches the given query.")
+    if not task.board_visible:
+        raise PermissionDenied()
+    comments = Comment.objects.filter(task_id=task_id).select_related(
+        "author"
+    )
+    return Response(
+        await paginated(
+            request,
+            comments,
+            CreatedAtCursorPagination,
+            CompiledCommentSerializer(requested_fields(request)),
+        )
+    )
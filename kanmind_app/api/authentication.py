@@ -0,0 +1,129 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import NotAuthenticated
+
+from kanmind_app.cache import LRUCache
+
+# v2: entries no longer hold the user and token instances
+SHARED_KEY = "kanmind:token:v2:{}"
+
+# token key -> (user id, is_active, expiry time), per worker process
+local_tokens = LRUCache(
+    max_entries=getattr(settings, "KANMIND_TOKEN_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "KANMIND_TOKEN_CACHE_TTL", 5),
+)
+
+
+def shared_token_cache():
+    """The optional cross-process tier, or None if not configured."""
+    alias = getattr(settings, "KANMIND_TOKEN_CACHE_ALIAS", None)
+    return caches[alias] if alias else None
+
+
+def evict_tokens(keys):
+    """Drop token resolutions from both cache tiers."""
+    keys = list(keys)
+    for key in keys:
+        local_tokens.delete(key)
+    shared = shared_token_cache()
+    if shared is not None and keys:
+        shared.delete_many([SHARED_KEY.format(key) for key in keys])
+
+
+def evict_user_tokens(user):
+    """Drop every cached token resolution of ``user``."""
+    local_tokens.delete_where(lambda key, entry: entry[0] == user.pk)
+    if shared_token_cache() is not None:
+        evict_tokens(
+            Token.objects.filter(user=user).values_list("key", flat=True)
+        )
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that skips the Token/User query when cached.
+
+    Resolutions are kept in a bounded per-process LRU with a short TTL
+    and, if KANMIND_TOKEN_CACHE_ALIAS names a cache, in that shared
+    cache too. Logout, token rotation and user updates (including
+    deactivation) evict entries through kanmind_app.signals. The LRU
+    of other worker processes is not reached: they keep a revoked
+    token for up to KANMIND_TOKEN_CACHE_TTL seconds.
+
+    Entries hold the user id, ``is_active`` and an expiry time, set
+    once when the token is resolved from the database. A local copy of
+    a shared entry expires with it, so the TTL is not restarted. The
+    user's other fields are loaded from the database if read.
+    """
+
+    def authenticate_credentials(self, key):
+        entry = fresh(local_tokens.get(key))
+        if entry is None:
+            entry = self.shared_lookup(key)
+        if entry is None:
+            # AuthenticationFailed for unknown keys and inactive users
+            user, token = super().authenticate_credentials(key)
+            entry = (
+                user.pk,
+                user.is_active,
+                time.time()
+                + getattr(settings, "KANMIND_TOKEN_CACHE_TTL", 5),
+            )
+            self.remember(key, entry)
+            return user, token
+        user_id, is_active, _ = entry
+        # Each request gets its own instances, with the rest deferred
+        # and loaded from the primary, where tokens are read from
+        user = get_user_model().from_db(
+            DEFAULT_DB_ALIAS, ["id", "is_active"], [user_id, is_active]
+        )
+        token = Token.from_db(
+            DEFAULT_DB_ALIAS, ["key", "user_id"], [key, user_id]
+        )
+        token.user = user
+        return user, token
+
+    def shared_lookup(self, key):
+        shared = shared_token_cache()
+        if shared is None:
+            return None
+        entry = fresh(shared.get(SHARED_KEY.format(key)))
+        if entry is not None:
+            local_tokens.set(key, entry)
+        return entry
+
+    def remember(self, key, entry):
+        local_tokens.set(key, entry)
+        shared = shared_token_cache()
+        if shared is not None:
+            shared.set(
+                SHARED_KEY.format(key),
+                entry,
+                getattr(settings, "KANMIND_TOKEN_CACHE_TTL", 5),
+            )
+
+
+def fresh(entry):
+    """``entry``, or None if it is missing or past its expiry."""
+    if entry is None or entry[2] <= time.time():
+        return None
+    return entry
+
+
+async def authenticate_async(request):
+    """Resolve the caller of an async view, which DRF does not dispatch.
+
+    Uses the Authorization header like the DRF views. Returns the user;
+    raises NotAuthenticated or AuthenticationFailed.
+    """
+    backend = CachedTokenAuthentication()
+    result = await sync_to_async(backend.authenticate)(request)
+    if result is None:
+        raise NotAuthenticated()
+    return result[0]
@@ -0,0 +1,397 @@
+"""Compiled read path for the hot serializers.
+
+A DRF serializer walks its Field objects for every instance, and the
+instances themselves have to be built from the rows first. For reads
+the output of TaskSerializer, CommentSerializer and UserSerializer is a
+plain function of a few columns, so the classes here select exactly
+those columns with ``.values()`` and turn each row into a dict with a
+list of getters fixed once per request. The output is the same as the
+serializer's, key order included; writes still go through DRF.
+"""
+
+import functools
+from operator import itemgetter
+from urllib.parse import urlencode
+
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from rest_framework import serializers
+
+from kanmind_app.api.conditional import make_etag
+from kanmind_app.api.renderers import FastJSONRenderer
+from kanmind_app.api.serializers import (
+    CommentSerializer,
+    TaskSerializer,
+    UserSerializer,
+)
+from kanmind_app.board_cache import acached_board_body, cached_board_body
+from kanmind_app.counters import STATUS_COUNTERS
+from kanmind_app.instrumentation import phase
+from kanmind_app.models import BoardStats, Task
+
+datetime_field = serializers.DateTimeField()
+
+
+def read_fields(serializer_class):
+    """Output field names of ``serializer_class``, in output order."""
+    meta = serializer_class.Meta
+    write_only = {
+        name
+        for name, field in serializer_class._declared_fields.items()
+        if field.write_only
+    }
+    write_only.update(
+        name
+        for name, kwargs in getattr(meta, "extra_kwargs", {}).items()
+        if kwargs.get("write_only")
+    )
+    return [name for name in meta.fields if name not in write_only]
+
+
+def user_getter(relation):
+    """Getter for a nested UserSerializer over a nullable relation."""
+    pk = f"{relation}_id"
+    email = f"{relation}__email"
+    fullname = f"{relation}__fullname"
+
+    def get(row):
+        if row[pk] is None:
+            return None
+        return {
+            "id": row[pk],
+            "email": row[email],
+            "fullname": row[fullname],
+        }
+
+    return [pk, email, fullname], get
+
+
+def column(name, convert=None):
+    """Getter for one column, with ``convert`` applied unless null."""
+    get = itemgetter(name)
+    if convert is None:
+        return [name], get
+
+    def get_converted(row):
+        value = get(row)
+        return None if value is None else convert(value)
+
+    return [name], get_converted
+
+
+class CompiledSerializer:
+    """Read-only ``serializer_class`` stand-in over ``.values()`` rows.
+
+    ``fields`` is the sparse fieldset (see requested_fields); None
+    renders every field, like the serializer does.
+    """
+
+    serializer_class = None
+    # Output field -> (columns, getter); missing ones are plain columns
+    getters = {}
+
+    def __init__(self, fields=None):
+        self.columns = []
+        self.fields = []
+        for name in read_fields(self.serializer_class):
+            if fields is not None and name not in fields:
+                continue
+            columns, get = self.getters.get(name) or column(name)
+            self.columns += [c for c in columns if c not in self.columns]
+            self.fields.append((name, get))
+
+    def values(self, queryset, keys=()):
+        """``queryset`` as the rows this serializer needs.
+
+        Annotations and the ``keys`` columns are selected too, without
+        being rendered, so keyset pagination can read its sort key
+        whatever the sparse fieldset.
+        """
+        annotations = list(queryset.query.annotations)
+        extra = [
+            key
+            for key in keys
+            if key not in self.columns and key not in annotations
+        ]
+        return queryset.values(*self.columns, *extra, *annotations)
+
+    def to_representation(self, row):
+        return {name: get(row) for name, get in self.fields}
+
+    def data(self, rows):
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+class CompiledUserSerializer(CompiledSerializer):
+    serializer_class = UserSerializer
+
+
+class CompiledTaskSerializer(CompiledSerializer):
+    serializer_class = TaskSerializer
+    getters = {
+        "board": column("board_id"),
+        "due_date": column("due_date", lambda value: value.isoformat()),
+        "assignee": user_getter("assignee"),
+        "reviewer": user_getter("reviewer"),
+        "created_by": user_getter("created_by"),
+    }
+
+
+class CompiledCommentSerializer(CompiledSerializer):
+    serializer_class = CommentSerializer
+    getters = {
+        "created_at": column("created_at", datetime_field.to_representation),
+        "author": column("author__fullname"),
+        "task": column("task_id"),
+    }
+
+
+def fetch(queries):
+    """Rows of every queryset of ``queries``, a dict of querysets."""
+    return {name: list(queryset) for name, queryset in queries.items()}
+
+
+async def afetch(queries):
+    """fetch() through the async ORM."""
+    rows = {}
+    for name, queryset in queries.items():
+        rows[name] = [row async for row in queryset]
+    return rows
+
+
+def board_full_queries(board):
+    users = CompiledUserSerializer()
+    tasks = CompiledTaskSerializer()
+    return {
+        "members": users.values(board.members.order_by("pk")),
+        "tasks": tasks.values(board.tasks.order_by("pk")),
+    }
+
+
+def board_full_build(board, members, tasks):
+    return {
+        "id": board.pk,
+        "title": board.title,
+        "owner_id": board.owner_id,
+        "members": CompiledUserSerializer().data(members),
+        "tasks": CompiledTaskSerializer().data(tasks),
+    }
+
+
+def board_full_data(board):
+    """BoardFullSerializer's rendering of ``board``, in two queries."""
+    return board_full_build(board, **fetch(board_full_queries(board)))
+
+
+def board_full_body(board):
+    """board_full_data() as JSON, from the board cache when current."""
+
+    def render():
+        rows = fetch(board_full_queries(board))
+        with phase("serialize"):
+            data = board_full_build(board, **rows)
+        return FastJSONRenderer().render(data)
+
+    return cached_board_body(board, render)
+
+
+async def aboard_full_body(board):
+    """board_full_body() through the async ORM."""
+
+    async def render():
+        rows = await afetch(board_full_queries(board))
+        with phase("serialize"):
+            data = board_full_build(board, **rows)
+        return FastJSONRenderer().render(data)
+
+    return await acached_board_body(board, render)
+
+
+def board_stats(board):
+    """``board.stats``, or zero counts for a board without a row yet."""
+    try:
+        return board.stats
+    except BoardStats.DoesNotExist:
+        return BoardStats(board=board)
+
+
+def column_counts(board):
+    stats = board_stats(board)
+    return {
+        status: getattr(stats, field)
+        for status, field in STATUS_COUNTERS.items()
+    }
+
+
+def board_summary_data(board):
+    """Board header and column counts, all from BoardStats."""
+    stats = board_stats(board)
+    return {
+        "id": board.pk,
+        "title": board.title,
+        "owner_id": board.owner_id,
+        "member_count": stats.member_count,
+        "task_count": stats.task_count,
+        "columns": [
+            {"status": status, "count": count}
+            for status, count in column_counts(board).items()
+        ],
+    }
+
+
+def column_data(status, count, rows, page_size, link):
+    """One column page from up to ``page_size + 1`` task rows."""
+    tasks = CompiledTaskSerializer()
+    more = len(rows) > page_size
+    rows = rows[:page_size]
+    return {
+        "status": status,
+        "count": count,
+        "tasks": tasks.data(rows),
+        "next": link(status, rows[-1]["id"]) if more else None,
+    }
+
+
+def board_columns_queries(board, page_size):
+    """Members and the first ``page_size + 1`` tasks of every column.
+
+    The windows of all columns come from one query, numbering each
+    column's tasks by id.
+    """
+    users = CompiledUserSerializer()
+    tasks = CompiledTaskSerializer()
+    # Numbered on the task table alone; users are joined to the window
+    window = (
+        board.tasks.annotate(
+            position=Window(
+                RowNumber(), partition_by=[F("status")], order_by="pk"
+            )
+        )
+        .filter(position__lte=page_size + 1)
+        .values("pk")
+    )
+    return {
+        "members": users.values(board.members.order_by("pk")),
+        "windows": tasks.values(
+            Task.objects.filter(pk__in=window).order_by("status", "pk")
+        ),
+    }
+
+
+def board_columns_build(board, page_size, link, members, windows):
+    rows = {status: [] for status, _ in Task.STATUS_CHOICES}
+    for row in windows:
+        rows.setdefault(row["status"], []).append(row)
+    counts = column_counts(board)
+    return {
+        "id": board.pk,
+        "title": board.title,
+        "owner_id": board.owner_id,
+        "members": CompiledUserSerializer().data(members),
+        "columns": [
+            column_data(status, counts[status], rows[status], page_size, link)
+            for status, _ in Task.STATUS_CHOICES
+        ],
+    }
+
+
+def board_columns_data(board, page_size, link):
+    """Board with members and the first ``page_size`` tasks per column.
+
+    ``link(status, after)`` is the URL of the rest of a column.
+    """
+    rows = fetch(board_columns_queries(board, page_size))
+    return board_columns_build(board, page_size, link, **rows)
+
+
+def board_column_queries(board, status, page_size, after):
+    queryset = board.tasks.filter(status=status)
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    tasks = CompiledTaskSerializer()
+    return {"rows": tasks.values(queryset.order_by("pk")[: page_size + 1])}
+
+
+def board_column_build(board, status, page_size, link, rows):
+    count = column_counts(board)[status]
+    return column_data(status, count, rows, page_size, link)
+
+
+def board_column_data(board, status, page_size, after, link):
+    """The tasks of one column with an id above ``after``, one page."""
+    rows = fetch(board_column_queries(board, status, page_size, after))
+    return board_column_build(board, status, page_size, link, **rows)
+
+
+def board_view_etag(board, params):
+    """ETag of the board detail variant ``params`` selects."""
+    if "status" in params:
+        parts = ["column", params["status"], params["page_size"]]
+        kind = "-".join(map(str, [*parts, params.get("after", "")]))
+    elif params["view"] == "columns":
+        kind = f"columns-{params['page_size']}"
+    else:
+        kind = params["view"]
+    kind = "board" if kind == "full" else f"board-{kind}"
+    return make_etag(kind, board.pk, board.updated_at)
+
+
+def board_view_parts(request, board, params):
+    """``(queries, build)`` of a board detail variant other than full.
+
+    ``build(**rows)`` makes the response data from the rows of the
+    querysets in ``queries`` (see fetch()), so the sync and the async
+    view share everything but running the queries.
+    """
+    base = request.build_absolute_uri(request.path)
+    page_size = params["page_size"]
+
+    def link(status, after):
+        query = {"status": status, "page_size": page_size, "after": after}
+        return f"{base}?{urlencode(query)}"
+
+    if "status" in params:
+        status = params["status"]
+        queries = board_column_queries(
+            board, status, page_size, params.get("after")
+        )
+        return queries, functools.partial(
+            board_column_build, board, status, page_size, link
+        )
+    if params["view"] == "summary":
+        return {}, functools.partial(board_summary_data, board)
+    queries = board_columns_queries(board, page_size)
+    return queries, functools.partial(
+        board_columns_build, board, page_size, link
+    )
+
+
+def is_full_view(params):
+    return "status" not in params and params["view"] == "full"
+
+
+def board_view_body(request, board, params):
+    """Body of GET /boards/{id}/ for the BoardViewSerializer ``params``.
+
+    Only the full board is cached: the other variants read a bounded
+    number of rows.
+    """
+    if is_full_view(params):
+        return board_full_body(board)
+    queries, build = board_view_parts(request, board, params)
+    rows = fetch(queries)
+    with phase("serialize"):
+        data = build(**rows)
+    return FastJSONRenderer().render(data)
+
+
+async def aboard_view_body(request, board, params):
+    """board_view_body() through the async ORM."""
+    if is_full_view(params):
+        return await aboard_full_body(board)
+    queries, build = board_view_parts(request, board, params)
+    rows = await afetch(queries)
+    with phase("serialize"):
+        data = build(**rows)
+    return FastJSONRenderer().render(data)
@@ -0,0 +1,28 @@
+"""Conditional GET helpers (ETag / Last-Modified).
+
+Validators are derived from ``Board.updated_at`` (see
+kanmind_app.versioning), which is bumped on every write below a board.
+"""
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+def make_etag(kind, pk, version):
+    """Strong ETag for object ``kind``/``pk`` at board ``version``."""
+    return f'"{kind}-{pk}-{int(version.timestamp() * 1_000_000)}"'
+
+
+def not_modified(request, etag, last_modified):
+    """A 304 response if the client's copy is current, else None."""
+    return get_conditional_response(
+        request, etag=etag, last_modified=int(last_modified.timestamp())
+    )
+
+
+def add_validators(response, etag, last_modified):
+    """Attach validators and make clients revalidate before reuse."""
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
@@ -0,0 +1,104 @@
+"""Filtering, search and ordering for the task list.
+
+Every query is scoped to the boards the caller can see, so the
+``board_id`` indexes bound the rows looked at before any other filter
+applies.
+"""
+
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+from kanmind_app.api.serializers import TaskFilterSerializer
+from kanmind_app.models import Task
+
+
+# ?ordering= names -> indexed Task columns (see Task.Meta.indexes).
+# Tasks without an assignee, reviewer or due date come last (first when
+# descending), see api.pagination.Keyset.
+SORT_COLUMNS = {
+    "board": "board_id",
+    "status": "status",
+    "priority": "priority",
+    "assignee": "assignee_id",
+    "reviewer": "reviewer_id",
+    "due_date": "due_date",
+}
+
+# Same expression as the GIN index task_search_idx (migration 0005)
+SEARCH_SQL = (
+    "to_tsvector('simple', {table}.title || ' ' || {table}.description) "
+    "@@ websearch_to_tsquery('simple', %s)"
+)
+
+
+def search_tasks(queryset, terms):
+    """Tasks whose title or description match all words of ``terms``.
+
+    PostgreSQL matches whole words through the full-text index; other
+    backends fall back to substring matching.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        table = connection.ops.quote_name(Task._meta.db_table)
+        return queryset.filter(
+            RawSQL(
+                SEARCH_SQL.format(table=table),
+                [terms],
+                output_field=BooleanField(),
+            )
+        )
+    for word in terms.split():
+        queryset = queryset.filter(
+            Q(title__icontains=word) | Q(description__icontains=word)
+        )
+    return queryset
+
+
+class TaskFilter(BaseFilterBackend):
+    """Applies the TaskFilterSerializer query parameters.
+
+    Ordering is by the column with the id as tie-breaker; the list is
+    paged with KeysetCursorPagination, whose cursors hold both, so
+    repeated and NULL values page through like any other.
+    """
+
+    lookups = {
+        "board": "board_id",
+        "status": "status",
+        "priority": "priority",
+        "assignee": "assignee_id",
+        "reviewer": "reviewer_id",
+        "due_date": "due_date",
+        "due_date_after": "due_date__gte",
+        "due_date_before": "due_date__lte",
+    }
+
+    def get_params(self, request):
+        serializer = TaskFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def filter_queryset(self, request, queryset, view):
+        params = self.get_params(request)
+        queryset = queryset.filter(
+            **{
+                lookup: params[name]
+                for name, lookup in self.lookups.items()
+                if name in params
+            }
+        )
+        if params.get("search"):
+            queryset = search_tasks(queryset, params["search"])
+        return queryset
+
+    def get_ordering(self, request, queryset, view):
+        """Ordering for CursorPagination, None for its default."""
+        ordering = self.get_params(request).get("ordering")
+        if not ordering:
+            return None
+        column = SORT_COLUMNS[ordering.lstrip("-")]
+        if ordering.startswith("-"):
+            return (f"-{column}", "-id")
+        return (column, "id")
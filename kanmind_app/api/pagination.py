@@ -0,0 +1,308 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class IdCursorPagination(CursorPagination):
+    """Keyset pagination over the primary key.
+
+    Pages are fetched with ``WHERE id > <cursor> LIMIT n``, so the cost
+    of a page does not grow with its position in the result set.
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 200
+
+
+class CreatedAtCursorPagination(IdCursorPagination):
+    """Keyset pagination in creation order, ties broken by id."""
+
+    ordering = ("created_at", "id")
+
+
+def sort_fields(ordering):
+    """Column names of a pagination ``ordering``, without directions."""
+    fields = [ordering] if isinstance(ordering, str) else ordering
+    return [field.lstrip("-") for field in fields]
+
+
+def _decode_cursor(encoded):
+    try:
+        cursor = json.loads(urlsafe_b64decode(encoded.encode("ascii")))
+        return cursor["k"], bool(cursor.get("r"))
+    except (TypeError, ValueError, KeyError, UnicodeEncodeError):
+        raise NotFound(CursorPagination.invalid_cursor_message)
+
+
+def _encode_key(key, reverse=False):
+    payload = {"k": key, "r": 1} if reverse else {"k": key}
+    # Full precision: DjangoJSONEncoder would cut microseconds
+    return urlsafe_b64encode(
+        json.dumps(payload, default=lambda value: value.isoformat()).encode()
+    ).decode("ascii")
+
+
+def _encode_cursor(request, pagination, key, reverse):
+    return replace_query_param(
+        request.build_absolute_uri(),
+        pagination.cursor_query_param,
+        _encode_key(key, reverse),
+    )
+
+
+class Keyset:
+    """Keyset paging over the columns of ``ordering``.
+
+    The ordering is all ascending or all descending and unique as a
+    whole (ending with the id). NULLs of nullable columns sort after
+    every value: last ascending, first descending.
+    """
+
+    def __init__(self, model, ordering):
+        ordering = [ordering] if isinstance(ordering, str) else ordering
+        self.descending = ordering[0].startswith("-")
+        self.fields = sort_fields(ordering)
+        self.columns = {
+            field: model._meta.get_field(field) for field in self.fields
+        }
+        self.nullable = {
+            field for field, column in self.columns.items() if column.null
+        }
+
+    def parse(self, key):
+        """A cursor's ``key``, converted to the types of the columns.
+
+        Anything a cursor made here cannot hold raises NotFound, as
+        CursorPagination does for invalid cursors.
+        """
+        if not isinstance(key, list) or len(key) != len(self.fields):
+            raise NotFound(CursorPagination.invalid_cursor_message)
+        try:
+            return [
+                self.convert(field, value)
+                for field, value in zip(self.fields, key)
+            ]
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(CursorPagination.invalid_cursor_message)
+
+    def convert(self, field, value):
+        if value is None and field in self.nullable:
+            return None
+        if not isinstance(value, (str, int)) or isinstance(value, bool):
+            raise ValueError(value)
+        value = self.columns[field].to_python(value)
+        if isinstance(value, datetime) and timezone.is_naive(value):
+            raise ValueError(value)
+        return value
+
+    def order_by(self, backwards=False):
+        if self.descending == backwards:
+            return [
+                F(field).asc(nulls_last=True)
+                if field in self.nullable
+                else F(field).asc()
+                for field in self.fields
+            ]
+        return [
+            F(field).desc(nulls_first=True)
+            if field in self.nullable
+            else F(field).desc()
+            for field in self.fields
+        ]
+
+    def beyond(self, key, backwards=False):
+        """Rows after ``key`` in order, before it if ``backwards``."""
+        lookup = "gt" if self.descending == backwards else "lt"
+        condition = self.compare(self.fields[-1], lookup, key[-1])
+        for field, value in zip(self.fields[-2::-1], key[-2::-1]):
+            condition = self.compare(field, lookup, value) | (
+                self.compare(field, "exact", value) & condition
+            )
+        return condition
+
+    def compare(self, field, lookup, value):
+        if field not in self.nullable:
+            return Q(**{f"{field}__{lookup}": value})
+        # NULL sorts as the greatest value
+        if value is None:
+            return {
+                "gt": Q(pk__in=[]),
+                "lt": Q(**{f"{field}__isnull": False}),
+                "exact": Q(**{f"{field}__isnull": True}),
+            }[lookup]
+        if lookup == "gt":
+            return Q(**{f"{field}__gt": value}) | Q(
+                **{f"{field}__isnull": True}
+            )
+        return Q(**{f"{field}__{lookup}": value})
+
+    def key(self, item):
+        # Items are model instances or .values() rows
+        if isinstance(item, dict):
+            return [item[field] for field in self.fields]
+        return [getattr(item, field) for field in self.fields]
+
+
+def _keyset_query(request, queryset, pagination, keyset):
+    encoded = request.query_params.get(pagination.cursor_query_param)
+    key, reverse = _decode_cursor(encoded) if encoded else (None, False)
+    if key is not None:
+        key = keyset.parse(key)
+        queryset = queryset.filter(keyset.beyond(key, backwards=reverse))
+    page_size = pagination.get_page_size(request)
+    queryset = queryset.order_by(*keyset.order_by(backwards=reverse))
+    return queryset[: page_size + 1], key, reverse
+
+
+def _keyset_page(request, pagination, keyset, items, key, reverse):
+    """``(items, next_url, previous_url)`` from the fetched rows."""
+    page_size = pagination.get_page_size(request)
+    has_more = len(items) > page_size
+    items = list(items[:page_size])
+    if reverse:
+        items.reverse()
+    if not items:
+        return items, None, None
+
+    def link(item, reverse):
+        return _encode_cursor(request, pagination, keyset.key(item), reverse)
+
+    # Walking backwards, the cursor row itself is still ahead
+    has_next = has_more or reverse
+    has_previous = has_more if reverse else key is not None
+    return (
+        items,
+        link(items[-1], False) if has_next else None,
+        link(items[0], True) if has_previous else None,
+    )
+
+
+class KeysetCursorPagination(IdCursorPagination):
+    """Cursor pagination whose cursors carry the whole sort key.
+
+    DRF's CursorPagination positions a cursor on the first ordering
+    field plus an offset capped by ``offset_cutoff``, so with more rows
+    than that sharing a value, pages repeat. Here every page is one
+    keyset query on all fields of the ordering (see Keyset), which may
+    come from the view's filter backends as usual.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.keyset = Keyset(
+            queryset.model, self.get_ordering(request, queryset, view)
+        )
+        rows, key, reverse = _keyset_query(
+            request, queryset, self, self.keyset
+        )
+        items, self.next_url, self.previous_url = _keyset_page(
+            request, self, self.keyset, rows, key, reverse
+        )
+        return items
+
+    def get_next_link(self):
+        return self.next_url
+
+    def get_previous_link(self):
+        return self.previous_url
+
+
+async def apaginate(request, queryset, pagination_class=IdCursorPagination):
+    """One page of ``queryset`` for the async views, fetched async.
+
+    Uses the ordering and page size of ``pagination_class``, which must
+    fit Keyset. Cursors carry the full sort key, so every page is a
+    plain keyset query. Returns ``(items, next_url, previous_url)``.
+    """
+    pagination = pagination_class()
+    keyset = Keyset(queryset.model, pagination.ordering)
+    rows, key, reverse = _keyset_query(request, queryset, pagination, keyset)
+    items = [item async for item in rows]
+    return _keyset_page(request, pagination, keyset, items, key, reverse)
+
+
+class Timeline:
+    """Keyset pages of a queryset, newest first, like a chat history.
+
+    ``?before=<cursor>`` pages back to older items, ``?after=<cursor>``
+    forward to newer ones; without either the newest page is sent.
+    Cursors are opaque and carry the full sort key, so every page is
+    one ``WHERE key < cursor ORDER BY key DESC LIMIT n`` (or the
+    ascending mirror image), whatever its position. The ``newer`` link
+    is always set once a page has items, for clients polling for new
+    ones.
+    """
+
+    ordering = ("created_at", "id")
+    page_size = 50
+    max_page_size = 200
+
+    def __init__(self, request):
+        self.request = request
+        params = request.query_params
+        if "before" in params and "after" in params:
+            raise ValidationError("Use either before or after, not both.")
+        self.direction = "after" if "after" in params else "before"
+        encoded = params.get(self.direction)
+        self.key = None
+        if encoded is not None:
+            self.key, _ = _decode_cursor(encoded)
+        try:
+            self.limit = min(
+                int(params.get("page_size", self.page_size)),
+                self.max_page_size,
+            )
+        except ValueError:
+            self.limit = self.page_size
+        self.limit = max(self.limit, 1)
+
+    def queryset(self, queryset):
+        """The rows of this page, one more than fit, in query order."""
+        keyset = Keyset(queryset.model, self.ordering)
+        backwards = self.direction == "before"
+        if self.key is not None:
+            key = keyset.parse(self.key)
+            queryset = queryset.filter(keyset.beyond(key, backwards))
+        order = keyset.order_by(backwards)
+        return queryset.order_by(*order)[: self.limit + 1]
+
+    def page(self, items):
+        """``(items, newer_url, older_url)`` from the queryset() rows.
+
+        Items are returned newest first.
+        """
+        forward = self.direction == "after"
+        more = len(items) > self.limit
+        items = list(items[: self.limit])
+        if forward:
+            items.reverse()
+        if not items:
+            # Nothing newer yet: poll again with the same cursor
+            newer = self.request.build_absolute_uri() if forward else None
+            return items, newer, None
+        # Paging forward, the cursor row itself is older still
+        has_older = more or forward
+        return (
+            items,
+            self.link("after", items[0]),
+            self.link("before", items[-1]) if has_older else None,
+        )
+
+    def link(self, direction, item):
+        if isinstance(item, dict):
+            key = [item[field] for field in self.ordering]
+        else:
+            key = [getattr(item, field) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, "before")
+        url = remove_query_param(url, "after")
+        return replace_query_param(url, direction, _encode_key(key))
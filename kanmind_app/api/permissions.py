@@ -1,10 +1,26 @@
-from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 
+from kanmind_app.access import get_board_access
 from kanmind_app.models import Board, Task
 
 
+def can_view_board(request, obj, board_id):
+    """``obj``'s board access, from with_board_access() if annotated."""
+    visible = getattr(obj, "board_visible", None)
+    if visible is None:
+        return get_board_access(request).can_view(board_id)
+    return visible
+
+
+def owns_board(request, obj, board_id):
+    owned = getattr(obj, "board_owned", None)
+    if owned is None:
+        return get_board_access(request).owns(board_id)
+    return owned
+
+
 class IsBoardOwnerOrMember(BasePermission):
     """Object-level permission for Board detail operations.
 
@@ -14,13 +30,10 @@ class IsBoardOwnerOrMember(BasePermission):
 
     def has_object_permission(self, request, view, obj):
         if request.method == "DELETE":
-            return obj.owner == request.user
+            return obj.owner_id == request.user.pk
 
         # Read/update: owner or member can access
-        return (
-            obj.members.filter(pk=request.user.pk).exists()
-            or obj.owner == request.user
-        )
+        return can_view_board(request, obj, obj.pk)
 
 
 class IsBoardMemberForTasks(BasePermission):
@@ -35,22 +48,20 @@ class IsBoardMemberForTasks(BasePermission):
             return True
 
         board_id = request.data.get("board")
-        get_object_or_404(
-            Board, id=board_id
-        )  # 404 if no board found, continiue otherwise
-
         if board_id is None:
-            return True  # Let serializer validate required field
+            raise Http404("No Board matches the given query.")
 
         try:
             board_id = int(board_id)
-            return Board.objects.filter(
-                Q(id=board_id),
-                Q(owner=request.user) | Q(members=request.user),
-            ).exists()
         except (ValueError, TypeError):
             return True  # Let serializer return 400 Bad Request
 
+        if get_board_access(request).can_view(board_id):
+            return True
+        # Only hit the database to tell 404 from 403
+        get_object_or_404(Board.objects.only("pk"), pk=board_id)
+        return False
+
 
 class IsTaskCreatorOrBoardOwnerOrBoardMember(BasePermission):
     """Permissions for individual task operations.
@@ -60,15 +71,13 @@ class IsTaskCreatorOrBoardOwnerOrBoardMember(BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        user = request.user
         if request.method == "DELETE":
-            return obj.created_by == user or obj.board.owner == user
+            return obj.created_by_id == request.user.pk or owns_board(
+                request, obj, obj.board_id
+            )
 
         # Read/update: Any board member/owner
-        return (
-            obj.board.owner == user
-            or obj.board.members.filter(pk=user.pk).exists()
-        )
+        return can_view_board(request, obj, obj.board_id)
 
 
 class IsBoardMemberForTaskComments(BasePermission):
@@ -79,26 +88,16 @@ class IsBoardMemberForTaskComments(BasePermission):
     """
 
     def has_permission(self, request, view):
-        task_id = view.kwargs.get("task_id")
-        get_object_or_404(
-            Task, id=task_id
+        task = get_object_or_404(
+            Task.objects.only("board_id"), pk=view.kwargs.get("task_id")
         )  # 404 if no task found, continiue otherwise
 
-        try:
-            task = Task.objects.get(id=task_id)
-        except Task.DoesNotExist:
-            return False
-
-        board = task.board
         # User must be board owner or member to create comment
-        return (
-            board.owner == request.user
-            or board.members.filter(pk=request.user.pk).exists()
-        )
+        return get_board_access(request).can_view(task.board_id)
 
 
 class IsCommentAuthor(BasePermission):
     """Restricts comment deletion to author only."""
 
     def has_object_permission(self, request, view, obj):
-        return obj.author == request.user
+        return obj.author_id == request.user.pk
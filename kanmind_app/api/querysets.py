@@ -0,0 +1,91 @@
+"""Queryset plans shared by the API views and nested serializers.
+
+Each plan loads everything its serializer reads, so rendering a list
+costs a fixed number of queries regardless of its length.
+"""
+
+from django.db.models import (
+    Count,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+
+from kanmind_app.models import Board, Task
+
+TASK_USER_FIELDS = ("created_by", "assignee", "reviewer")
+
+
+def count_subquery(model, fk_field):
+    """Correlated COUNT of ``model`` rows pointing at the outer row."""
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{fk_field: OuterRef("pk")})
+            .order_by()
+            .values(fk_field)
+            .annotate(count=Count("pk"))
+            .values("count"),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def boards_for_user(user):
+    """Boards the user owns or is a member of, without duplicate rows.
+
+    Membership is resolved through a subquery instead of an OR-join,
+    so no DISTINCT is needed and aggregates stay correct.
+    """
+    member_board_ids = Board.members.through.objects.filter(
+        user_id=user.pk
+    ).values("board_id")
+    return Board.objects.filter(Q(owner=user) | Q(id__in=member_board_ids))
+
+
+def board_list_queryset(user):
+    """Board list with its summary counts.
+
+    The counts are read from the board's BoardStats row (maintained by
+    kanmind_app.counters), so they cost one join, not an aggregate over
+    the board's tasks.
+    """
+    return boards_for_user(user).annotate(
+        member_count=Coalesce("stats__member_count", 0),
+        ticket_count=Coalesce("stats__task_count", 0),
+        tasks_to_do_count=Coalesce("stats__to_do_count", 0),
+        tasks_high_prio_count=Coalesce("stats__high_priority_count", 0),
+    )
+
+
+def task_queryset(fields=None):
+    """Tasks with their users joined in.
+
+    Backs every endpoint rendered through ``TaskSerializer``. ``fields``
+    is the sparse fieldset of the request; joins for fields the client
+    did not ask for are skipped.
+    """
+    queryset = Task.objects.all()
+    users = [f for f in TASK_USER_FIELDS if fields is None or f in fields]
+    if users:
+        # select_related() without arguments would follow every FK
+        queryset = queryset.select_related(*users)
+    return queryset
+
+
+def board_detail_prefetches(with_tasks=True):
+    """Prefetch lookups for members and, optionally, planned tasks."""
+    lookups = ["members"]
+    if with_tasks:
+        lookups.append(Prefetch("tasks", queryset=task_queryset()))
+    return lookups
+
+
+def board_detail_queryset(with_tasks=True):
+    """Boards with members and, optionally, their planned tasks."""
+    return Board.objects.prefetch_related(
+        *board_detail_prefetches(with_tasks)
+    )
@@ -0,0 +1,108 @@
+"""orjson-backed JSON renderer and parser.
+
+Drop-in replacements for DRF's JSONRenderer and JSONParser, selected in
+REST_FRAMEWORK settings. orjson is optional: without it, and for the
+cases orjson does not cover (indented output, ASCII-only output,
+non-UTF-8 request bodies), the stdlib implementations are used.
+"""
+
+import json
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from kanmind_app.instrumentation import phase
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer with the same output, encoded by orjson."""
+
+    # Dates and times go to DRF's encoder too: orjson writes UTC as
+    # "+00:00" where DRF writes "Z"
+    options = (
+        orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson
+        else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with phase("render"):
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type, renderer_context):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+        # Types orjson does not know (Decimal, lazy strings, querysets)
+        # are converted as DRF's encoder does
+        try:
+            ret = orjson.dumps(
+                data, default=JSONEncoder().default, option=self.options
+            )
+        except TypeError:
+            # Integers wider than 64 bits, which only json can write
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like JSONRenderer does, to stay a subset of JavaScript
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser that decodes UTF-8 bodies with orjson."""
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get(
+            "encoding", settings.DEFAULT_CHARSET
+        )
+        if orjson is None or encoding.lower() not in ("utf-8", "utf8"):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class PrerenderedJSONResponse(Response):
+    """Response whose body was rendered by FastJSONRenderer beforehand.
+
+    Plain JSON requests get ``body`` as is. Other renderers (the
+    browsable API, ``?format=json&indent=``) render the decoded data.
+    """
+
+    def __init__(self, body, **kwargs):
+        self.body = body
+        super().__init__(**kwargs)
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = json.loads(self.body)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
+    @property
+    def rendered_content(self):
+        renderer = self.accepted_renderer
+        if isinstance(renderer, JSONRenderer) and not renderer.get_indent(
+            self.accepted_media_type, getattr(self, "renderer_context", {})
+        ):
+            self["Content-Type"] = renderer.media_type
+            return self.body
+        return super().rendered_content
@@ -1,13 +1,45 @@
 import re
+from collections import Counter
+from functools import cached_property
 
 from django.contrib.auth import authenticate, get_user_model
 from rest_framework import serializers
+from rest_framework.exceptions import NotFound, PermissionDenied
 
+from kanmind_app.access import get_board_access
 from kanmind_app.models import Board, Comment, Task
 
 User = get_user_model()
 
 
+def requested_fields(request):
+    """Parse the ``?fields=a,b`` sparse-fieldset parameter.
+
+    Returns a set of field names, or None if all fields are wanted.
+    """
+    if request is None or request.method != "GET":
+        return None
+    raw = request.query_params.get("fields")
+    if not raw:
+        return None
+    return {name.strip() for name in raw.split(",") if name.strip()}
+
+
+class SparseFieldsetMixin:
+    """Limit read output to the fields requested via ``?fields=``.
+
+    Only applies to the top-level serializer of a GET request; nested
+    serializers are built without a request and keep all fields.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = requested_fields(self.context.get("request"))
+        if fields:
+            for name in set(self.fields) - fields:
+                self.fields.pop(name)
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Basic user serializer for read operations.
 
@@ -81,7 +113,9 @@ class LoginSerializer(serializers.Serializer):
         return attrs
 
 
-class BoardListSerializer(serializers.ModelSerializer):
+class BoardListSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
     """Board listing serializer with summary statistics.
 
     Input: title, members (array of user IDs)
@@ -89,14 +123,15 @@ class BoardListSerializer(serializers.ModelSerializer):
     Prevents duplicate board titles per owner.
     """
 
-    owner_id = serializers.IntegerField(source="owner.id", read_only=True)
+    owner_id = serializers.IntegerField(read_only=True)
     members = serializers.PrimaryKeyRelatedField(
         many=True, queryset=User.objects.all(), write_only=True
     )
-    member_count = serializers.SerializerMethodField()
-    ticket_count = serializers.SerializerMethodField()
-    tasks_to_do_count = serializers.SerializerMethodField()
-    tasks_high_prio_count = serializers.SerializerMethodField()
+    # Counts are annotated on the queryset (see api.querysets)
+    member_count = serializers.IntegerField(read_only=True)
+    ticket_count = serializers.IntegerField(read_only=True)
+    tasks_to_do_count = serializers.IntegerField(read_only=True)
+    tasks_high_prio_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Board
@@ -124,20 +159,10 @@ class BoardListSerializer(serializers.ModelSerializer):
             )
         return attrs
 
-    def get_member_count(self, obj):
-        return obj.members.count()
-
-    def get_ticket_count(self, obj):
-        return obj.tasks.count()
 
-    def get_tasks_to_do_count(self, obj):
-        return obj.tasks.filter(status="todo").count()
-
-    def get_tasks_high_prio_count(self, obj):
-        return obj.tasks.filter(priority="high").count()
-
-
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
     """Task operations with dual input/output user representations.
 
     Input IDs: assignee_id, reviewer_id (write_only)
@@ -164,7 +189,6 @@ class TaskSerializer(serializers.ModelSerializer):
     # Nested users for read operations
     assignee = UserSerializer(read_only=True)
     reviewer = UserSerializer(read_only=True)
-    comments_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Task
@@ -183,10 +207,155 @@ class TaskSerializer(serializers.ModelSerializer):
             "reviewer_id",
             "created_by",
         ]
-        read_only_fields = ["created_by"]
+        # comments_count is kept on the task (kanmind_app.counters)
+        read_only_fields = ["created_by", "comments_count"]
+
+
+def raw_ids(items, key):
+    """Integer ``key`` values of raw bulk items, minus invalid ones."""
+    ids = []
+    for item in items if isinstance(items, list) else ():
+        try:
+            ids.append(int(item[key]))
+        except (KeyError, TypeError, ValueError):
+            pass
+    return ids
+
+
+class TaskBulkListSerializer(serializers.ListSerializer):
+    """List serializer for the bulk task endpoints.
+
+    Items reference boards, tasks and users by id. Those ids are looked
+    up here for all items at once (one query each, on first use), so
+    validating a hundred items costs as many queries as validating one.
+    Errors are reported per item, in request order.
+    """
+
+    @cached_property
+    def board_ids(self):
+        """Existing boards among those referenced."""
+        return set(
+            Board.objects.filter(
+                pk__in=raw_ids(self.initial_data, "board")
+            ).values_list("pk", flat=True)
+        )
+
+    @cached_property
+    def user_ids(self):
+        """Existing users among the referenced assignees/reviewers."""
+        ids = raw_ids(self.initial_data, "assignee_id")
+        ids += raw_ids(self.initial_data, "reviewer_id")
+        return set(
+            User.objects.filter(pk__in=ids).values_list("pk", flat=True)
+        )
+
+    @cached_property
+    def tasks(self):
+        return Task.objects.in_bulk(raw_ids(self.initial_data, "id"))
+
+    @cached_property
+    def task_id_counts(self):
+        return Counter(raw_ids(self.initial_data, "id"))
+
+
+class TaskBulkItemMixin:
+    """Reference checks shared by the bulk item serializers."""
+
+    does_not_exist = serializers.PrimaryKeyRelatedField.default_error_messages[
+        "does_not_exist"
+    ]
+
+    @property
+    def access(self):
+        return get_board_access(self.context["request"])
+
+    def validate_user_id(self, value):
+        if value is not None and value not in self.parent.user_ids:
+            raise serializers.ValidationError(
+                self.does_not_exist.format(pk_value=value)
+            )
+        return value
+
+    def validate_assignee_id(self, value):
+        return self.validate_user_id(value)
+
+    def validate_reviewer_id(self, value):
+        return self.validate_user_id(value)
+
+
+class TaskBulkCreateSerializer(TaskBulkItemMixin, serializers.ModelSerializer):
+    """One item of POST /tasks/bulk/, with the POST /tasks/ fields."""
+
+    board = serializers.IntegerField()
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
+    reviewer_id = serializers.IntegerField(required=False, allow_null=True)
+
+    class Meta:
+        model = Task
+        fields = [
+            "title",
+            "description",
+            "status",
+            "priority",
+            "due_date",
+            "board",
+            "assignee_id",
+            "reviewer_id",
+        ]
+        list_serializer_class = TaskBulkListSerializer
+
+    def validate_board(self, value):
+        """Same rules as IsBoardMemberForTasks, reported per item."""
+        if self.access.can_view(value):
+            return value
+        if value in self.parent.board_ids:
+            raise serializers.ValidationError(PermissionDenied.default_detail)
+        raise serializers.ValidationError(
+            self.does_not_exist.format(pk_value=value)
+        )
+
+
+class TaskBulkDeleteSerializer(TaskBulkItemMixin, serializers.Serializer):
+    """One item of DELETE /tasks/bulk/: ``{"id": <task id>}``.
+
+    The validated ``task`` is the loaded Task instance.
+    """
+
+    id = serializers.IntegerField(source="task")
+
+    class Meta:
+        list_serializer_class = TaskBulkListSerializer
+
+    def validate_id(self, value):
+        task = self.parent.tasks.get(value)
+        if task is None:
+            raise serializers.ValidationError(NotFound.default_detail)
+        if self.parent.task_id_counts[value] > 1:
+            raise serializers.ValidationError("Duplicate task.")
+        if not self.has_task_permission(task):
+            raise serializers.ValidationError(PermissionDenied.default_detail)
+        return task
+
+    def has_task_permission(self, task):
+        # Task creator or board owner, as for DELETE /tasks/{id}/
+        user = self.context["request"].user
+        return task.created_by_id == user.pk or self.access.owns(
+            task.board_id
+        )
+
+
+class TaskBulkUpdateSerializer(TaskBulkDeleteSerializer):
+    """One item of PATCH /tasks/bulk/: a task id plus the changes."""
+
+    status = serializers.ChoiceField(Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(
+        Task.PRIORITY_CHOICES, required=False, allow_blank=True
+    )
+    assignee_id = serializers.IntegerField(required=False, allow_null=True)
 
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+    def has_task_permission(self, task):
+        # Any board member, as for PATCH /tasks/{id}/
+        return self.access.can_view(task.board_id)
 
 
 class TaskDetailSerializer(TaskSerializer):
@@ -201,13 +370,14 @@ class TaskDetailSerializer(TaskSerializer):
         read_only_fields = [
             "board",
             "created_by",
+            "comments_count",
         ]
 
 
 class BoardFullSerializer(serializers.ModelSerializer):
     """Full board detail with nested tasks for GET requests."""
 
-    owner_id = serializers.IntegerField(source="owner.id", read_only=True)
+    owner_id = serializers.IntegerField(read_only=True)
     members = serializers.PrimaryKeyRelatedField(
         many=True, queryset=User.objects.all()
     )
@@ -215,11 +385,11 @@ class BoardFullSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        # Replacing plain member IDs with full UserSerializer objects
-        if instance.members.exists():
-            data["members"] = UserSerializer(
-                instance.members.all(), many=True
-            ).data
+        # Replacing plain member IDs with full UserSerializer objects,
+        # reusing the members prefetched by board_detail_queryset
+        data["members"] = UserSerializer(
+            instance.members.all(), many=True
+        ).data
         return data
 
     class Meta:
@@ -275,7 +445,57 @@ class EmailFilterSerializer(serializers.Serializer):
     email = serializers.EmailField()
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class TaskFilterSerializer(serializers.Serializer):
+    """Query parameters of GET /tasks/ (see api.filters.TaskFilter)."""
+
+    ORDERING_FIELDS = [
+        "board",
+        "status",
+        "priority",
+        "assignee",
+        "reviewer",
+        "due_date",
+    ]
+
+    board = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(Task.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(Task.PRIORITY_CHOICES, required=False)
+    assignee = serializers.IntegerField(required=False)
+    reviewer = serializers.IntegerField(required=False)
+    due_date = serializers.DateField(required=False)
+    due_date_after = serializers.DateField(required=False)
+    due_date_before = serializers.DateField(required=False)
+    search = serializers.CharField(
+        required=False, allow_blank=True, max_length=200
+    )
+    ordering = serializers.ChoiceField(
+        [f"{sign}{name}" for name in ORDERING_FIELDS for sign in ("", "-")],
+        required=False,
+    )
+
+
+class BoardViewSerializer(serializers.Serializer):
+    """Query parameters of GET /boards/{id}/ (see api.compiled).
+
+    ``view=summary`` sends the column counts only, ``view=columns`` the
+    first ``page_size`` tasks of every column, and ``status`` one page
+    of one column, continuing after task id ``after``. Without any of
+    them the whole board is sent.
+    """
+
+    VIEWS = ["full", "summary", "columns"]
+
+    view = serializers.ChoiceField(VIEWS, default="full")
+    status = serializers.ChoiceField(Task.STATUS_CHOICES, required=False)
+    page_size = serializers.IntegerField(
+        min_value=1, max_value=200, default=20
+    )
+    after = serializers.IntegerField(min_value=0, required=False)
+
+
+class CommentSerializer(
+    SparseFieldsetMixin, serializers.ModelSerializer
+):
     """Task comment serializer.
 
     Author shown as fullname only.
@@ -0,0 +1,150 @@
+"""Server-sent event stream of board changes.
+
+GET /api/boards/{board_id}/events/ streams the events published by
+kanmind_app.events for one board to its owner and members. It needs an
+ASGI server (``uvicorn core.asgi:application``): under WSGI each open
+stream would hold a worker, so the endpoint refuses with 501 there.
+
+EventSource cannot set headers, so instead of the API token it may
+pass a ``?ticket=`` from POST /api/boards/{board_id}/events/ticket/.
+Tickets are signed, only open that board's stream for that user, and
+expire after KANMIND_EVENT_TICKET_MAX_AGE seconds, so the long-lived
+token stays out of URLs and access logs. EventSource reconnects with
+the same URL: once the ticket expired, that fails with 401 and the
+client fetches a new ticket. Reconnecting clients send
+``Last-Event-ID`` (or ``?last_event_id=``) to resume.
+
+The broker is KANMIND_EVENT_BROKER. The default one is per process,
+see kanmind_app.events.
+"""
+
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import (
+    AuthenticationFailed,
+    NotAuthenticated,
+    PermissionDenied,
+)
+
+from kanmind_app.access import board_access_for_user
+from kanmind_app.api.authentication import authenticate_async
+from kanmind_app.events import get_broker
+from kanmind_app.models import Board, User
+
+TICKET_SALT = "kanmind.event-stream"
+
+
+def issue_ticket(user_id, board_id):
+    """A signed ticket opening ``board_id``'s stream for ``user_id``."""
+    return signing.dumps([user_id, board_id], salt=TICKET_SALT)
+
+
+def ticket_user_id(ticket, board_id):
+    """The user of an unexpired ``ticket`` for ``board_id``, or None."""
+    try:
+        user_id, ticket_board_id = signing.loads(
+            ticket,
+            salt=TICKET_SALT,
+            max_age=getattr(settings, "KANMIND_EVENT_TICKET_MAX_AGE", 60),
+        )
+    except signing.BadSignature:
+        return None
+    return user_id if ticket_board_id == board_id else None
+
+
+async def stream_user_id(request, board_id):
+    """The caller's user id, from ``?ticket=`` or the auth header.
+
+    Raises AuthenticationFailed or NotAuthenticated.
+    """
+    ticket = request.GET.get("ticket")
+    if ticket is None:
+        return (await authenticate_async(request)).pk
+    user_id = ticket_user_id(ticket, board_id)
+    if user_id is None or not await User.objects.filter(
+        pk=user_id, is_active=True
+    ).aexists():
+        raise AuthenticationFailed("Invalid or expired ticket.")
+    return user_id
+
+
+def get_last_event_id(request):
+    raw = request.headers.get("Last-Event-ID") or request.GET.get(
+        "last_event_id"
+    )
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def error(detail, status):
+    """JSON error body in DRF's {"detail": ...} shape."""
+    return JsonResponse({"detail": str(detail)}, status=status)
+
+
+async def board_events(request, board_id):
+    if not isinstance(request, ASGIRequest):
+        return error("Event streams require an ASGI server.", 501)
+
+    try:
+        user_id = await stream_user_id(request, board_id)
+    except (AuthenticationFailed, NotAuthenticated) as exc:
+        return error(exc.detail, 401)
+
+    access = await sync_to_async(board_access_for_user)(user_id)
+    if not access.can_view(board_id):
+        if await Board.objects.filter(pk=board_id).aexists():
+            return error(PermissionDenied.default_detail, 403)
+        return error("No Board matches the given query.", 404)
+
+    response = StreamingHttpResponse(
+        event_stream(board_id, user_id, get_last_event_id(request)),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # no proxy buffering (nginx)
+    return response
+
+
+async def event_stream(board_id, user_id, last_event_id):
+    """Yield SSE frames until the client leaves or loses access.
+
+    Streams end after KANMIND_EVENT_STREAM_MAX_AGE seconds so clients
+    reconnect (and are re-authorized) periodically.
+    """
+    broker = get_broker()
+    heartbeat = getattr(settings, "KANMIND_EVENT_HEARTBEAT", 15)
+    max_age = getattr(settings, "KANMIND_EVENT_STREAM_MAX_AGE", 600)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_age
+
+    subscription = broker.subscribe(board_id, last_event_id)
+    try:
+        yield "retry: 3000\n\n"
+        while loop.time() < deadline:
+            try:
+                event = await subscription.get(heartbeat)
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+            if event is None:
+                yield "event: resync\ndata: {}\n\n"
+                return
+            yield event.encode()
+            if event.type == "board.deleted":
+                return
+            if event.type == "members.removed" and (
+                user_id in event.data["user_ids"]
+            ):
+                # Removed from the board; the owner may still view it
+                access = await sync_to_async(board_access_for_user)(user_id)
+                if not access.can_view(board_id):
+                    return
+    finally:
+        broker.unsubscribe(subscription)
@@ -1,14 +1,23 @@
 from django.urls import path
 
+from kanmind_app.api import async_views
+from kanmind_app.api.streams import board_events
 from kanmind_app.api.views import (
     AssignedToUserTasksView,
+    BoardChangesView,
     BoardDetailView,
+    BoardEventTicketView,
+    BoardExportView,
+    BoardImportView,
     BoardListCreateView,
     CommentsDetailView,
     CommentsListCreateView,
+    CommentTimelineView,
     EmailCheckView,
     LoginView,
+    LogoutView,
     RegistrationView,
+    TaskBulkView,
     TaskDetailView,
     TaskListCreateView,
     UserIsReviewingTasksView,
@@ -17,12 +26,33 @@ from kanmind_app.api.views import (
 urlpatterns = [
     path("registration/", RegistrationView.as_view(), name="register"),
     path("login/", LoginView.as_view(), name="login"),
+    path("logout/", LogoutView.as_view(), name="logout"),
     path("email-check/", EmailCheckView.as_view(), name="email-check"),
     path("boards/", BoardListCreateView.as_view(), name="boards-list"),
+    path("boards/import/", BoardImportView.as_view(), name="boards-import"),
     path(
         "boards/<int:board_id>/", BoardDetailView.as_view(), name="boards-list"
     ),
+    path(
+        "boards/<int:board_id>/changes/",
+        BoardChangesView.as_view(),
+        name="board-changes",
+    ),
+    path(
+        "boards/<int:board_id>/events/", board_events, name="board-events"
+    ),
+    path(
+        "boards/<int:board_id>/events/ticket/",
+        BoardEventTicketView.as_view(),
+        name="board-events-ticket",
+    ),
+    path(
+        "boards/<int:board_id>/export/",
+        BoardExportView.as_view(),
+        name="board-export",
+    ),
     path("tasks/", TaskListCreateView.as_view(), name="tasks-list"),
+    path("tasks/bulk/", TaskBulkView.as_view(), name="tasks-bulk"),
     path(
         "tasks/<int:task_id>/", TaskDetailView.as_view(), name="tasks-detail"
     ),
@@ -41,9 +71,36 @@ urlpatterns = [
         CommentsListCreateView.as_view(),
         name="comments-list",
     ),
+    path(
+        "tasks/<int:task_id>/comments/timeline/",
+        CommentTimelineView.as_view(),
+        name="comments-timeline",
+    ),
     path(
         "tasks/<int:task_id>/comments/<int:comment_id>/",
         CommentsDetailView.as_view(),
         name="comments-detail",
     ),
+    # Async read endpoints, see api.async_views
+    path("async/boards/", async_views.board_list, name="async-boards-list"),
+    path(
+        "async/boards/<int:board_id>/",
+        async_views.board_detail,
+        name="async-boards-detail",
+    ),
+    path(
+        "async/tasks/assigned-to-me/",
+        async_views.assigned_to_me,
+        name="async-assigned-to-user",
+    ),
+    path(
+        "async/tasks/reviewing/",
+        async_views.reviewing,
+        name="async-user-reviewing",
+    ),
+    path(
+        "async/tasks/<int:task_id>/comments/",
+        async_views.comment_list,
+        name="async-comments-list",
+    ),
 ]
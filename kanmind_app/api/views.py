@@ -1,18 +1,40 @@
+import time
+
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import (
+    APIException,
+    NotFound,
+    PermissionDenied,
+    ValidationError,
+)
 from rest_framework.generics import (
     DestroyAPIView,
+    GenericAPIView,
     ListAPIView,
     ListCreateAPIView,
+    RetrieveAPIView,
     RetrieveUpdateDestroyAPIView,
 )
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework.views import APIView
-
+from rest_framework.views import APIView, exception_handler
+
+from kanmind_app.access import get_board_access, with_board_access
+from kanmind_app.api.compiled import (
+    CompiledCommentSerializer,
+    CompiledTaskSerializer,
+    CompiledUserSerializer,
+    board_view_body,
+    board_view_etag,
+)
+from kanmind_app.api.filters import TaskFilter
 from kanmind_app.api.permissions import (
     IsBoardMemberForTaskComments,
     IsBoardMemberForTasks,
@@ -20,24 +42,116 @@ from kanmind_app.api.permissions import (
     IsCommentAuthor,
     IsTaskCreatorOrBoardOwnerOrBoardMember,
 )
+from kanmind_app.api.conditional import (
+    add_validators,
+    make_etag,
+    not_modified,
+)
+from kanmind_app.api.pagination import (
+    CreatedAtCursorPagination,
+    KeysetCursorPagination,
+    Timeline,
+    sort_fields,
+)
+from kanmind_app.api.querysets import (
+    board_detail_queryset,
+    board_list_queryset,
+    task_queryset,
+)
+from kanmind_app.api.renderers import PrerenderedJSONResponse
+from kanmind_app.api.streams import issue_ticket
+from kanmind_app.archive import export_board, import_board
+from kanmind_app.hashing import HashingUnavailable
+from kanmind_app.bulk import create_tasks, delete_tasks, update_tasks
+from kanmind_app.instrumentation import phase
+from kanmind_app.metrics import registry
 from kanmind_app.models import Board, Comment, Task
+from kanmind_app.sync import (
+    SyncReset,
+    changed_rows,
+    decode_cursor,
+    encode_cursor,
+    retention_horizon,
+    unchanged_since,
+)
 
 from .serializers import (
     BoardDetailSerializer,
     BoardFullSerializer,
     BoardListSerializer,
+    BoardViewSerializer,
     CommentSerializer,
     EmailFilterSerializer,
     LoginSerializer,
     RegistrationSerializer,
+    TaskBulkCreateSerializer,
+    TaskBulkDeleteSerializer,
+    TaskBulkUpdateSerializer,
     TaskDetailSerializer,
     TaskSerializer,
     UserSerializer,
+    requested_fields,
 )
 
 User = get_user_model()
 
 
+class HashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many concurrent logins, please retry shortly."
+    default_code = "hashing_unavailable"
+
+
+def timed_auth_response(endpoint, handler, request):
+    """Run an auth handler, recording its latency.
+
+    The duration is kept in the metrics registry and also sent back as
+    a Server-Timing header. A full hashing pool is answered with 503.
+    """
+    start = time.perf_counter()
+    try:
+        response = handler(request)
+    except HashingUnavailable:
+        response = exception_handler(HashingBusy(), {"request": request})
+    elapsed = time.perf_counter() - start
+    registry.observe(
+        "kanmind_auth_request_seconds",
+        elapsed,
+        endpoint=endpoint,
+        status=response.status_code,
+    )
+    response["Server-Timing"] = f"auth;dur={elapsed * 1000:.1f}"
+    return response
+
+
+class CompiledListMixin:
+    """Render GET lists with a compiled serializer (api.compiled).
+
+    Filtering and pagination work as usual, on ``.values()`` rows.
+    """
+
+    compiled_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.compiled_serializer_class(requested_fields(request))
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = serializer.values(queryset, self.sort_key(queryset))
+        page = self.paginate_queryset(queryset)
+        with phase("serialize"):
+            if page is None:
+                return Response(serializer.data(queryset))
+            return self.get_paginated_response(serializer.data(page))
+
+    def sort_key(self, queryset):
+        """Columns the paginator's cursors are built from."""
+        paginator = self.paginator
+        if not hasattr(paginator, "get_ordering"):
+            return []
+        return sort_fields(
+            paginator.get_ordering(self.request, queryset, self)
+        )
+
+
 class RegistrationView(APIView):
     """Handles user registration with token authentication.
 
@@ -48,6 +162,9 @@ class RegistrationView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
+        return timed_auth_response("registration", self.register, request)
+
+    def register(self, request):
         serializer = RegistrationSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
@@ -71,6 +188,9 @@ class LoginView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
+        return timed_auth_response("login", self.login, request)
+
+    def login(self, request):
         serializer = LoginSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.validated_data["user"]
@@ -86,24 +206,34 @@ class LoginView(APIView):
         return Response(serializer.errors, status=400)
 
 
+class LogoutView(APIView):
+    """Deletes the caller's token, ending the session on all devices."""
+
+    def post(self, request):
+        if request.auth is not None:
+            request.auth.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class BoardListCreateView(ListCreateAPIView):
     """CRUD operations for Boards - List user's boards + create new ones.
 
     GET: Returns boards where user is owner OR member
     POST: Creates board with current user as owner
+    Summary counts come from one annotated query, not per-board queries.
     """
 
     serializer_class = BoardListSerializer
 
     def get_queryset(self):
         """Filter boards to only show user's owned or member boards."""
-
-        user = self.request.user
-        return Board.objects.filter(Q(owner=user) | Q(members=user)).distinct()
+        return board_list_queryset(self.request.user)
 
     def perform_create(self, serializer):
         """Automatically set board owner to current user."""
-        serializer.save(owner=self.request.user)
+        board = serializer.save(owner=self.request.user)
+        # Reload with annotations so the response carries the counts
+        serializer.instance = self.get_queryset().get(pk=board.pk)
 
 
 class BoardDetailView(RetrieveUpdateDestroyAPIView):
@@ -111,12 +241,39 @@ class BoardDetailView(RetrieveUpdateDestroyAPIView):
 
     Requires: IsAuthenticated + IsBoardOwnerOrMember permission
     URL: /boards/{board_id}/
+    GET sends the whole board, or with ?view=summary|columns or
+    ?status= a part of it (see BoardViewSerializer). It supports
+    If-None-Match / If-Modified-Since against the board version
+    (updated_at), answering 304 before anything is serialized.
     """
 
-    queryset = Board.objects.all()
     permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
     lookup_url_kwarg = "board_id"
 
+    def get_queryset(self):
+        if self.request.method == "GET":
+            # Members and tasks are read in retrieve() only when the
+            # client's copy is stale; the column counts come with the
+            # board
+            queryset = Board.objects.select_related("stats")
+        else:
+            queryset = board_detail_queryset(with_tasks=False)
+        # The permission check reads the access annotations
+        return with_board_access(queryset, self.request.user.pk)
+
+    def retrieve(self, request, *args, **kwargs):
+        board = self.get_object()
+        params = BoardViewSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        params = params.validated_data
+        etag = board_view_etag(board, params)
+        response = not_modified(request, etag, board.updated_at)
+        if response is None:
+            response = PrerenderedJSONResponse(
+                board_view_body(request, board, params)
+            )
+        return add_validators(response, etag, board.updated_at)
+
     def get_serializer_class(self):
         # GET → extended serializer
         if self.request.method == "GET":
@@ -125,31 +282,257 @@ class BoardDetailView(RetrieveUpdateDestroyAPIView):
         return BoardDetailSerializer
 
 
-class TaskListCreateView(ListCreateAPIView):
-    """Task creation within boards + list all tasks.
+class BoardChangesView(RetrieveAPIView):
+    """What changed in a board since a sync cursor (kanmind_app.sync).
+
+    URL: /boards/{board_id}/changes/?since=<cursor>
+    Returns the tasks and comments created or updated, the ids of those
+    deleted, and the member list if it changed; without ``since``, the
+    whole board. ``cursor`` is the ``since`` of the next call. 410 asks
+    the client to reload the board: the cursor is older than the kept
+    tombstones, or more than KANMIND_SYNC_MAX_CHANGES rows changed.
+    """
+
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+    lookup_url_kwarg = "board_id"
+
+    def get_queryset(self):
+        return with_board_access(Board.objects.all(), self.request.user.pk)
+
+    def get_since(self):
+        cursor = self.request.query_params.get("since")
+        if cursor is None:
+            return None
+        try:
+            since = decode_cursor(cursor)
+        except (ValueError, OverflowError, OSError):
+            raise ValidationError({"since": "Invalid cursor."})
+        if since < retention_horizon():
+            raise SyncReset()
+        return since
+
+    def retrieve(self, request, *args, **kwargs):
+        # Taken before anything is read, so no write is skipped
+        cursor = encode_cursor(timezone.now())
+        board = self.get_object()
+        since = self.get_since()
+        data = {
+            "cursor": cursor,
+            "id": board.pk,
+            "title": board.title,
+            "owner_id": board.owner_id,
+            "members": None,
+            "tasks": [],
+            "comments": [],
+            "deleted": {"tasks": [], "comments": []},
+        }
+        if unchanged_since(board, since):
+            return Response(data)
+
+        tasks = CompiledTaskSerializer()
+        comments = CompiledCommentSerializer()
+        changed_tasks, changed_comments, tombstones, members_changed = (
+            changed_rows(
+                board,
+                since,
+                tasks.values(Task.objects.order_by("pk")),
+                comments.values(Comment.objects.order_by("pk")),
+            )
+        )
+        tombstones = tombstones.values_list("kind", "object_id")
+        # Past this many changes, reloading the board is cheaper
+        limit = None if since is None else settings.KANMIND_SYNC_MAX_CHANGES
+        if limit is not None:
+            changed_tasks = changed_tasks[: limit + 1]
+            changed_comments = changed_comments[: limit + 1]
+            tombstones = tombstones[: limit + 1]
+        rows = [list(changed_tasks), list(changed_comments), list(tombstones)]
+        if limit is not None and sum(map(len, rows)) > limit:
+            raise SyncReset("Too many changes, reload the board.")
+
+        with phase("serialize"):
+            data["tasks"] = tasks.data(rows[0])
+            data["comments"] = comments.data(rows[1])
+            for kind, object_id in rows[2]:
+                data["deleted"][f"{kind}s"].append(object_id)
+            if members_changed:
+                users = CompiledUserSerializer()
+                data["members"] = users.data(
+                    users.values(board.members.order_by("pk"))
+                )
+        return Response(data)
+
+
+class BoardEventTicketView(GenericAPIView):
+    """Issue a ticket for the board's event stream (api.streams).
+
+    URL: /boards/{board_id}/events/ticket/
+    EventSource cannot send the Authorization header; the stream takes
+    the ticket as ``?ticket=`` instead of the API token.
+    """
+
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+    lookup_url_kwarg = "board_id"
+
+    def get_queryset(self):
+        return with_board_access(Board.objects.all(), self.request.user.pk)
+
+    def post(self, request, *args, **kwargs):
+        board = self.get_object()
+        return Response(
+            {
+                "ticket": issue_ticket(request.user.pk, board.pk),
+                "expires_in": settings.KANMIND_EVENT_TICKET_MAX_AGE,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class BoardExportView(RetrieveAPIView):
+    """Stream a board as an NDJSON archive (kanmind_app.archive).
+
+    URL: /boards/{board_id}/export/
+    Rows are read and sent in chunks, so large boards stream in flat
+    memory.
+    """
+
+    permission_classes = [IsAuthenticated, IsBoardOwnerOrMember]
+    lookup_url_kwarg = "board_id"
+
+    def get_queryset(self):
+        return with_board_access(
+            Board.objects.select_related("owner"), self.request.user.pk
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        board = self.get_object()
+        response = StreamingHttpResponse(
+            export_board(board), content_type="application/x-ndjson"
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="board-{board.pk}.ndjson"'
+        )
+        return response
+
+
+class BoardImportView(APIView):
+    """Create a board owned by the caller from an NDJSON archive.
+
+    URL: /boards/import/[?title=<new title>]
+    The request body is read line by line and inserted in chunks, in
+    one transaction. Users are matched by email and have to exist.
+    """
+
+    def post(self, request):
+        stream = request.stream
+        lines = iter(stream.readline, b"") if stream is not None else ()
+        importer = import_board(
+            lines, request.user, request.query_params.get("title")
+        )
+        return Response(
+            {
+                "id": importer.board.pk,
+                "title": importer.board.title,
+                **importer.counts,
+                "skipped_comments": importer.skipped_comments,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class TaskListCreateView(CompiledListMixin, ListCreateAPIView):
+    """Task creation within boards + list of the user's tasks.
 
     Permissions: IsAuthenticated + IsBoardMemberForTasks (board access check)
     POST requires 'board' ID in request body
+    GET lists tasks of the boards the user owns or is a member of,
+    filtered, searched and ordered by query parameters (api.filters).
     """
 
-    queryset = Task.objects.all()
     serializer_class = TaskSerializer
+    compiled_serializer_class = CompiledTaskSerializer
     permission_classes = [IsAuthenticated, IsBoardMemberForTasks]
+    filter_backends = [TaskFilter]
+    pagination_class = KeysetCursorPagination
+
+    def get_queryset(self):
+        board_ids = sorted(get_board_access(self.request).visible)
+        return task_queryset(requested_fields(self.request)).filter(
+            board_id__in=board_ids
+        )
 
     def perform_create(self, serializer):
         """Set task creator to current authenticated user."""
         serializer.save(created_by=self.request.user)
 
 
+class TaskBulkView(APIView):
+    """Create, update or delete many tasks in one transaction.
+
+    URL: /tasks/bulk/
+    POST: list of tasks, as for POST /tasks/
+    PATCH: list of {"id", "status", "priority", "assignee_id"} (moves)
+    DELETE: list of {"id"}
+    Permissions are the single-task ones, checked per item. If any item
+    is invalid nothing is written and the 400 response holds one error
+    object per item ({} for valid ones).
+    """
+
+    def validate(self, serializer_class):
+        serializer = serializer_class(
+            data=self.request.data,
+            many=True,
+            allow_empty=False,
+            max_length=settings.KANMIND_BULK_MAX_ITEMS,
+            context={"request": self.request},
+        )
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def tasks_response(self, tasks, code=status.HTTP_200_OK):
+        tasks = task_queryset().filter(pk__in=[task.pk for task in tasks])
+        return Response(
+            TaskSerializer(tasks.order_by("id"), many=True).data, status=code
+        )
+
+    def post(self, request):
+        tasks = create_tasks(
+            [
+                Task(
+                    board_id=item.pop("board"), created_by=request.user, **item
+                )
+                for item in self.validate(TaskBulkCreateSerializer)
+            ]
+        )
+        return self.tasks_response(tasks, status.HTTP_201_CREATED)
+
+    def patch(self, request):
+        tasks, fields = [], set()
+        for item in self.validate(TaskBulkUpdateSerializer):
+            task = item.pop("task")
+            for name, value in item.items():
+                setattr(task, name, value)
+            fields.update(name.removesuffix("_id") for name in item)
+            tasks.append(task)
+        update_tasks(tasks, sorted(fields))
+        return self.tasks_response(tasks)
+
+    def delete(self, request):
+        delete_tasks(
+            [item["task"] for item in self.validate(TaskBulkDeleteSerializer)]
+        )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class TaskDetailView(RetrieveUpdateDestroyAPIView):
     """Individual task operations with granular permissions.
 
     DELETE: Only task creator OR board owner
     GET/PATCH: Board members/owners
     URL: /tasks/{task_id}/
+    GET supports conditional requests against the board version.
     """
 
-    queryset = Task.objects.all()
     serializer_class = TaskDetailSerializer
     permission_classes = [
         IsAuthenticated,
@@ -157,6 +540,23 @@ class TaskDetailView(RetrieveUpdateDestroyAPIView):
     ]
     lookup_url_kwarg = "task_id"
 
+    def get_queryset(self):
+        # One query: the task, its users, board version and access
+        return with_board_access(
+            task_queryset().annotate(board_version=F("board__updated_at")),
+            self.request.user.pk,
+            board="board",
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        task = self.get_object()
+        # Task and comment writes bump the board version
+        etag = make_etag("task", task.pk, task.board_version)
+        response = not_modified(request, etag, task.board_version)
+        if response is None:
+            response = Response(self.get_serializer(task).data)
+        return add_validators(response, etag, task.board_version)
+
 
 class EmailCheckView(ListAPIView):
     """Check if email exists.
@@ -191,25 +591,31 @@ class EmailCheckView(ListAPIView):
         return Response(serializer.data)
 
 
-class AssignedToUserTasksView(ListAPIView):
+class AssignedToUserTasksView(CompiledListMixin, ListAPIView):
     """List all tasks assigned to current user."""
 
     serializer_class = TaskSerializer
+    compiled_serializer_class = CompiledTaskSerializer
 
     def get_queryset(self):
-        return Task.objects.filter(assignee=self.request.user)
+        return task_queryset(requested_fields(self.request)).filter(
+            assignee=self.request.user
+        )
 
 
-class UserIsReviewingTasksView(ListAPIView):
+class UserIsReviewingTasksView(CompiledListMixin, ListAPIView):
     """List all tasks where current user is reviewer."""
 
     serializer_class = TaskSerializer
+    compiled_serializer_class = CompiledTaskSerializer
 
     def get_queryset(self):
-        return Task.objects.filter(reviewer=self.request.user)
+        return task_queryset(requested_fields(self.request)).filter(
+            reviewer=self.request.user
+        )
 
 
-class CommentsListCreateView(ListCreateAPIView):
+class CommentsListCreateView(CompiledListMixin, ListCreateAPIView):
     """Task comments - list + create.
 
     URL: /tasks/{task_id}/comments/
@@ -218,18 +624,58 @@ class CommentsListCreateView(ListCreateAPIView):
 
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
+    compiled_serializer_class = CompiledCommentSerializer
     permission_classes = [IsAuthenticated, IsBoardMemberForTaskComments]
+    pagination_class = CreatedAtCursorPagination
 
     def get_queryset(self):
         """Filter comments by task_id from URL kwargs."""
         task_id = self.kwargs["task_id"]
-        return Comment.objects.filter(task_id=task_id)
+        return Comment.objects.filter(task_id=task_id).select_related(
+            "author"
+        )
 
     def perform_create(self, serializer):
         """Set comment author + parent task id."""
-        task_id = self.kwargs["task_id"]
-        task = Task.objects.get(id=task_id)
-        serializer.save(author=self.request.user, task=task)
+        # IsBoardMemberForTaskComments checked existence and access
+        serializer.save(
+            author=self.request.user, task_id=self.kwargs["task_id"]
+        )
+
+
+class CommentTimelineView(APIView):
+    """Task comments as a newest-first timeline (pagination.Timeline).
+
+    URL: /tasks/{task_id}/comments/timeline/?before=|after=<cursor>
+    Every page is one keyset query with the author names joined in.
+    ``count`` is the task's maintained comments_count, not a COUNT(*).
+    """
+
+    def get(self, request, task_id):
+        task = get_object_or_404(
+            Task.objects.only("board_id", "comments_count"), pk=task_id
+        )
+        if not get_board_access(request).can_view(task.board_id):
+            raise PermissionDenied()
+        timeline = Timeline(request)
+        serializer = CompiledCommentSerializer(requested_fields(request))
+        # The sort key is read for the links even if not rendered
+        comments = serializer.values(
+            Comment.objects.filter(task_id=task_id), timeline.ordering
+        )
+        items, newer, older = timeline.page(
+            list(timeline.queryset(comments))
+        )
+        with phase("serialize"):
+            results = serializer.data(items)
+        return Response(
+            {
+                "count": task.comments_count,
+                "newer": newer,
+                "older": older,
+                "results": results,
+            }
+        )
 
 
 class CommentsDetailView(DestroyAPIView):
@@ -239,7 +685,9 @@ class CommentsDetailView(DestroyAPIView):
     URL: /tasks/{task_id}/comments/{comment_id}/
     """
 
-    queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     lookup_url_kwarg = "comment_id"
     permission_classes = [IsAuthenticated, IsCommentAuthor]
+    # The comment, with the task its delete signals need, in one query;
+    # authorship is the only check, as it always was
+    queryset = Comment.objects.select_related("task")
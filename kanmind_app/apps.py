@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class KanmindAppConfig(AppConfig):
     name = 'kanmind_app'
+
+    def ready(self):
+        from kanmind_app import instrumentation, signals  # noqa: F401
@@ -0,0 +1,253 @@
+"""Streaming board export and import in NDJSON.
+
+An archive is one JSON object per line, each with a ``type``: first
+the ``board``, then its ``member``s, ``task``s and ``comment``s. Users
+are referenced by email, so an archive can be imported into another
+KanMind instance that has the same users. Tasks keep their original
+ids in the archive only, for the comments to refer to.
+
+Both directions work in chunks of KANMIND_ARCHIVE_CHUNK_SIZE rows:
+the export reads with ``.iterator()``, the import inserts with
+``bulk_create``. Memory use therefore does not grow with the board,
+apart from a map of task ids (and of user emails) during the import.
+"""
+
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from kanmind_app.api.renderers import FastJSONRenderer, orjson
+from kanmind_app.counters import rebuild_board_stats, reconcile_comment_counts
+from kanmind_app.models import Board, Comment, Task, User
+
+FORMAT = 1
+
+TASK_FIELDS = [
+    "title",
+    "description",
+    "status",
+    "priority",
+    "due_date",
+]
+# Task user references, exported as emails
+TASK_USERS = ["assignee", "reviewer", "created_by"]
+
+loads = orjson.loads if orjson else json.loads
+
+
+def chunk_size():
+    return getattr(settings, "KANMIND_ARCHIVE_CHUNK_SIZE", 2000)
+
+
+def export_records(board):
+    """The records of ``board``'s archive, read in chunks."""
+    yield {
+        "type": "board",
+        "format": FORMAT,
+        "id": board.pk,
+        "title": board.title,
+        "owner": board.owner.email,
+        "created_at": board.created_at,
+    }
+    size = chunk_size()
+    for email, fullname in (
+        board.members.order_by("pk")
+        .values_list("email", "fullname")
+        .iterator(chunk_size=size)
+    ):
+        yield {"type": "member", "email": email, "fullname": fullname}
+    columns = ["pk", *TASK_FIELDS, *(f"{u}__email" for u in TASK_USERS)]
+    for row in (
+        board.tasks.order_by("pk")
+        .values_list(*columns)
+        .iterator(chunk_size=size)
+    ):
+        record = {"type": "task", "id": row[0]}
+        record.update(zip(TASK_FIELDS, row[1:]))
+        record.update(zip(TASK_USERS, row[1 + len(TASK_FIELDS):]))
+        yield record
+    for pk, task_id, email, content, created_at in (
+        Comment.objects.filter(task__board=board)
+        .order_by("pk")
+        .values_list("pk", "task_id", "author__email", "content", "created_at")
+        .iterator(chunk_size=size)
+    ):
+        yield {
+            "type": "comment",
+            "id": pk,
+            "task": task_id,
+            "author": email,
+            "content": content,
+            "created_at": created_at,
+        }
+
+
+def export_board(board):
+    """``board``'s archive as NDJSON, one chunk of lines per item."""
+    render = FastJSONRenderer().render
+    records = export_records(board)
+    while chunk := list(islice(records, chunk_size())):
+        yield b"".join(render(record) + b"\n" for record in chunk)
+
+
+class Importer:
+    """Builds a board for ``owner`` from archive lines.
+
+    Records are buffered until a chunk is full or the record type
+    changes, then validated and inserted together. Any error aborts the
+    whole import (``import_board`` runs it in one transaction) and
+    names the offending line.
+    """
+
+    def __init__(self, owner, title=None):
+        self.owner = owner
+        self.title = title
+        self.board = None
+        self.user_ids = {owner.email: owner.pk}
+        self.task_ids = {}
+        self.kind = None
+        self.pending = []
+        self.counts = {"members": 0, "tasks": 0, "comments": 0}
+        self.skipped_comments = 0
+        self.line = 0
+
+    def fail(self, message):
+        raise ValidationError({"line": self.line, "detail": message})
+
+    def feed(self, line):
+        self.line += 1
+        if not line.strip():
+            return
+        try:
+            record = loads(line)
+            kind = record.pop("type")
+        except (ValueError, TypeError, AttributeError, KeyError):
+            self.fail("Not a JSON object with a type.")
+        if self.board is None:
+            if kind != "board":
+                self.fail("The archive has to start with the board.")
+            return self.create_board(record)
+        if kind not in ("member", "task", "comment"):
+            self.fail(f"Unknown record type {kind!r}.")
+        if kind != self.kind or len(self.pending) >= chunk_size():
+            self.flush()
+            self.kind = kind
+        self.pending.append((self.line, record))
+
+    def flush(self):
+        pending, self.pending = self.pending, []
+        if pending:
+            getattr(self, f"insert_{self.kind}s")(pending)
+
+    def create_board(self, record):
+        if record.get("format") != FORMAT:
+            self.fail(f"Unsupported archive format {record.get('format')}.")
+        title = self.title or record.get("title")
+        board = Board(owner=self.owner, title=title)
+        self.clean(board, exclude=["owner"])
+        try:
+            with transaction.atomic():
+                board.save()
+        except IntegrityError:
+            self.fail(f"You already have a board titled {board.title!r}.")
+        self.board = board
+
+    def clean(self, instance, exclude):
+        try:
+            instance.clean_fields(exclude=exclude)
+        except DjangoValidationError as exc:
+            self.fail(exc.message_dict)
+
+    def resolve_users(self, emails):
+        """Load ids of ``emails`` not seen yet; unknown ones fail."""
+        missing = {e for e in emails if e is not None} - set(self.user_ids)
+        if not missing:
+            return
+        self.user_ids.update(
+            User.objects.filter(email__in=missing).values_list("email", "pk")
+        )
+        unknown = missing - set(self.user_ids)
+        if unknown:
+            self.fail(f"Unknown users: {', '.join(sorted(unknown))}.")
+
+    def user_id(self, email):
+        return None if email is None else self.user_ids[email]
+
+    def insert_members(self, pending):
+        emails = [record.get("email") for _, record in pending]
+        self.resolve_users(emails)
+        # Through add(), so access caches and counters follow
+        self.board.members.add(*map(self.user_id, filter(None, emails)))
+        self.counts["members"] += len(pending)
+
+    def insert_tasks(self, pending):
+        self.resolve_users(
+            record.get(name) for _, record in pending for name in TASK_USERS
+        )
+        old_ids, tasks = [], []
+        # self.line follows the records, for fail()
+        for self.line, record in pending:
+            task = Task(
+                board=self.board,
+                **{name: record.get(name) for name in TASK_FIELDS},
+                **{
+                    f"{name}_id": self.user_id(record.get(name))
+                    for name in TASK_USERS
+                },
+            )
+            task.created_by_id = task.created_by_id or self.owner.pk
+            self.clean(task, exclude=["board", *TASK_USERS])
+            old_ids.append(record.get("id"))
+            tasks.append(task)
+        Task.objects.bulk_create(tasks)
+        self.task_ids.update(zip(old_ids, (task.pk for task in tasks)))
+        self.counts["tasks"] += len(tasks)
+
+    def insert_comments(self, pending):
+        self.resolve_users(record.get("author") for _, record in pending)
+        comments = []
+        for self.line, record in pending:
+            task_id = self.task_ids.get(record.get("task"))
+            if task_id is None:
+                # Its task was created after the export read the tasks
+                self.skipped_comments += 1
+                continue
+            comment = Comment(
+                task_id=task_id,
+                author_id=self.user_id(record.get("author")),
+                content=record.get("content"),
+                created_at=record.get("created_at") or timezone.now(),
+            )
+            self.clean(comment, exclude=["task", "author"])
+            comments.append(comment)
+        Comment.objects.bulk_create(comments)
+        self.counts["comments"] += len(comments)
+
+    def finish(self):
+        if self.board is None:
+            self.fail("The archive is empty.")
+        self.flush()
+        # The bulk inserts sent no signals
+        rebuild_board_stats(Board.objects.filter(pk=self.board.pk))
+        reconcile_comment_counts(self.board.tasks.all())
+        return self.board
+
+
+def import_board(lines, owner, title=None):
+    """Create a board for ``owner`` from archive ``lines`` (bytes).
+
+    ``title`` replaces the archived one. Returns the Importer, with the
+    new ``board`` and the row counts. Raises ValidationError, with
+    nothing written, on a bad archive.
+    """
+    importer = Importer(owner, title)
+    with transaction.atomic():
+        for line in lines:
+            importer.feed(line)
+        importer.finish()
+    return importer
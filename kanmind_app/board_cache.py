@@ -0,0 +1,102 @@
+"""Cache of rendered GET /boards/{id}/ bodies.
+
+Entries are keyed by board id and valid for one board version
+(``Board.updated_at``, see kanmind_app.versioning), so a write makes
+them unreachable at once. The signal handlers in ``kanmind_app.signals``
+also evict them, to give the memory back. Only the body is cached: the
+view still runs its permission checks for every request.
+
+The in-process tier is an LRU bounded by entry count and total bytes.
+If KANMIND_BOARD_CACHE_ALIAS names a cache, bodies are shared through
+it as well, under a key that carries the version.
+"""
+
+from django.conf import settings
+from django.core.cache import caches
+
+from kanmind_app.cache import LRUCache
+from kanmind_app.metrics import registry
+
+SHARED_KEY = "kanmind:board-body:{}:{}"
+
+# board id -> (version, body), per worker process
+local_bodies = LRUCache(
+    max_entries=getattr(settings, "KANMIND_BOARD_CACHE_ENTRIES", 1000),
+    max_bytes=getattr(settings, "KANMIND_BOARD_CACHE_BYTES", 64 << 20),
+    sizeof=lambda entry: len(entry[1]),
+)
+
+
+def shared_body_cache():
+    """The optional cross-process tier, or None if not configured."""
+    alias = getattr(settings, "KANMIND_BOARD_CACHE_ALIAS", None)
+    return caches[alias] if alias else None
+
+
+def local_body(board):
+    """This process's body of ``board`` at its version, or None."""
+    entry = local_bodies.get(board.pk)
+    if entry is not None and entry[0] == board.updated_at.isoformat():
+        registry.inc("kanmind_board_cache_total", tier="local", result="hit")
+        return entry[1]
+    registry.inc("kanmind_board_cache_total", tier="local", result="miss")
+    return None
+
+
+def count_shared_lookup(body):
+    result = "miss" if body is None else "hit"
+    registry.inc("kanmind_board_cache_total", tier="shared", result=result)
+
+
+def cached_board_body(board, render):
+    """The body of ``board`` at its current version.
+
+    ``render()`` builds it on a miss. Lookups are counted in the
+    ``kanmind_board_cache_total`` metric, by tier and result.
+    """
+    body = local_body(board)
+    if body is not None:
+        return body
+    shared = shared_body_cache()
+    key = SHARED_KEY.format(board.pk, board.updated_at.isoformat())
+    if shared is not None:
+        body = shared.get(key)
+        count_shared_lookup(body)
+    if body is None:
+        body = render()
+        if shared is not None:
+            shared.set(
+                key, body, getattr(settings, "KANMIND_BOARD_CACHE_TTL", 300)
+            )
+    local_bodies.set(board.pk, (board.updated_at.isoformat(), body))
+    return body
+
+
+async def acached_board_body(board, render):
+    """cached_board_body() with an async ``render`` and cache calls."""
+    body = local_body(board)
+    if body is not None:
+        return body
+    shared = shared_body_cache()
+    key = SHARED_KEY.format(board.pk, board.updated_at.isoformat())
+    if shared is not None:
+        body = await shared.aget(key)
+        count_shared_lookup(body)
+    if body is None:
+        body = await render()
+        if shared is not None:
+            await shared.aset(
+                key, body, getattr(settings, "KANMIND_BOARD_CACHE_TTL", 300)
+            )
+    local_bodies.set(board.pk, (board.updated_at.isoformat(), body))
+    return body
+
+
+def evict_boards(board_ids):
+    """Drop the cached bodies of ``board_ids`` from this process.
+
+    Shared entries are left to expire: their key names a version that
+    is no longer current.
+    """
+    for board_id in set(board_ids):
+        local_bodies.delete(board_id)
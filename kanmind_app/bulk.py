@@ -0,0 +1,90 @@
+"""Bulk task writes.
+
+``bulk_create`` and ``bulk_update`` send no model signals, and deletes
+run with the per-row handlers in kanmind_app.signals muted. These
+functions therefore do the handlers' work themselves, once per call:
+one version bump for all affected boards, one counter update per
+board (see kanmind_app.counters) and the usual task events.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+from django.utils import timezone
+
+from kanmind_app.counters import (
+    record_task_changes,
+    stored_task_states,
+    task_state,
+)
+from kanmind_app.events import publish_on_commit, task_event_data
+from kanmind_app.models import Task
+from kanmind_app.sync import record_deletions
+from kanmind_app.versioning import touch_boards
+
+_bulk_write = ContextVar("kanmind_bulk_write", default=False)
+
+
+def in_bulk_write():
+    """True while a bulk write handles board versions and events."""
+    return _bulk_write.get()
+
+
+@contextmanager
+def bulk_write():
+    token = _bulk_write.set(True)
+    try:
+        yield
+    finally:
+        _bulk_write.reset(token)
+
+
+def publish_tasks(type, tasks):
+    for task in tasks:
+        publish_on_commit(task.board_id, type, task_event_data(task))
+
+
+@transaction.atomic
+def create_tasks(tasks):
+    """Insert unsaved ``tasks`` in one INSERT; returns them with ids."""
+    tasks = Task.objects.bulk_create(tasks)
+    record_task_changes((None, task_state(task)) for task in tasks)
+    touch_boards(task.board_id for task in tasks)
+    publish_tasks("task.created", tasks)
+    return tasks
+
+
+@transaction.atomic
+def update_tasks(tasks, fields):
+    """Write ``fields`` of the modified ``tasks`` with one UPDATE."""
+    if fields:
+        stored = stored_task_states([task.pk for task in tasks])
+        # Tasks deleted in the meantime are left out
+        tasks = [task for task in tasks if task.pk in stored]
+        now = timezone.now()
+        for task in tasks:
+            task.updated_at = now
+        Task.objects.bulk_update(tasks, [*fields, "updated_at"])
+        record_task_changes(
+            (stored[task.pk], task_state(task, fields, stored[task.pk]))
+            for task in tasks
+        )
+        touch_boards(task.board_id for task in tasks)
+        publish_tasks("task.updated", tasks)
+    return tasks
+
+
+@transaction.atomic
+def delete_tasks(tasks):
+    """Delete ``tasks`` (and their comments) in one pass."""
+    stored = stored_task_states([task.pk for task in tasks])
+    with bulk_write():
+        Task.objects.filter(pk__in=list(stored)).delete()
+    record_task_changes((state, None) for state in stored.values())
+    record_deletions(
+        "task", {pk: board_id for pk, (board_id, *_) in stored.items()}
+    )
+    touch_boards(task.board_id for task in tasks)
+    for task in tasks:
+        publish_on_commit(task.board_id, "task.deleted", {"id": task.pk})
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe, bounded in-process cache with a per-entry TTL.
+
+    The least recently used entry is evicted once ``max_entries`` is
+    exceeded or, if ``max_bytes`` is set, once the entries' sizes (as
+    given by ``sizeof``) add up to more than that. Entries older than
+    ``ttl`` seconds are treated as missing; ``ttl=None`` keeps them
+    until evicted.
+    """
+
+    def __init__(self, max_entries, ttl=None, max_bytes=None, sizeof=len):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.size = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def _pop(self, key):
+        _, _, size = self._data.pop(key)
+        self.size -= size
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                expires, value, _ = self._data[key]
+            except KeyError:
+                return default
+            if expires is not None and expires < time.monotonic():
+                self._pop(key)
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (expires, value, size)
+            self.size += size
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.size > self.max_bytes
+            ):
+                self._pop(next(iter(self._data)))
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def delete_where(self, predicate):
+        """Delete every entry where ``predicate(key, value)`` holds."""
+        with self._lock:
+            stale = [
+                key
+                for key, (_, value, _) in self._data.items()
+                if predicate(key, value)
+            ]
+            for key in stale:
+                self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.size = 0
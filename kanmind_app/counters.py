@@ -0,0 +1,193 @@
+"""Maintenance of the denormalized counters.
+
+Board counters live in BoardStats, the comment count of a task on
+``Task.comments_count``. Writes adjust them with F() increments, so
+concurrent writers never lose an update. Member counts are recounted
+with a subquery instead, as m2m signals do not say how many rows
+changed. Both run inside the writing transaction (see ``Task.save``),
+so a rolled back write leaves the counters alone.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from kanmind_app.api.querysets import count_subquery
+from kanmind_app.models import Board, BoardStats, Comment, Task
+
+STATUS_COUNTERS = {
+    "to-do": "to_do_count",
+    "in-progress": "in_progress_count",
+    "review": "review_count",
+    "done": "done_count",
+}
+PRIORITY_COUNTERS = {
+    "low": "low_priority_count",
+    "medium": "medium_priority_count",
+    "high": "high_priority_count",
+}
+COUNTER_FIELDS = [
+    "member_count",
+    "task_count",
+    *STATUS_COUNTERS.values(),
+    *PRIORITY_COUNTERS.values(),
+]
+# The task fields the counters depend on: a task's "state"
+COUNTED_FIELDS = ("board_id", "status", "priority")
+
+
+def task_state(task, update_fields=None, stored=None):
+    """State of ``task`` once saved.
+
+    With ``update_fields``, fields not written keep their ``stored``
+    values.
+    """
+    state = []
+    for i, name in enumerate(COUNTED_FIELDS):
+        if update_fields is None or {name, name.removesuffix("_id")} & set(
+            update_fields
+        ):
+            state.append(getattr(task, name))
+        else:
+            state.append(stored[i])
+    return tuple(state)
+
+
+def stored_task_states(task_ids):
+    """``{task_id: state}`` as stored, locking the rows until commit.
+
+    Reading the old state under the lock keeps concurrent updates of
+    the same task from both decrementing the same counter.
+    """
+    rows = (
+        Task.objects.select_for_update()
+        .filter(pk__in=task_ids)
+        .values_list("pk", *COUNTED_FIELDS)
+    )
+    return {pk: tuple(state) for pk, *state in rows}
+
+
+def counters_of(status, priority):
+    """Counter fields a task with this status and priority adds to."""
+    fields = ["task_count", STATUS_COUNTERS.get(status)]
+    fields.append(PRIORITY_COUNTERS.get(priority))
+    return [field for field in fields if field]
+
+
+def record_task_changes(changes):
+    """Apply ``(old_state, new_state)`` pairs to the board counters.
+
+    A state is ``(board_id, status, priority)``; ``old_state`` is None
+    for new tasks and ``new_state`` None for deleted ones. Issues one
+    UPDATE per affected board.
+    """
+    deltas = defaultdict(Counter)
+    for old, new in changes:
+        if old is not None:
+            deltas[old[0]].subtract(counters_of(*old[1:]))
+        if new is not None:
+            deltas[new[0]].update(counters_of(*new[1:]))
+    for board_id, delta in deltas.items():
+        updates = {
+            field: F(field) + count for field, count in delta.items() if count
+        }
+        if updates:
+            BoardStats.objects.filter(board_id=board_id).update(**updates)
+
+
+def recount_members(board_ids):
+    board_ids = set(board_ids)
+    if board_ids:
+        BoardStats.objects.filter(board_id__in=board_ids).update(
+            member_count=count_subquery(Board.members.through, "board_id")
+        )
+
+
+def count_board_stats(boards):
+    """Count every counter of ``boards`` from the source tables.
+
+    Returns ``{board_id: {field: count}}``.
+    """
+    stats = {
+        pk: dict.fromkeys(COUNTER_FIELDS, 0)
+        for pk in boards.values_list("pk", flat=True)
+    }
+    tasks = (
+        Task.objects.filter(board__in=boards)
+        .values_list("board_id", "status", "priority")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    for board_id, status, priority, count in tasks:
+        for field in counters_of(status, priority):
+            stats[board_id][field] += count
+    members = (
+        Board.members.through.objects.filter(board__in=boards)
+        .values_list("board_id")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    for board_id, count in members:
+        stats[board_id]["member_count"] = count
+    return stats
+
+
+def rebuild_board_stats(boards=None, fix=True):
+    """Compare stored counters with fresh counts, fixing them if asked.
+
+    Returns the ids of the boards whose counters were wrong (or
+    missing).
+    """
+    boards = Board.objects.all() if boards is None else boards
+    stored = BoardStats.objects.filter(board__in=boards)
+    with transaction.atomic(savepoint=False):
+        if fix:
+            # Locked before counting: a concurrent write waits to apply
+            # its increment on top of the stored recount, instead of
+            # being counted and then overwritten
+            stored = stored.select_for_update()
+        stored = {stats.board_id: stats for stats in stored}
+        actual = count_board_stats(boards)
+        stale, missing = [], []
+        for board_id, counts in actual.items():
+            stats = stored.get(board_id)
+            if stats is None:
+                missing.append(BoardStats(board_id=board_id, **counts))
+            elif any(getattr(stats, f) != n for f, n in counts.items()):
+                for field, count in counts.items():
+                    setattr(stats, field, count)
+                stale.append(stats)
+        if fix:
+            BoardStats.objects.bulk_create(missing, ignore_conflicts=True)
+            BoardStats.objects.bulk_update(
+                stale, COUNTER_FIELDS, batch_size=500
+            )
+    return sorted(stats.board_id for stats in missing + stale)
+
+
+def record_comment_change(task_id, delta):
+    # The count is part of the task as rendered, so it changes the task
+    Task.objects.filter(pk=task_id).update(
+        comments_count=F("comments_count") + delta, updated_at=timezone.now()
+    )
+
+
+def reconcile_comment_counts(tasks=None, fix=True):
+    """Compare ``Task.comments_count`` with a COUNT of the comments.
+
+    Returns the ids of tasks whose count was wrong; with ``fix`` they
+    are recounted in one UPDATE.
+    """
+    tasks = Task.objects.all() if tasks is None else tasks
+    actual = count_subquery(Comment, "task_id")
+    wrong = list(
+        tasks.annotate(actual=actual)
+        .exclude(comments_count=F("actual"))
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    if fix and wrong:
+        Task.objects.filter(pk__in=wrong).update(comments_count=actual)
+    return wrong
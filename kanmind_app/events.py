@@ -0,0 +1,204 @@
+"""Board change events for push clients.
+
+Writes publish small deltas (task, comment and membership changes) per
+board. ``InProcessBroker`` fans them out to the streams open in this
+process only: a stream never sees writes served by another worker
+process. Run a single ASGI worker for streams, or plug in another
+broker (e.g. backed by Redis pub/sub) through ``KANMIND_EVENT_BROKER``.
+It needs the same ``publish`` / ``subscribe`` / ``unsubscribe``
+interface.
+
+Every event has an increasing id. Each board keeps a short replay
+buffer, so a reconnecting client can resume from ``Last-Event-ID``. A
+client that falls too far behind (its queue is full) or asks for an
+id that is no longer buffered gets a ``resync`` event and should
+reload the board.
+"""
+
+import asyncio
+import json
+import threading
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+@dataclass(frozen=True)
+class BoardEvent:
+    id: int
+    board_id: int
+    type: str
+    data: dict = field(default_factory=dict)
+
+    def encode(self):
+        """Render as a server-sent event frame."""
+        payload = json.dumps(self.data, cls=DjangoJSONEncoder)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n"
+
+
+class Subscription:
+    """One stream's queue of pending events.
+
+    ``publish`` may run on any thread, so events are handed to the
+    subscriber's event loop with call_soon_threadsafe.
+    """
+
+    def __init__(self, board_id, queue_size):
+        self.board_id = board_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def push(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:  # loop already closed
+            pass
+
+    def _put(self, event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Too slow a reader: drop its backlog and make it resync
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def get(self, timeout):
+        """Next event, None on overflow, TimeoutError if idle."""
+        return await asyncio.wait_for(self.queue.get(), timeout)
+
+
+class InProcessBroker:
+    def __init__(self, buffer_size=None, queue_size=None, max_boards=1024):
+        self.buffer_size = buffer_size or getattr(
+            settings, "KANMIND_EVENT_BUFFER", 256
+        )
+        self.queue_size = queue_size or getattr(
+            settings, "KANMIND_EVENT_QUEUE", 100
+        )
+        self.max_boards = max_boards
+        self._last_id = 0
+        self._lock = threading.Lock()
+        # board id -> recent events, least recently active board first
+        self._buffers = OrderedDict()
+        self._subscribers = defaultdict(set)
+
+    def publish(self, board_id, type, data):
+        with self._lock:
+            self._last_id += 1
+            event = BoardEvent(self._last_id, board_id, type, data)
+            if type == "board.deleted":
+                self._buffers.pop(board_id, None)
+            else:
+                self._buffer(board_id).append(event)
+            # Pushing under the lock keeps per-stream order intact
+            for subscription in self._subscribers.get(board_id, ()):
+                subscription.push(event)
+        return event
+
+    def _buffer(self, board_id):
+        buffer = self._buffers.get(board_id)
+        if buffer is None:
+            buffer = self._buffers[board_id] = deque(maxlen=self.buffer_size)
+            if len(self._buffers) > self.max_boards:
+                self._buffers.popitem(last=False)
+        self._buffers.move_to_end(board_id)
+        return buffer
+
+    def subscribe(self, board_id, last_event_id=None):
+        """Open a subscription, replaying events after an event id.
+
+        Events after ``last_event_id`` are replayed, if given. Must be
+        called from the subscriber's event loop.
+        """
+        subscription = Subscription(board_id, self.queue_size)
+        with self._lock:
+            self._subscribers[board_id].add(subscription)
+            if last_event_id is None:
+                return subscription
+
+            backlog = self._buffers.get(board_id)
+            if backlog is None:
+                # Never written here or evicted past max_boards: only a
+                # client already at the latest id has missed nothing
+                lost = last_event_id != self._last_id
+            else:
+                lost = (
+                    last_event_id > self._last_id
+                    or backlog[0].id > last_event_id + 1
+                )
+            if lost:
+                # Ids from before a restart, or no longer buffered
+                subscription.push(None)
+            else:
+                for event in backlog:
+                    if event.id > last_event_id:
+                        subscription.push(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.board_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.board_id]
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                path = getattr(
+                    settings,
+                    "KANMIND_EVENT_BROKER",
+                    "kanmind_app.events.InProcessBroker",
+                )
+                _broker = import_string(path)()
+    return _broker
+
+
+def publish_on_commit(board_id, type, data):
+    """Publish once the surrounding transaction commits."""
+    transaction.on_commit(
+        lambda: get_broker().publish(board_id, type, data)
+    )
+
+
+def task_event_data(task):
+    """Flat task delta; users are referenced by id."""
+    return {
+        "id": task.pk,
+        "board": task.board_id,
+        "title": task.title,
+        "description": task.description,
+        "status": task.status,
+        "priority": task.priority,
+        "assignee_id": task.assignee_id,
+        "reviewer_id": task.reviewer_id,
+        "due_date": task.due_date,
+        "created_by_id": task.created_by_id,
+    }
+
+
+def comment_event_data(comment):
+    return {
+        "id": comment.pk,
+        "task": comment.task_id,
+        "content": comment.content,
+        "created_at": comment.created_at,
+        "author_id": comment.author_id,
+    }
@@ -0,0 +1,145 @@
+"""Password hashing with bounded concurrency.
+
+PBKDF2 is deliberately slow. Under a login burst every worker thread
+ends up hashing at once, each hash slowing the others down. With
+``KANMIND_AUTH_HASH_WORKERS`` set, hashing and verification run in a
+bounded thread pool, so only that many hashes run at once per
+process. Callers that find the pool and its queue full get
+HashingUnavailable (a 503 from the auth views) instead of piling up.
+
+The calling thread still waits for its own hash: the pool caps CPU
+use and sheds load, it does not free request threads for other work.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    make_password,
+    verify_password,
+)
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from kanmind_app.metrics import registry
+
+
+class KanMindPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with a configurable iteration count.
+
+    It keeps the ``pbkdf2_sha256`` algorithm name, so existing hashes
+    still verify. Hashes with a different iteration count report
+    ``must_update`` and are re-hashed on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return (
+            getattr(settings, "KANMIND_PBKDF2_ITERATIONS", None)
+            or PBKDF2PasswordHasher.iterations
+        )
+
+
+class HashingUnavailable(Exception):
+    """The hashing pool and its queue stayed full; retry later."""
+
+
+class HashingPool:
+    """Bounded executor for password hashing.
+
+    At most ``workers`` hashes run at once and ``queue_size`` more may
+    wait. Callers that do not get a slot within ``timeout`` seconds
+    raise HashingUnavailable. With ``workers=0`` hashing runs inline.
+    """
+
+    def __init__(self, workers, queue_size=16, timeout=5.0):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._executor = (
+            ThreadPoolExecutor(workers, thread_name_prefix="kanmind-hash")
+            if workers
+            else None
+        )
+
+    def run(self, fn, *args):
+        if self._executor is None:
+            with registry.timer("kanmind_auth_hash_seconds"):
+                return fn(*args)
+
+        if not self._slots.acquire(timeout=self.timeout):
+            registry.inc("kanmind_auth_hash_rejected_total")
+            raise HashingUnavailable()
+        try:
+            future = self._executor.submit(
+                self._timed, time.perf_counter(), fn, *args
+            )
+            return future.result()
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _timed(queued_at, fn, *args):
+        start = time.perf_counter()
+        registry.observe("kanmind_auth_hash_wait_seconds", start - queued_at)
+        try:
+            return fn(*args)
+        finally:
+            registry.observe(
+                "kanmind_auth_hash_seconds", time.perf_counter() - start
+            )
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """The process-wide pool, created lazily (after a gunicorn fork)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = HashingPool(
+                    workers=getattr(settings, "KANMIND_AUTH_HASH_WORKERS", 0),
+                    queue_size=getattr(
+                        settings, "KANMIND_AUTH_HASH_QUEUE", 16
+                    ),
+                    timeout=getattr(settings, "KANMIND_AUTH_HASH_TIMEOUT", 5),
+                )
+    return _pool
+
+
+@receiver(setting_changed)
+def reset_hashing_pool(setting, **kwargs):
+    global _pool
+    if setting.startswith("KANMIND_AUTH_HASH_") and _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def hash_password(raw_password):
+    """make_password() run through the hashing pool."""
+    return get_hashing_pool().run(make_password, raw_password)
+
+
+def check_user_password(user, raw_password):
+    """User.check_password() with hashing in the pool.
+
+    Outdated hashes (other hasher or iteration count) are replaced by
+    a hash from the preferred hasher once the password is verified.
+    """
+    is_correct, must_update = get_hashing_pool().run(
+        verify_password, raw_password, user.password
+    )
+    if is_correct and must_update:
+        user.password = hash_password(raw_password)
+        user.save(update_fields=["password"])
+    return is_correct
@@ -0,0 +1,205 @@
+"""Per-request instrumentation.
+
+RequestMetricsMiddleware measures every request: wall time, the number
+and total time of its database queries (on any alias and in any
+thread the request uses), the time spent in the ``serialize`` and
+``render`` phases marked with ``phase()``, and the response size. The
+numbers are
+
+- sent back in a Server-Timing header,
+- logged as one JSON line per request to the ``kanmind.requests``
+  logger,
+- kept in the metrics registry, labelled by method and URL pattern (not
+  the raw path, to bound their number), for /metrics.
+
+A query shape (SQL with parameters, IN lists collapsed) run at least
+KANMIND_N_PLUS_ONE_THRESHOLD times in one request is reported as a
+likely N+1: logged as a warning and counted.
+"""
+
+import json
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+from kanmind_app.metrics import registry
+
+logger = logging.getLogger("kanmind.requests")
+
+_stats = ContextVar("kanmind_request_stats", default=None)
+
+IN_LIST = re.compile(r"%s(?:, %s)+")
+
+
+class RequestStats:
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.shapes = Counter()
+        self.phases = defaultdict(float)
+
+
+@contextmanager
+def phase(name):
+    """Add the time spent in the block to request phase ``name``."""
+    stats = _stats.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if stats is not None:
+            stats.phases[name] += time.perf_counter() - start
+
+
+def record_query(execute, sql, params, many, context):
+    stats = _stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_time += time.perf_counter() - start
+        stats.queries += 1
+        stats.shapes[IN_LIST.sub("%s, ...", sql)] += 1
+
+
+def instrument(connection, **kwargs):
+    """Time the queries of ``connection``; run for every new one."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+connection_created.connect(instrument)
+
+
+def route_of(request):
+    match = getattr(request, "resolver_match", None)
+    return match.route if match is not None else "unmatched"
+
+
+def repeated_shapes(stats):
+    threshold = getattr(settings, "KANMIND_N_PLUS_ONE_THRESHOLD", 5)
+    return [
+        (sql, count)
+        for sql, count in stats.shapes.most_common()
+        if count >= threshold
+    ]
+
+
+def server_timing(stats, elapsed):
+    entries = [
+        f"app;dur={elapsed * 1000:.1f}",
+        f'db;dur={stats.db_time * 1000:.1f};desc="{stats.queries} queries"',
+    ]
+    entries += [
+        f"{name};dur={seconds * 1000:.1f}"
+        for name, seconds in stats.phases.items()
+    ]
+    return ", ".join(entries)
+
+
+def finish(request, response, stats):
+    """Publish the numbers of a finished request."""
+    elapsed = time.perf_counter() - stats.start
+    route = route_of(request)
+    labels = {"view": route, "method": request.method}
+    size = None if response.streaming else len(response.content)
+
+    timing = server_timing(stats, elapsed)
+    if response.has_header("Server-Timing"):
+        timing = f"{response['Server-Timing']}, {timing}"
+    response["Server-Timing"] = timing
+
+    registry.observe(
+        "kanmind_request_seconds",
+        elapsed,
+        status=f"{response.status_code // 100}xx",
+        **labels,
+    )
+    registry.observe("kanmind_request_db_seconds", stats.db_time, **labels)
+    registry.observe("kanmind_request_queries", stats.queries, **labels)
+    for name, seconds in stats.phases.items():
+        registry.observe(f"kanmind_request_{name}_seconds", seconds, **labels)
+    if size is not None:
+        registry.observe("kanmind_response_bytes", size, **labels)
+
+    repeated = repeated_shapes(stats)
+    if repeated:
+        registry.inc("kanmind_n_plus_one_total", **labels)
+        logger.warning(
+            json.dumps(
+                {
+                    "event": "n_plus_one",
+                    **labels,
+                    "path": request.path,
+                    "queries": [
+                        {"sql": sql[:300], "count": count}
+                        for sql, count in repeated[:5]
+                    ],
+                }
+            )
+        )
+    logger.info(
+        json.dumps(
+            {
+                "event": "request",
+                **labels,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round(elapsed * 1000, 1),
+                "db_ms": round(stats.db_time * 1000, 1),
+                "queries": stats.queries,
+                **{
+                    f"{name}_ms": round(seconds * 1000, 1)
+                    for name, seconds in stats.phases.items()
+                },
+                "bytes": size,
+            }
+        )
+    )
+
+
+class RequestMetricsMiddleware:
+    """Instrument every request, see the module docstring.
+
+    Goes first in MIDDLEWARE, so the other middleware is measured too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = RequestStats()
+        token = _stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _stats.reset(token)
+        finish(request, response, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token = _stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _stats.reset(token)
+        finish(request, response, stats)
+        return response
@@ -0,0 +1,196 @@
+import re
+from contextlib import ExitStack
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from kanmind_app.api.streams import board_events
+from kanmind_app.api.urls import urlpatterns
+from kanmind_app.models import Board, Task
+
+User = get_user_model()
+
+URL_KWARG = re.compile(r"<int:(\w+)>")
+
+# SQLite reports full scans as "SCAN <table>", index scans add USING
+SQLITE_SEQ_SCAN = re.compile(r"^SCAN (?!CONSTANT)(?!.*\bUSING\b)")
+
+
+class Command(BaseCommand):
+    help = (
+        "Run every GET endpoint of the API as the given user, EXPLAIN "
+        "each query it issues (on any database alias) and flag "
+        "sequential scans. The async views need an API token of the "
+        "user; the event stream never finishes and is skipped. On "
+        "small databases PostgreSQL prefers seq scans anyway; use "
+        "--disable-seqscan to check whether an index would be used."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--email",
+            help="User to run requests as (default: owner of a board).",
+        )
+        parser.add_argument(
+            "--disable-seqscan",
+            action="store_true",
+            help="SET enable_seqscan = off first (PostgreSQL only).",
+        )
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit with an error if any sequential scan is found.",
+        )
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["email"])
+        samples = self.get_samples(user)
+        token = (
+            Token.objects.filter(user=user)
+            .values_list("key", flat=True)
+            .first()
+        )
+        if options["disable_seqscan"]:
+            for connection in connections.all():
+                if self.is_postgres(connection):
+                    with connection.cursor() as cursor:
+                        cursor.execute("SET enable_seqscan = off")
+
+        flagged = 0
+        for pattern in urlpatterns:
+            route = pattern.pattern._route
+            if pattern.callback is board_events:
+                self.stdout.write(f"SKIP /api/{route} (event stream)")
+                continue
+            is_async = iscoroutinefunction(pattern.callback)
+            if is_async and token is None:
+                self.stdout.write(f"SKIP /api/{route} (user has no token)")
+                continue
+            kwargs = {
+                name: samples[name] for name in URL_KWARG.findall(route)
+            }
+            if None in kwargs.values():
+                self.stdout.write(f"SKIP /api/{route} (no sample data)")
+                continue
+            path = "/api/" + URL_KWARG.sub(
+                lambda m: str(kwargs[m.group(1)]), route
+            )
+            flagged += self.explain_endpoint(
+                pattern.callback,
+                path,
+                kwargs,
+                user,
+                token if is_async else None,
+            )
+
+        if flagged and options["fail_on_seq_scan"]:
+            raise CommandError(f"{flagged} sequential scan(s) found.")
+        self.stdout.write(f"Done, {flagged} sequential scan(s) flagged.")
+
+    @property
+    def host(self):
+        """A host name that passes ALLOWED_HOSTS validation."""
+        for host in settings.ALLOWED_HOSTS:
+            if host and "*" not in host and not host.startswith("."):
+                return host
+        return "localhost"
+
+    @staticmethod
+    def is_postgres(connection):
+        return connection.vendor == "postgresql"
+
+    def get_user(self, email):
+        if email:
+            try:
+                return User.objects.get(email__iexact=email)
+            except User.DoesNotExist:
+                raise CommandError(f"No user with email {email}.")
+        board = Board.objects.order_by("id").first()
+        if board is None:
+            raise CommandError("No boards found, pass --email.")
+        return board.owner
+
+    def get_samples(self, user):
+        task = Task.objects.filter(board__owner=user).first()
+        comment = task.comments.first() if task else None
+        return {
+            "board_id": Board.objects.filter(owner=user)
+            .values_list("id", flat=True)
+            .first(),
+            "task_id": task.id if task else None,
+            "comment_id": comment.id if comment else None,
+        }
+
+    def explain_endpoint(self, view, path, kwargs, user, token=None):
+        """Request ``path`` and explain its queries.
+
+        Async views authenticate themselves, with ``token``. Streamed
+        bodies are consumed, so the queries made while streaming are
+        explained too.
+        """
+        factory = APIRequestFactory(SERVER_NAME=self.host)
+        if token is None:
+            request = factory.get(path, {"email": user.email})
+            force_authenticate(request, user=user)
+        else:
+            request = factory.get(
+                path,
+                {"email": user.email},
+                HTTP_AUTHORIZATION=f"Token {token}",
+            )
+            view = async_to_sync(view)
+        with ExitStack() as stack:
+            captures = {
+                alias: stack.enter_context(
+                    CaptureQueriesContext(connections[alias])
+                )
+                for alias in connections
+            }
+            response = view(request, **kwargs)
+            if response.status_code == 405:
+                return 0
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+
+        queries = [
+            (alias, query["sql"])
+            for alias, ctx in captures.items()
+            for query in ctx.captured_queries
+        ]
+        self.stdout.write(
+            self.style.MIGRATE_HEADING(
+                f"GET {path} -> {response.status_code}, "
+                f"{len(queries)} queries"
+            )
+        )
+        flagged = 0
+        for alias, sql in queries:
+            if not sql.lstrip().upper().startswith("SELECT"):
+                continue
+            scans = self.seq_scans(connections[alias], sql)
+            flagged += len(scans)
+            style = self.style.WARNING if scans else self.style.SUCCESS
+            status = "SEQ SCAN" if scans else "ok"
+            self.stdout.write(style(f"  {status} ({alias})"))
+            self.stdout.write(f"    {sql}")
+            for line in scans:
+                self.stdout.write(self.style.WARNING(f"    -> {line}"))
+        return flagged
+
+    def seq_scans(self, connection, sql):
+        """Return the plan lines describing sequential scans."""
+        with connection.cursor() as cursor:
+            if self.is_postgres(connection):
+                cursor.execute("EXPLAIN " + sql)
+                lines = [row[0].strip() for row in cursor.fetchall()]
+                return [line for line in lines if "Seq Scan" in line]
+            cursor.execute("EXPLAIN QUERY PLAN " + sql)
+            lines = [row[-1] for row in cursor.fetchall()]
+            return [line for line in lines if SQLITE_SEQ_SCAN.match(line)]
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from kanmind_app.sync import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the tombstones of deleted tasks and comments that are "
+        "older than KANMIND_SYNC_RETENTION_DAYS. Clients with an older "
+        "sync cursor are asked to reload the board instead."
+    )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} tombstone(s).")
+        )
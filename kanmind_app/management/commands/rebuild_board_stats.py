@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from kanmind_app.counters import rebuild_board_stats
+from kanmind_app.models import Board
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount the denormalized board counters (BoardStats) from the "
+        "task and member tables and fix the ones that drifted. With "
+        "--check nothing is written and drift is reported as an error."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only verify the counters.",
+        )
+        parser.add_argument(
+            "--board",
+            type=int,
+            action="append",
+            dest="board_ids",
+            help="Limit to this board id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        boards = Board.objects.all()
+        if options["board_ids"]:
+            boards = boards.filter(pk__in=options["board_ids"])
+
+        with transaction.atomic():
+            wrong = rebuild_board_stats(boards, fix=not options["check"])
+
+        if not wrong:
+            self.stdout.write(self.style.SUCCESS("All board counters match."))
+        elif options["check"]:
+            raise CommandError(
+                f"{len(wrong)} board(s) with wrong counters: "
+                + ", ".join(map(str, wrong))
+            )
+        else:
+            self.stdout.write(
+                self.style.WARNING(f"Fixed counters of {len(wrong)} board(s).")
+            )
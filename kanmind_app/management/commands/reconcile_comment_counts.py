@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from kanmind_app.counters import reconcile_comment_counts
+from kanmind_app.models import Task
+
+
+class Command(BaseCommand):
+    help = (
+        "Recount Task.comments_count from the comments table and fix "
+        "the tasks that drifted. With --check nothing is written and "
+        "drift is reported as an error."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only verify the counts.",
+        )
+        parser.add_argument(
+            "--board",
+            type=int,
+            action="append",
+            dest="board_ids",
+            help="Limit to the tasks of this board id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        tasks = Task.objects.all()
+        if options["board_ids"]:
+            tasks = tasks.filter(board_id__in=options["board_ids"])
+
+        wrong = reconcile_comment_counts(tasks, fix=not options["check"])
+
+        if not wrong:
+            self.stdout.write(self.style.SUCCESS("All comment counts match."))
+        elif options["check"]:
+            raise CommandError(
+                f"{len(wrong)} task(s) with wrong comment counts: "
+                + ", ".join(map(str, wrong))
+            )
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Fixed comment counts of {len(wrong)} task(s)."
+                )
+            )
@@ -0,0 +1,126 @@
+"""In-process metrics registry.
+
+Counters and latency summaries are kept per worker process, keyed by
+metric name and labels. Summaries keep count/sum/max plus a bounded
+reservoir of recent samples for quantiles. ``expose()`` renders them
+in the Prometheus text format.
+
+Nothing is shared between processes: /metrics is only complete with
+one worker process per scrape target (see the README).
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from itertools import groupby
+
+RESERVOIR_SIZE = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+
+
+def escape_label(value):
+    return (
+        str(value)
+        .replace("\\", r"\\")
+        .replace('"', r'\"')
+        .replace("\n", r"\n")
+    )
+
+
+def format_labels(labels, **extra):
+    labels = (*labels, *extra.items())
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{escape_label(v)}"' for name, v in labels)
+    return "{" + pairs + "}"
+
+
+class Summary:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=RESERVOIR_SIZE)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.recent.append(value)
+
+    def quantile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._summaries = defaultdict(Summary)
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, amount=1, **labels):
+        with self._lock:
+            self._counters[self._key(name, labels)] += amount
+
+    def observe(self, name, value, **labels):
+        with self._lock:
+            self._summaries[self._key(name, labels)].observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Observe the wall time of the block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter_value(self, name, **labels):
+        with self._lock:
+            return self._counters.get(self._key(name, labels), 0)
+
+    def summary(self, name, **labels):
+        with self._lock:
+            return self._summaries.get(self._key(name, labels))
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._summaries.clear()
+
+    def expose(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = list(self._counters.items())
+            summaries = [
+                (key, s.count, s.total, [s.quantile(q) for q in QUANTILES])
+                for key, s in self._summaries.items()
+            ]
+        lines = []
+        counters.sort(key=lambda item: item[0][0])
+        for name, group in groupby(counters, key=lambda item: item[0][0]):
+            lines.append(f"# TYPE {name} counter")
+            for (_, labels), value in group:
+                lines.append(f"{name}{format_labels(labels)} {value:g}")
+        summaries.sort(key=lambda item: item[0][0])
+        for name, group in groupby(summaries, key=lambda item: item[0][0]):
+            lines.append(f"# TYPE {name} summary")
+            for (_, labels), count, total, quantiles in group:
+                for q, value in zip(QUANTILES, quantiles):
+                    lines.append(
+                        f"{name}{format_labels(labels, quantile=q)} {value:g}"
+                    )
+                lines.append(f"{name}_sum{format_labels(labels)} {total:g}")
+                lines.append(f"{name}_count{format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
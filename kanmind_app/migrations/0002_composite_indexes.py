@@ -0,0 +1,48 @@
+# Generated by Django 6.0 on 2026-10-17 05:52
+
+from django.db import migrations, models
+
+from kanmind_app.operations import (
+    AddIndexConcurrentlyIfSupported,
+    AddThroughIndexConcurrentlyIfSupported,
+)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('kanmind_app', '0001_initial'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='comment',
+            index=models.Index(fields=['task', 'created_at', 'id'], name='comment_task_created_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['board', 'status'], name='task_board_status_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['board', 'priority'], name='task_board_prio_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(condition=models.Q(('assignee__isnull', False)), fields=['assignee', 'id'], name='task_assignee_id_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(condition=models.Q(('reviewer__isnull', False)), fields=['reviewer', 'id'], name='task_reviewer_id_idx'),
+        ),
+        # The (board_id, user_id) unique index covers board -> members;
+        # this one serves user -> boards (board list, access checks).
+        AddThroughIndexConcurrentlyIfSupported(
+            model_name='board',
+            field_name='members',
+            index=models.Index(fields=['user', 'board'], name='board_members_user_idx'),
+        ),
+    ]
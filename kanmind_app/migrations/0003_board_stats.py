@@ -0,0 +1,77 @@
+# Generated by Django 6.0 on 2026-10-17 09:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+STATUS_COUNTERS = {
+    "to-do": "to_do_count",
+    "in-progress": "in_progress_count",
+    "review": "review_count",
+    "done": "done_count",
+}
+PRIORITY_COUNTERS = {
+    "low": "low_priority_count",
+    "medium": "medium_priority_count",
+    "high": "high_priority_count",
+}
+
+
+def create_board_stats(apps, schema_editor):
+    """Count the existing boards once; writes keep the counts after."""
+    Board = apps.get_model("kanmind_app", "Board")
+    BoardStats = apps.get_model("kanmind_app", "BoardStats")
+    Task = apps.get_model("kanmind_app", "Task")
+
+    stats = {
+        pk: BoardStats(board_id=pk)
+        for pk in Board.objects.values_list("pk", flat=True)
+    }
+    tasks = (
+        Task.objects.values_list("board_id", "status", "priority")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    for board_id, status, priority, count in tasks:
+        row = stats[board_id]
+        row.task_count += count
+        for field in (
+            STATUS_COUNTERS.get(status),
+            PRIORITY_COUNTERS.get(priority),
+        ):
+            if field:
+                setattr(row, field, getattr(row, field) + count)
+    members = (
+        Board.members.through.objects.values_list("board_id")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    for board_id, count in members:
+        stats[board_id].member_count = count
+    BoardStats.objects.bulk_create(stats.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanmind_app', '0002_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardStats',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='kanmind_app.board')),
+                ('member_count', models.IntegerField(default=0)),
+                ('task_count', models.IntegerField(default=0)),
+                ('to_do_count', models.IntegerField(default=0)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('review_count', models.IntegerField(default=0)),
+                ('done_count', models.IntegerField(default=0)),
+                ('low_priority_count', models.IntegerField(default=0)),
+                ('medium_priority_count', models.IntegerField(default=0)),
+                ('high_priority_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_board_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 6.0 on 2026-10-17 10:02
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_comments(apps, schema_editor):
+    Comment = apps.get_model("kanmind_app", "Comment")
+    Task = apps.get_model("kanmind_app", "Task")
+    comments = (
+        Comment.objects.filter(task_id=OuterRef("pk"))
+        .order_by()
+        .values("task_id")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    Task.objects.update(
+        comments_count=Coalesce(
+            Subquery(comments, output_field=IntegerField()), 0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanmind_app', '0003_board_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='comments_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(count_comments, migrations.RunPython.noop),
+    ]
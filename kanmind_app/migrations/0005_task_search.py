@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+from kanmind_app.operations import (
+    AddIndexConcurrentlyIfSupported,
+    RunSQLOnPostgres,
+)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('kanmind_app', '0004_task_comments_count'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['board', 'due_date'], name='task_board_due_idx'),
+        ),
+        # Must match the expression in
+        # kanmind_app.api.filters.search_tasks
+        RunSQLOnPostgres(
+            sql=(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS task_search_idx "
+                "ON kanmind_app_task USING gin "
+                "(to_tsvector('simple', title || ' ' || description))"
+            ),
+            reverse_sql="DROP INDEX CONCURRENTLY IF EXISTS task_search_idx",
+        ),
+    ]
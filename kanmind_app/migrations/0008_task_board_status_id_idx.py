@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:52
+
+from django.db import migrations, models
+
+from kanmind_app.operations import (
+    AddIndexConcurrentlyIfSupported,
+    RemoveIndexConcurrentlyIfSupported,
+)
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('kanmind_app', '0007_comment_created_at_default'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['board', 'status', 'id'], name='task_board_status_id_idx'),
+        ),
+        RemoveIndexConcurrentlyIfSupported(
+            model_name='task',
+            name='task_board_status_idx',
+        ),
+    ]
@@ -3,7 +3,10 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
+
+from kanmind_app.hashing import check_user_password, hash_password
 
 
 class CustomUserManager(BaseUserManager):
@@ -36,6 +39,14 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.email
 
+    # Hashing runs through the bounded pool in kanmind_app.hashing
+    def set_password(self, raw_password):
+        self.password = hash_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        return check_user_password(self, raw_password)
+
 
 class Board(models.Model):
     owner = models.ForeignKey(
@@ -54,6 +65,8 @@ class Board(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Last membership change, for GET /boards/{id}/changes/
+    members_updated_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
         constraints = [
@@ -117,17 +130,146 @@ class Task(models.Model):
         related_name="created_tasks",
         on_delete=models.CASCADE,
     )
+    # Maintained with F() increments by kanmind_app.counters
+    comments_count = models.IntegerField(default=0)
+    # Bumped on every change of the task as rendered (kanmind_app.sync)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Board columns, paged by id, and status filters
+            models.Index(
+                fields=["board", "status", "id"],
+                name="task_board_status_id_idx",
+            ),
+            models.Index(
+                fields=["board", "priority"], name="task_board_prio_idx"
+            ),
+            models.Index(
+                fields=["board", "due_date"], name="task_board_due_idx"
+            ),
+            # Changes since a sync cursor
+            models.Index(
+                fields=["board", "updated_at"], name="task_board_updated_idx"
+            ),
+            # assigned-to-me / reviewing, paginated by id
+            models.Index(
+                fields=["assignee", "id"],
+                name="task_assignee_id_idx",
+                condition=models.Q(assignee__isnull=False),
+            ),
+            models.Index(
+                fields=["reviewer", "id"],
+                name="task_reviewer_id_idx",
+                condition=models.Q(reviewer__isnull=False),
+            ),
+            # The full-text index task_search_idx (PostgreSQL only) is
+            # created by migration 0005; see api.filters.search_tasks
+        ]
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # Never write back a (possibly stale) comments_count
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "comments_count"
+            ]
+        elif kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "updated_at"}
+        # post_save updates the board counters, inside this transaction
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+
+class BoardStats(models.Model):
+    """Denormalized task and member counts of one board.
+
+    Kept up to date by kanmind_app.counters on every write; the
+    rebuild_board_stats command recounts them from scratch.
+    """
+
+    board = models.OneToOneField(
+        Board,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    member_count = models.IntegerField(default=0)
+    task_count = models.IntegerField(default=0)
+    to_do_count = models.IntegerField(default=0)
+    in_progress_count = models.IntegerField(default=0)
+    review_count = models.IntegerField(default=0)
+    done_count = models.IntegerField(default=0)
+    low_priority_count = models.IntegerField(default=0)
+    medium_priority_count = models.IntegerField(default=0)
+    high_priority_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Stats of board {self.board_id}"
+
 
 class Comment(models.Model):
     task = models.ForeignKey(
         Task, on_delete=models.CASCADE, related_name="comments"
     )
     content = models.TextField()
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Not auto_now_add, so board imports can keep the original times
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="comments"
     )
+
+    def save(self, *args, **kwargs):
+        # post_save updates Task.comments_count, in this transaction
+        with transaction.atomic(using=kwargs.get("using")):
+            super().save(*args, **kwargs)
+
+    class Meta:
+        indexes = [
+            # Comment lists of a task, paginated by (created_at, id)
+            models.Index(
+                fields=["task", "created_at", "id"],
+                name="comment_task_created_idx",
+            ),
+            models.Index(
+                fields=["task", "updated_at"],
+                name="comment_task_updated_idx",
+            ),
+        ]
+
+
+class Tombstone(models.Model):
+    """A deleted task or comment, reported by GET /boards/{id}/changes/.
+
+    Written by kanmind_app.sync and pruned by the prune_tombstones
+    command once older than KANMIND_SYNC_RETENTION_DAYS.
+    """
+
+    KIND_CHOICES = [
+        ("task", "Task"),
+        ("comment", "Comment"),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    board = models.ForeignKey(
+        Board, on_delete=models.CASCADE, related_name="tombstones"
+    )
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.IntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["board", "deleted_at"],
+                name="tombstone_board_deleted_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Deleted {self.kind} {self.object_id}"
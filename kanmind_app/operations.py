@@ -0,0 +1,154 @@
+"""Migration operations that build indexes without locking writes.
+
+PostgreSQL can create and drop indexes ``CONCURRENTLY``; other backends
+(SQLite for local development) fall back to a plain CREATE INDEX.
+Migrations using these operations must set ``atomic = False``.
+"""
+
+from django.db.migrations.operations import AddIndex, RemoveIndex, RunSQL
+from django.db.migrations.operations.base import Operation
+
+
+def _concurrently(schema_editor):
+    return schema_editor.connection.vendor == "postgresql"
+
+
+def add_index(schema_editor, model, index):
+    if _concurrently(schema_editor):
+        schema_editor.add_index(model, index, concurrently=True)
+    else:
+        schema_editor.add_index(model, index)
+
+
+def remove_index(schema_editor, model, index):
+    if _concurrently(schema_editor):
+        schema_editor.remove_index(model, index, concurrently=True)
+    else:
+        schema_editor.remove_index(model, index)
+
+
+class AddIndexConcurrentlyIfSupported(AddIndex):
+    """AddIndex that uses CREATE INDEX CONCURRENTLY on PostgreSQL."""
+
+    def describe(self):
+        return "Create index %s on field(s) %s of model %s" % (
+            self.index.name,
+            ", ".join(self.index.fields),
+            self.model_name,
+        )
+
+    def database_forwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            add_index(schema_editor, model, self.index)
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            remove_index(schema_editor, model, self.index)
+
+
+class RemoveIndexConcurrentlyIfSupported(RemoveIndex):
+    """RemoveIndex that uses DROP INDEX CONCURRENTLY on PostgreSQL."""
+
+    def database_forwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            model_state = from_state.models[app_label, self.model_name_lower]
+            index = model_state.get_index_by_name(self.name)
+            remove_index(schema_editor, model, index)
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            model_state = to_state.models[app_label, self.model_name_lower]
+            index = model_state.get_index_by_name(self.name)
+            add_index(schema_editor, model, index)
+
+
+class AddThroughIndexConcurrentlyIfSupported(Operation):
+    """Index the auto-created table behind a ManyToManyField.
+
+    Auto-created through models have no Meta to declare indexes on, so
+    the index lives only in the database and the migration state is
+    left untouched.
+    """
+
+    reversible = True
+
+    def __init__(self, model_name, field_name, index):
+        self.model_name = model_name
+        self.field_name = field_name
+        self.index = index
+
+    def deconstruct(self):
+        kwargs = {
+            "model_name": self.model_name,
+            "field_name": self.field_name,
+            "index": self.index,
+        }
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def _through(self, apps, app_label):
+        model = apps.get_model(app_label, self.model_name)
+        return model._meta.get_field(self.field_name).remote_field.through
+
+    def database_forwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        through = self._through(to_state.apps, app_label)
+        if self.allow_migrate_model(schema_editor.connection.alias, through):
+            add_index(schema_editor, through, self.index)
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        through = self._through(from_state.apps, app_label)
+        if self.allow_migrate_model(schema_editor.connection.alias, through):
+            remove_index(schema_editor, through, self.index)
+
+    def describe(self):
+        return "Create index %s on %s.%s" % (
+            self.index.name,
+            self.model_name,
+            self.field_name,
+        )
+
+    @property
+    def migration_name_fragment(self):
+        return self.index.name.lower()
+
+
+class RunSQLOnPostgres(RunSQL):
+    """RunSQL that is skipped on other backends.
+
+    For indexes only PostgreSQL can build (GIN, full-text expressions);
+    the code using them has a fallback for the other backends.
+    """
+
+    def database_forwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        if _concurrently(schema_editor):
+            super().database_forwards(
+                app_label, schema_editor, from_state, to_state
+            )
+
+    def database_backwards(
+        self, app_label, schema_editor, from_state, to_state
+    ):
+        if _concurrently(schema_editor):
+            super().database_backwards(
+                app_label, schema_editor, from_state, to_state
+            )
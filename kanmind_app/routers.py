@@ -0,0 +1,133 @@
+"""Read-replica routing.
+
+ReplicaRoutingMiddleware lets safe (GET/HEAD/OPTIONS) API requests read
+from one of KANMIND_READ_REPLICAS, picked per request. Everything else
+reads from the primary: writes, reads in a transaction, reads after
+the request has written anything, and requests outside of one (admin,
+management commands, migrations). Token lookups always use the primary,
+so a token is usable right after login.
+
+A caller whose request wrote is pinned to the primary for
+KANMIND_REPLICA_PIN_SECONDS, so it reads its own writes while the
+replicas catch up. Callers are identified by their auth token (one per
+user); the pin is kept in the default cache, which should be the
+shared one when several processes serve the API.
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.authentication import get_authorization_header
+from rest_framework.authtoken.models import Token
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_KEY = "kanmind:primary-pin:{}"
+
+_routing = ContextVar("kanmind_db_routing", default=None)
+
+
+class RequestRouting:
+    """Routing state of one request: its replica, if any, and writes."""
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.wrote = False
+
+
+def pin_key(request):
+    """Cache key of the caller's pin, from its token, or None."""
+    parts = get_authorization_header(request).split()
+    if len(parts) == 2 and parts[0].lower() == b"token":
+        return PIN_KEY.format(parts[1].decode(errors="replace"))
+    return None
+
+
+def replica_candidate(request):
+    """Whether ``request`` may read from a replica, pins aside."""
+    return bool(settings.KANMIND_READ_REPLICAS) and (
+        request.method in SAFE_METHODS
+    )
+
+
+def choose_replica():
+    return random.choice(settings.KANMIND_READ_REPLICAS)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        if (
+            routing is None
+            or routing.replica is None
+            or routing.wrote
+            or model is Token
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return routing.replica
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """Route the reads of API requests, see the module docstring."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not request.path.startswith("/api/"):
+            return self.get_response(request)
+        key = pin_key(request)
+        replica = None
+        if replica_candidate(request) and (
+            key is None or cache.get(key) is None
+        ):
+            replica = choose_replica()
+        routing = RequestRouting(replica)
+        token = _routing.set(routing)
+        try:
+            return self.get_response(request)
+        finally:
+            _routing.reset(token)
+            if routing.wrote and key is not None:
+                cache.set(key, 1, settings.KANMIND_REPLICA_PIN_SECONDS)
+
+    async def __acall__(self, request):
+        if not request.path.startswith("/api/"):
+            return await self.get_response(request)
+        key = pin_key(request)
+        replica = None
+        if replica_candidate(request) and (
+            key is None or await cache.aget(key) is None
+        ):
+            replica = choose_replica()
+        routing = RequestRouting(replica)
+        token = _routing.set(routing)
+        try:
+            return await self.get_response(request)
+        finally:
+            _routing.reset(token)
+            if routing.wrote and key is not None:
+                await cache.aset(
+                    key, 1, settings.KANMIND_REPLICA_PIN_SECONDS
+                )
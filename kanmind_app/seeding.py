@@ -0,0 +1,270 @@
+"""Deterministic sample data for the query-budget tests and benchmarks.
+
+``seed(scale)`` fills an empty database with bulk inserts: at scale 1,
+60 users, 4 boards with 30 members each, 2000 tasks and 4000 comments.
+Every count grows linearly with ``scale`` except the members per
+board. Counters (BoardStats, ``Task.comments_count``) are computed
+afterwards, as the bulk inserts send no signals, and ``cursor`` is a
+sync cursor with one task update and one deletion after it.
+
+``route_requests(data)`` lists one representative request per route
+and method of the API, and ``replay()`` makes one of them, measured.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from kanmind_app.api.authentication import local_tokens
+from kanmind_app.archive import export_board
+from kanmind_app.board_cache import local_bodies
+from kanmind_app.counters import (
+    rebuild_board_stats,
+    reconcile_comment_counts,
+)
+from kanmind_app.models import Board, Comment, Task, Tombstone, User
+from kanmind_app.sync import encode_cursor
+
+PASSWORD = "Seed-password-1"
+
+MEMBERS_PER_BOARD = 30
+STATUSES = [value for value, _ in Task.STATUS_CHOICES]
+PRIORITIES = [value for value, _ in Task.PRIORITY_CHOICES]
+
+
+@dataclass(frozen=True)
+class Dataset:
+    owner: User
+    token: Token
+    board: Board
+    task: Task
+    comment: Comment
+    # Sync cursor from before the last write, see kanmind_app.sync
+    cursor: str
+    users: int
+    boards: int
+    tasks: int
+    comments: int
+
+
+def seed(scale=1):
+    """Insert the sample data; the first user owns every board."""
+    password = make_password(PASSWORD)
+    users = User.objects.bulk_create(
+        User(
+            email=f"user{i}@example.com",
+            fullname=f"User Number{i}",
+            password=password,
+        )
+        for i in range(60 * scale)
+    )
+    owner = users[0]
+    boards = Board.objects.bulk_create(
+        Board(owner=owner, title=f"Board {i}") for i in range(4 * scale)
+    )
+    Membership = Board.members.through
+    Membership.objects.bulk_create(
+        Membership(board=board, user=users[(b + i) % len(users)])
+        for b, board in enumerate(boards)
+        for i in range(MEMBERS_PER_BOARD)
+    )
+    tasks = Task.objects.bulk_create(
+        Task(
+            board=board,
+            title=f"Task {i}",
+            description="Generated task " * 5,
+            status=STATUSES[i % len(STATUSES)],
+            priority=PRIORITIES[i % len(PRIORITIES)],
+            assignee=users[(b + i) % MEMBERS_PER_BOARD],
+            reviewer=users[(b + i + 1) % MEMBERS_PER_BOARD] if i % 3 else None,
+            created_by=owner,
+        )
+        for b, board in enumerate(boards)
+        for i in range(500)
+    )
+    comments = Comment.objects.bulk_create(
+        Comment(task=task, author=users[(i + c) % len(users)], content="c")
+        for i, task in enumerate(tasks)
+        for c in range(2)
+    )
+    rebuild_board_stats()
+    reconcile_comment_counts()
+    # Seeded an hour ago, synced half an hour ago, then changed a bit
+    now = timezone.now()
+    seeded = now - timedelta(hours=1)
+    Task.objects.update(updated_at=seeded)
+    Comment.objects.update(updated_at=seeded)
+    Board.objects.update(members_updated_at=seeded)
+    cursor = encode_cursor(now - timedelta(minutes=30))
+    Task.objects.filter(pk=tasks[1].pk).update(updated_at=now)
+    Tombstone.objects.create(
+        board=boards[0], kind="comment", object_id=comments[-1].pk + 1
+    )
+    return Dataset(
+        owner=owner,
+        token=Token.objects.create(user=owner),
+        board=boards[0],
+        task=Task.objects.get(pk=tasks[0].pk),
+        comment=comments[0],
+        cursor=cursor,
+        users=len(users),
+        boards=len(boards),
+        tasks=len(tasks),
+        comments=len(comments),
+    )
+
+
+@dataclass(frozen=True)
+class RouteRequest:
+    method: str
+    route: str
+    path: str
+    data: object = None
+    # Sent as JSON unless given
+    content_type: str = None
+
+
+def route_requests(data):
+    """One request per (method, route) of kanmind_app.api.urls.
+
+    Requests are made as ``data.owner``. Writes are meant to be rolled
+    back after each request, so all of them refer to the seeded rows.
+    The board event stream never finishes and is left out.
+    """
+    board, task, comment = data.board, data.task, data.comment
+    owner = data.owner.pk
+    new_task = {
+        "board": board.pk,
+        "title": "New",
+        "description": "d",
+        "status": "to-do",
+        "priority": "high",
+        "assignee_id": owner,
+    }
+    board_tasks = list(board.tasks.values_list("pk", flat=True)[:20])
+    board_path = f"boards/{board.pk}/"
+    task_path = f"tasks/{task.pk}/"
+    comments_path = f"tasks/{task.pk}/comments/"
+    registration = {
+        "fullname": "New Person",
+        "email": "new@example.com",
+        "password": PASSWORD,
+        "repeated_password": PASSWORD,
+    }
+    login = {"email": data.owner.email, "password": PASSWORD}
+    requests = [
+        ("POST", "registration/", None, registration),
+        ("POST", "login/", None, login),
+        ("POST", "logout/", None, None),
+        ("GET", "email-check/", f"email-check/?email={login['email']}", None),
+        ("GET", "boards/", None, None),
+        ("POST", "boards/", None, {"title": "New", "members": [owner]}),
+        ("GET", "boards/<int:board_id>/", board_path, None),
+        ("PATCH", "boards/<int:board_id>/", board_path, {"title": "New"}),
+        ("GET", "boards/<int:board_id>/export/", f"{board_path}export/", None),
+        (
+            "POST",
+            "boards/<int:board_id>/events/ticket/",
+            f"{board_path}events/ticket/",
+            None,
+        ),
+        (
+            "GET",
+            "boards/<int:board_id>/changes/",
+            f"{board_path}changes/?since={data.cursor}",
+            None,
+        ),
+        ("GET", "tasks/", f"tasks/?board={board.pk}", None),
+        ("POST", "tasks/", None, new_task),
+        ("POST", "tasks/bulk/", None, [new_task] * 20),
+        (
+            "PATCH",
+            "tasks/bulk/",
+            None,
+            [{"id": pk, "status": "done"} for pk in board_tasks],
+        ),
+        ("DELETE", "tasks/bulk/", None, [{"id": pk} for pk in board_tasks]),
+        ("GET", "tasks/<int:task_id>/", task_path, None),
+        ("PATCH", "tasks/<int:task_id>/", task_path, {"status": "done"}),
+        ("DELETE", "tasks/<int:task_id>/", task_path, None),
+        ("GET", "tasks/assigned-to-me/", None, None),
+        ("GET", "tasks/reviewing/", None, None),
+        ("GET", "tasks/<int:task_id>/comments/", comments_path, None),
+        ("GET", "tasks/<int:task_id>/comments/timeline/", None, None),
+        (
+            "POST",
+            "tasks/<int:task_id>/comments/",
+            comments_path,
+            {"content": "New comment"},
+        ),
+        (
+            "DELETE",
+            "tasks/<int:task_id>/comments/<int:comment_id>/",
+            f"{comments_path}{comment.pk}/",
+            None,
+        ),
+        ("GET", "async/boards/", None, None),
+        ("GET", "async/boards/<int:board_id>/", f"async/{board_path}", None),
+        ("GET", "async/tasks/assigned-to-me/", None, None),
+        ("GET", "async/tasks/reviewing/", None, None),
+        (
+            "GET",
+            "async/tasks/<int:task_id>/comments/",
+            f"async/{comments_path}",
+            None,
+        ),
+    ]
+    requests = [
+        RouteRequest(
+            method,
+            route,
+            "/api/" + (path or route.replace("<int:task_id>", str(task.pk))),
+            body,
+        )
+        for method, route, path, body in requests
+    ]
+    archive = b"".join(export_board(board))
+    requests.append(
+        RouteRequest(
+            "POST",
+            "boards/import/",
+            "/api/boards/import/?title=Imported",
+            archive,
+            "application/x-ndjson",
+        )
+    )
+    return requests
+
+
+def replay(client, request):
+    """Make ``request``; returns the response, its queries and seconds.
+
+    Caches are cleared first, so the numbers are those of a cold
+    request, and the request's writes are rolled back afterwards.
+    """
+    cache.clear()
+    local_tokens.clear()
+    local_bodies.clear()
+    send = getattr(client, request.method.lower())
+    if request.content_type is None:
+        options = {"format": "json"}
+    else:
+        options = {"content_type": request.content_type}
+    with transaction.atomic():
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = send(request.path, request.data, **options)
+            if response.streaming:
+                # Streamed bodies run their queries as they are read
+                for _ in response.streaming_content:
+                    pass
+            elapsed = time.perf_counter() - start
+        transaction.set_rollback(True)
+    return response, len(queries), elapsed
@@ -0,0 +1,236 @@
+from contextvars import ContextVar
+
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from kanmind_app.access import invalidate_board_access
+from kanmind_app.api.authentication import evict_tokens, evict_user_tokens
+from kanmind_app.board_cache import evict_boards
+from kanmind_app.bulk import in_bulk_write
+from kanmind_app.counters import (
+    record_comment_change,
+    record_task_changes,
+    recount_members,
+    stored_task_states,
+    task_state,
+)
+from kanmind_app.events import (
+    comment_event_data,
+    publish_on_commit,
+    task_event_data,
+)
+from kanmind_app.models import Board, BoardStats, Comment, Task, User
+from kanmind_app.sync import mark_user_changed, record_deletions
+from kanmind_app.versioning import touch_boards
+
+
+@receiver(post_save, sender=Board)
+def board_saved(sender, instance, created, **kwargs):
+    """A new board is visible to its owner and gets its counters."""
+    if created:
+        invalidate_board_access([instance.owner_id])
+        BoardStats.objects.create(board=instance)
+    else:
+        # save() bumped updated_at, the board version
+        evict_boards([instance.pk])
+        publish_on_commit(
+            instance.pk,
+            "board.updated",
+            {"id": instance.pk, "title": instance.title},
+        )
+
+
+# Boards being removed by a running delete(), mapped to its origin
+_deleting_boards = ContextVar("kanmind_deleting_boards", default=None)
+
+
+def deleting_boards():
+    boards = _deleting_boards.get()
+    if boards is None:
+        boards = {}
+        _deleting_boards.set(boards)
+    return boards
+
+
+def deleted_with_board(board_id, origin):
+    """True if the delete() ``origin`` started also removes the board.
+
+    Collector.delete() sends every pre_delete signal before deleting
+    anything, so this holds for every row of the cascade.
+    """
+    return deleting_boards().get(board_id, False) is origin
+
+
+@receiver(pre_delete, sender=Board)
+def board_deleted(sender, instance, origin=None, **kwargs):
+    """Owner and members lose access to a deleted board."""
+    deleting_boards()[instance.pk] = origin
+    member_ids = instance.members.values_list("pk", flat=True)
+    invalidate_board_access([instance.owner_id, *member_ids])
+    evict_boards([instance.pk])
+    publish_on_commit(instance.pk, "board.deleted", {"id": instance.pk})
+
+
+@receiver(post_delete, sender=Board)
+def board_removed(sender, instance, **kwargs):
+    deleting_boards().pop(instance.pk, None)
+
+
+def publish_membership(board_ids, type, user_ids):
+    user_ids = sorted(user_ids)
+    for board_id in board_ids:
+        publish_on_commit(board_id, type, {"user_ids": user_ids})
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def board_members_changed(sender, instance, action, reverse, pk_set, **kw):
+    """Membership changes from either side of Board.members."""
+    event = {"post_add": "members.added"}.get(action, "members.removed")
+    if reverse:
+        # user.member_boards.add/remove/clear(): one user affected
+        if action == "pre_clear":
+            board_ids = list(
+                instance.member_boards.values_list("pk", flat=True)
+            )
+            touch_boards(board_ids, members=True)
+            publish_membership(board_ids, event, [instance.pk])
+            instance._cleared_board_ids = board_ids
+        elif action in ("post_add", "post_remove"):
+            touch_boards(pk_set, members=True)
+            recount_members(pk_set)
+            publish_membership(pk_set, event, [instance.pk])
+        elif action == "post_clear":
+            recount_members(instance.__dict__.pop("_cleared_board_ids", ()))
+        if action in ("post_add", "post_remove", "post_clear"):
+            invalidate_board_access([instance.pk])
+        return
+
+    if action in ("post_add", "post_remove", "post_clear"):
+        touch_boards([instance.pk], members=True)
+        recount_members([instance.pk])
+    if action in ("post_add", "post_remove"):
+        invalidate_board_access(pk_set)
+        publish_membership([instance.pk], event, pk_set)
+    elif action == "pre_clear":
+        member_ids = list(instance.members.values_list("pk", flat=True))
+        invalidate_board_access(member_ids)
+        publish_membership([instance.pk], event, member_ids)
+
+
+# Deletes cascading from a task (for comments) skip the per-row work,
+# the task's own handler covers it. Rows deleted together with their
+# board (by Board.delete(), or by deleting its owner) skip it too:
+# there is nothing left to count, touch or leave tombstones in. So do
+# bulk deletes, which kanmind_app.bulk accounts for once per call.
+
+
+@receiver(pre_save, sender=Task)
+def task_saving(sender, instance, **kwargs):
+    """Lock the stored row and remember the state the counters hold."""
+    if instance.pk is not None:
+        instance._stored_state = stored_task_states([instance.pk]).get(
+            instance.pk
+        )
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, created, update_fields=None, **kwargs):
+    stored = instance.__dict__.pop("_stored_state", None)
+    state = task_state(instance, update_fields, stored)
+    if state != stored:
+        record_task_changes([(stored, state)])
+    touch_boards([instance.board_id])
+    publish_on_commit(
+        instance.board_id,
+        "task.created" if created else "task.updated",
+        task_event_data(instance),
+    )
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    if deleted_with_board(instance.board_id, origin) or in_bulk_write():
+        return
+    record_task_changes([(task_state(instance), None)])
+    record_deletions("task", {instance.pk: instance.board_id})
+    touch_boards([instance.board_id])
+    publish_on_commit(instance.board_id, "task.deleted", {"id": instance.pk})
+
+
+def comment_board_id(comment):
+    if Comment.task.is_cached(comment):
+        return comment.task.board_id
+    return (
+        Task.objects.filter(pk=comment.task_id)
+        .values_list("board_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if created:
+        record_comment_change(instance.task_id, 1)
+    board_id = comment_board_id(instance)
+    touch_boards([board_id])
+    publish_on_commit(
+        board_id,
+        "comment.created" if created else "comment.updated",
+        comment_event_data(instance),
+    )
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if isinstance(origin, Task) or in_bulk_write():
+        return
+    board_id = comment_board_id(instance)
+    if board_id is None or deleted_with_board(board_id, origin):
+        return
+    record_comment_change(instance.task_id, -1)
+    record_deletions("comment", {instance.pk: board_id})
+    touch_boards([board_id])
+    publish_on_commit(
+        board_id,
+        "comment.deleted",
+        {"id": instance.pk, "task": instance.task_id},
+    )
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    """Logout and token rotation end cached token resolutions."""
+    evict_tokens([instance.key])
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    """Keep cached users fresh, so deactivation takes effect at once."""
+    if created:
+        return
+    evict_user_tokens(instance)
+    if update_fields is None or {"email", "fullname"} & set(update_fields):
+        # Board details show members and task users by name and email,
+        # board changes (kanmind_app.sync) comment authors too
+        commented_on = mark_user_changed(instance.pk)
+        touch_boards(boards_showing_user(instance.pk) | commented_on)
+
+
+def boards_showing_user(user_id):
+    member_of = Board.members.through.objects.filter(
+        user_id=user_id
+    ).values_list("board_id", flat=True)
+    on_tasks = Task.objects.filter(
+        Q(assignee_id=user_id)
+        | Q(reviewer_id=user_id)
+        | Q(created_by_id=user_id)
+    ).values_list("board_id", flat=True)
+    return set(member_of) | set(on_tasks)
@@ -0,0 +1,129 @@
+"""Incremental board sync, served by GET /boards/{id}/changes/.
+
+Tasks and comments carry an ``updated_at`` that every write bumps;
+deletes leave a Tombstone. A client holding a board as of cursor T
+asks for the rows changed and the tombstones written after T, so a
+sync costs as much as the churn since T, not the size of the board.
+Membership has no rows of its own: when ``Board.members_updated_at``
+is after T the (short) member list is sent again as a whole.
+
+Cursors are the server time of the previous sync. Rows written in a
+transaction that commits after a sync carry a time before that
+sync's cursor; to pick them up anyway, every sync also looks back
+KANMIND_SYNC_OVERLAP_SECONDS before its cursor. Clients apply changes
+as idempotent upserts and deletes, so seeing a row twice is harmless.
+"""
+
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from kanmind_app.models import Board, Comment, Task, Tombstone
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class SyncReset(APIException):
+    """The client has to reload the board instead of syncing it."""
+
+    status_code = status.HTTP_410_GONE
+    default_detail = "Changes since this cursor are unavailable, reload."
+    default_code = "sync_reset"
+
+
+def encode_cursor(moment):
+    """Opaque cursor of ``moment``: microseconds since the epoch."""
+    return str((moment - EPOCH) // timedelta(microseconds=1))
+
+
+def decode_cursor(cursor):
+    """The moment of ``cursor``; raises ValueError if malformed."""
+    micros = int(cursor)
+    if micros < 0:
+        raise ValueError(cursor)
+    return EPOCH + timedelta(microseconds=micros)
+
+
+def retention_horizon():
+    """Tombstones, and so cursors, older than this are gone."""
+    days = getattr(settings, "KANMIND_SYNC_RETENTION_DAYS", 30)
+    return timezone.now() - timedelta(days=days)
+
+
+def overlap():
+    return timedelta(
+        seconds=getattr(settings, "KANMIND_SYNC_OVERLAP_SECONDS", 5)
+    )
+
+
+def record_deletions(kind, board_ids_by_object):
+    """Leave tombstones for deleted rows, ``{object_id: board_id}``."""
+    if board_ids_by_object:
+        Tombstone.objects.bulk_create(
+            Tombstone(board_id=board_id, kind=kind, object_id=object_id)
+            for object_id, board_id in board_ids_by_object.items()
+        )
+
+
+def mark_user_changed(user_id):
+    """A user's name or email changed: resend what shows them.
+
+    Returns the ids of the boards with comments by the user, which
+    (unlike tasks and members) do not count as showing the user.
+    """
+    now = timezone.now()
+    Task.objects.filter(
+        Q(assignee_id=user_id)
+        | Q(reviewer_id=user_id)
+        | Q(created_by_id=user_id)
+    ).update(updated_at=now)
+    Comment.objects.filter(author_id=user_id).update(updated_at=now)
+    Board.objects.filter(members=user_id).update(members_updated_at=now)
+    return set(
+        Task.objects.filter(comments__author_id=user_id).values_list(
+            "board_id", flat=True
+        )
+    )
+
+
+def changed_rows(board, since, tasks, comments):
+    """Querysets of what changed in ``board`` after ``since``.
+
+    Returns ``(tasks, comments, tombstones, members_changed)``;
+    ``tasks`` and ``comments`` are filtered from the querysets given.
+    ``since=None`` means everything, and no tombstones.
+    """
+    tasks = tasks.filter(board=board)
+    comments = comments.filter(task__board=board)
+    if since is None:
+        return tasks, comments, Tombstone.objects.none(), True
+    after = since - overlap()
+    return (
+        tasks.filter(updated_at__gt=after),
+        comments.filter(updated_at__gt=after),
+        board.tombstones.filter(deleted_at__gt=after),
+        board.members_updated_at > after,
+    )
+
+
+def unchanged_since(board, since):
+    """True if nothing under ``board`` can have changed after ``since``.
+
+    Every task, comment and membership write bumps the board version.
+    """
+    return since is not None and board.updated_at <= since - overlap()
+
+
+def prune_tombstones(before=None):
+    """Delete tombstones older than ``before`` (the retention horizon).
+
+    Returns how many were deleted.
+    """
+    before = retention_horizon() if before is None else before
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=before).delete()
+    return deleted
@@ -1,3 +1,2173 @@
-from django.test import TestCase
+import asyncio
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from base64 import urlsafe_b64encode
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import (
+    OperationalError,
+    connection,
+    connections,
+    transaction,
+)
+from django.http import HttpResponse
+from django.test import (
+    AsyncClient,
+    RequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.utils.translation import gettext_lazy
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from kanmind_app.api.authentication import SHARED_KEY, local_tokens
+from kanmind_app.api.compiled import (
+    CompiledCommentSerializer,
+    CompiledTaskSerializer,
+    CompiledUserSerializer,
+    board_full_data,
+)
+from kanmind_app.api.querysets import board_detail_queryset, task_queryset
+from kanmind_app.api.renderers import FastJSONParser, FastJSONRenderer
+from kanmind_app.api.urls import urlpatterns
+from kanmind_app.api.serializers import (
+    BoardFullSerializer,
+    CommentSerializer,
+    TaskSerializer,
+    UserSerializer,
+)
+from kanmind_app.api.streams import issue_ticket, ticket_user_id
+from kanmind_app.board_cache import local_bodies
+from kanmind_app.bulk import delete_tasks, update_tasks
+from kanmind_app.cache import LRUCache
+from kanmind_app.counters import rebuild_board_stats
+from kanmind_app.events import InProcessBroker, get_broker
+from kanmind_app.hashing import HashingPool, HashingUnavailable
+from kanmind_app.instrumentation import RequestMetricsMiddleware, phase
+from kanmind_app.metrics import registry
+from kanmind_app.models import (
+    Board,
+    BoardStats,
+    Comment,
+    Task,
+    Tombstone,
+    User,
+)
+from kanmind_app.routers import ReplicaRouter, RequestRouting, _routing
+from kanmind_app.seeding import replay, route_requests, seed
+from kanmind_app.sync import retention_horizon
+
+# Keep the per-request log lines out of the test output
+logging.getLogger("kanmind").setLevel(logging.ERROR)
+
+
+def forged_cursor(key):
+    """A cursor in the api.pagination format, holding ``key``."""
+    return urlsafe_b64encode(json.dumps({"k": key}).encode()).decode()
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class APITestBase(TestCase):
+    """Shared helpers for API tests.
+
+    Throttle counters live in the cache, so it is cleared per test.
+    """
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        local_bodies.clear()
+        self.user = User.objects.create_user(
+            email="owner@example.com", password="pw", fullname="Owner User"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_user(self, n):
+        return User.objects.create_user(
+            email=f"user{n}@example.com", password="pw", fullname="Some User"
+        )
+
+    def make_board(self, title, owner=None, members=()):
+        board = Board.objects.create(owner=owner or self.user, title=title)
+        board.members.set(members)
+        return board
+
+    def make_task(self, board, **kwargs):
+        kwargs.setdefault("title", "Task")
+        kwargs.setdefault("description", "")
+        kwargs.setdefault("created_by", self.user)
+        return Task.objects.create(board=board, **kwargs)
+
+
+class BoardListTests(APITestBase):
+    def seed_board(self, title, owner=None):
+        members = [self.make_user(f"{title}-{i}") for i in range(3)]
+        if owner is not None:
+            members.append(self.user)
+        board = self.make_board(title, owner=owner, members=members)
+        self.make_task(board, status="to-do", priority="high")
+        self.make_task(board, status="to-do", priority="low")
+        self.make_task(board, status="done", priority="high")
+        return board
+
+    def test_counts(self):
+        board = self.seed_board("a")
+        response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), 1)
+        data = response.data["results"][0]
+        self.assertEqual(data["id"], board.id)
+        self.assertEqual(data["owner_id"], self.user.id)
+        self.assertEqual(data["member_count"], 3)
+        self.assertEqual(data["ticket_count"], 3)
+        self.assertEqual(data["tasks_to_do_count"], 2)
+        self.assertEqual(data["tasks_high_prio_count"], 2)
+
+    def test_member_boards_listed_once(self):
+        other = self.make_user("other")
+        self.seed_board("owned")
+        self.seed_board("shared", owner=other)
+        self.make_board("foreign", owner=other)
+        response = self.client.get("/api/boards/")
+        boards = response.data["results"]
+        titles = sorted(board["title"] for board in boards)
+        self.assertEqual(titles, ["owned", "shared"])
+        shared = next(b for b in boards if b["title"] == "shared")
+        self.assertEqual(shared["member_count"], 4)
+
+    def test_query_count_is_constant(self):
+        for i in range(10):
+            self.seed_board(f"board-{i}")
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/boards/")
+        self.assertEqual(len(response.data["results"]), 10)
+
+    def test_create_returns_counts(self):
+        member = self.make_user("m")
+        response = self.client.post(
+            "/api/boards/",
+            {"title": "new", "members": [member.id]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["member_count"], 1)
+        self.assertEqual(response.data["ticket_count"], 0)
+
+
+class BoardStatsTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.member = self.make_user("m")
+        self.board = self.make_board("b", members=[self.member])
+
+    def assertCountersMatch(self):
+        self.assertEqual(rebuild_board_stats(fix=False), [])
+
+    def test_counters_follow_writes(self):
+        task = self.make_task(self.board, priority="high")
+        self.make_task(self.board, status="done")
+        self.assertCountersMatch()
+        stats = BoardStats.objects.get(board=self.board)
+        self.assertEqual(
+            (stats.task_count, stats.to_do_count, stats.high_priority_count),
+            (2, 1, 1),
+        )
+
+        writes = [
+            lambda: self.client.patch(
+                f"/api/tasks/{task.id}/", {"status": "review"}, format="json"
+            ),
+            lambda: Task.objects.get(pk=task.pk).save(update_fields=["title"]),
+            lambda: self.client.patch(
+                "/api/tasks/bulk/",
+                [{"id": task.id, "status": "done", "priority": "low"}],
+                format="json",
+            ),
+            lambda: self.board.members.add(self.make_user("n")),
+            lambda: self.member.member_boards.clear(),
+            lambda: self.client.delete(f"/api/tasks/{task.id}/"),
+            lambda: self.board.members.clear(),
+        ]
+        for write in writes:
+            write()
+            self.assertCountersMatch()
+
+    def test_rebuild_command(self):
+        self.make_task(self.board)
+        BoardStats.objects.update(task_count=7)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_board_stats", "--check", stdout=StringIO())
+        out = StringIO()
+        call_command("rebuild_board_stats", stdout=out)
+        self.assertIn("Fixed counters of 1 board", out.getvalue())
+        self.assertCountersMatch()
+
+
+class TaskQueryBudgetTests(APITestBase):
+    """Task-rendering endpoints cost the same for 2 or 20 tasks."""
+
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board("b", members=[self.make_user("m")])
+
+    def seed_tasks(self, count):
+        offset = Task.objects.count()
+        for i in range(offset, offset + count):
+            assignee = self.make_user(f"a{i}")
+            task = self.make_task(
+                self.board,
+                assignee=assignee,
+                reviewer=self.user if i % 2 else assignee,
+            )
+            task.comments.create(content="c", author=self.user)
+        Task.objects.filter(board=self.board).update(assignee=self.user)
+
+    def assert_budget(self, url, queries, count):
+        self.seed_tasks(count)
+        cache.clear()  # measure with a cold board-access cache
+        with self.assertNumQueries(queries):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_task_list_budget(self):
+        for count in (2, 20):
+            with self.subTest(count=count):
+                # board access, then the tasks
+                response = self.assert_budget("/api/tasks/", 2, count)
+        task = response.data["results"][0]
+        self.assertEqual(task["comments_count"], 1)
+        self.assertEqual(task["assignee"]["id"], self.user.id)
+        self.assertEqual(task["created_by"]["email"], self.user.email)
+
+    def test_assigned_to_me_budget(self):
+        for count in (2, 20):
+            with self.subTest(count=count):
+                self.assert_budget("/api/tasks/assigned-to-me/", 1, count)
+
+    def test_reviewing_budget(self):
+        for count in (2, 20):
+            with self.subTest(count=count):
+                self.assert_budget("/api/tasks/reviewing/", 1, count)
+
+    def test_board_detail_budget(self):
+        url = f"/api/boards/{self.board.id}/"
+        for count in (2, 20):
+            with self.subTest(count=count):
+                # board with its access, members, tasks
+                response = self.assert_budget(url, 3, count)
+        self.assertEqual(len(response.data["members"]), 1)
+        self.assertEqual(response.data["tasks"][0]["comments_count"], 1)
+
+    def test_task_detail_budget(self):
+        self.seed_tasks(1)
+        task = Task.objects.get()
+        cache.clear()
+        # Task, users, comment count, board version and access in one
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/api/tasks/{task.id}/")
+        self.assertEqual(response.data["comments_count"], 1)
+
+
+class PaginationTests(APITestBase):
+    def test_boards_are_cursor_paginated(self):
+        for i in range(5):
+            self.make_board(f"b{i}")
+        response = self.client.get("/api/boards/?page_size=2")
+        self.assertEqual(len(response.data["results"]), 2)
+        seen = [b["id"] for b in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            seen += [b["id"] for b in response.data["results"]]
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(len(seen), 5)
+
+    def test_comments_are_paginated_in_creation_order(self):
+        task = self.make_task(self.make_board("b"))
+        for i in range(3):
+            task.comments.create(content=str(i), author=self.user)
+        url = f"/api/tasks/{task.id}/comments/?page_size=2"
+        response = self.client.get(url)
+        self.assertEqual(
+            [c["content"] for c in response.data["results"]], ["0", "1"]
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [c["content"] for c in response.data["results"]], ["2"]
+        )
+
+
+class CommentTimelineTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.task = self.make_task(self.make_board("b"))
+        self.url = f"/api/tasks/{self.task.id}/comments/timeline/"
+        for i in range(5):
+            self.task.comments.create(content=str(i), author=self.user)
+
+    def contents(self, page):
+        return [comment["content"] for comment in page["results"]]
+
+    def test_pages_newest_first(self):
+        # Task (with count), board access, one page with author names
+        with self.assertNumQueries(3):
+            page = self.client.get(self.url + "?page_size=2").json()
+        self.assertEqual(page["count"], 5)
+        self.assertEqual(self.contents(page), ["4", "3"])
+        self.assertEqual(page["results"][0]["author"], "Owner User")
+        older = self.client.get(page["older"]).json()
+        self.assertEqual(self.contents(older), ["2", "1"])
+        oldest = self.client.get(older["older"]).json()
+        self.assertEqual(self.contents(oldest), ["0"])
+        self.assertIsNone(oldest["older"])
+
+        newer = self.client.get(oldest["newer"]).json()
+        self.assertEqual(self.contents(newer), ["2", "1"])
+        self.assertIsNotNone(newer["older"])
+
+    def test_polling_for_new_comments(self):
+        page = self.client.get(self.url).json()
+        poll = self.client.get(page["newer"]).json()
+        self.assertEqual(poll["results"], [])
+        self.assertEqual(poll["newer"], page["newer"])
+        self.task.comments.create(content="5", author=self.user)
+        poll = self.client.get(poll["newer"]).json()
+        self.assertEqual(self.contents(poll), ["5"])
+        self.assertEqual(poll["count"], 6)
+
+    def test_same_timestamps_keep_their_order(self):
+        self.task.comments.update(
+            created_at=datetime.datetime(2026, 1, 1, tzinfo=datetime.UTC)
+        )
+        seen, url = [], self.url + "?page_size=2"
+        while url:
+            page = self.client.get(url).json()
+            seen += self.contents(page)
+            url = page["older"]
+        self.assertEqual(seen, ["4", "3", "2", "1", "0"])
+
+    def test_errors(self):
+        response = self.client.get(self.url + "?before=x&after=y")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(self.url + "?before=bogus")
+        self.assertEqual(response.status_code, 404)
+        for key in (
+            ["garbage", 1],
+            ["2026-01-01T00:00:00", 1],  # naive
+            ["2026-01-01T00:00:00Z", "x"],
+            ["2026-01-01T00:00:00Z", None],
+            ["2026-01-01T00:00:00Z", [1]],
+            "2026-01-01T00:00:00Z",
+            [1],
+        ):
+            for direction in ("before", "after"):
+                with self.subTest(key=key, direction=direction):
+                    response = self.client.get(
+                        self.url, {direction: forged_cursor(key)}
+                    )
+                    self.assertEqual(response.status_code, 404)
+        response = self.client.get(
+            self.url, {"before": forged_cursor(["2030-01-01T00:00:00Z", 1])}
+        )
+        self.assertEqual(len(response.json()["results"]), 5)
+        response = self.client.get("/api/tasks/999/comments/timeline/")
+        self.assertEqual(response.status_code, 404)
+        self.client.force_authenticate(self.make_user("s"))
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class SparseFieldsetTests(APITestBase):
+    def test_fields_limit_output_and_joins(self):
+        board = self.make_board("b")
+        self.make_task(board, assignee=self.user)
+        self.client.get("/api/tasks/")  # caches board access
+        with self.assertNumQueries(1) as ctx:
+            response = self.client.get("/api/tasks/?fields=id,title")
+        self.assertEqual(
+            set(response.data["results"][0]), {"id", "title"}
+        )
+        sql = ctx.captured_queries[0]["sql"]
+        self.assertNotIn("kanmind_app_user", sql)
+        self.assertNotIn("kanmind_app_comment", sql)
+
+    def test_fields_without_the_sort_key_still_paginate(self):
+        board = self.make_board("b")
+        for i in range(2):
+            task = self.make_task(
+                board, title=f"t{i}", assignee=self.user, reviewer=self.user
+            )
+            task.comments.create(content=f"c{i}", author=self.user)
+        task.comments.create(content="c", author=self.user)
+        token = Token.objects.create(user=self.user)
+        async_client = APIClient()
+        async_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        for client, path, field in [
+            (self.client, "tasks/?fields=title", "title"),
+            (self.client, "tasks/?fields=title&ordering=-board", "title"),
+            (self.client, "tasks/assigned-to-me/?fields=title", "title"),
+            (
+                self.client,
+                f"tasks/{task.id}/comments/?fields=content",
+                "content",
+            ),
+            (async_client, "async/tasks/reviewing/?fields=title", "title"),
+            (
+                async_client,
+                f"async/tasks/{task.id}/comments/?fields=content",
+                "content",
+            ),
+        ]:
+            with self.subTest(path=path):
+                response = client.get(f"/api/{path}&page_size=1")
+                self.assertEqual(response.status_code, 200)
+                first = response.json()
+                self.assertEqual(list(first["results"][0]), [field])
+                second = client.get(first["next"]).json()
+                self.assertEqual(list(second["results"][0]), [field])
+                self.assertNotEqual(second["results"], first["results"])
+
+    def test_fields_ignored_on_write(self):
+        board = self.make_board("b")
+        response = self.client.post(
+            "/api/tasks/?fields=id",
+            {"board": board.id, "title": "t", "description": "d"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("title", response.data)
+
+
+class ExplainEndpointsCommandTests(APITestBase):
+    def test_explains_every_get_endpoint(self):
+        board = self.make_board("b")
+        task = self.make_task(board, assignee=self.user)
+        task.comments.create(content="c", author=self.user)
+        out = StringIO()
+        call_command("explain_endpoints", email=self.user.email, stdout=out)
+        output = out.getvalue()
+        self.assertIn(f"GET /api/boards/{board.id}/ -> 200", output)
+        self.assertIn("GET /api/tasks/assigned-to-me/ -> 200", output)
+        self.assertIn(f"GET /api/tasks/{task.id}/comments/ -> 200", output)
+        self.assertIn("sequential scan(s) flagged", output)
+        self.assertIn("SKIP /api/async/boards/ (user has no token)", output)
+        self.assertIn(
+            "SKIP /api/boards/<int:board_id>/events/ (event stream)", output
+        )
+        # Rows of a streamed body are read while it is consumed
+        export = output.split(f"GET /api/boards/{board.id}/export/")[1]
+        self.assertIn('FROM "kanmind_app_task"', export.split("GET ")[0])
+
+        Token.objects.create(user=self.user)
+        out = StringIO()
+        call_command("explain_endpoints", email=self.user.email, stdout=out)
+        output = out.getvalue()
+        self.assertIn(f"GET /api/async/boards/{board.id}/ -> 200", output)
+        self.assertIn(
+            f"GET /api/async/tasks/{task.id}/comments/ -> 200", output
+        )
+        self.assertIn("  ok (default)", output)
+
+
+class BoardAccessTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.other = self.make_user("other")
+        self.board = self.make_board("b", owner=self.other)
+        self.task = self.make_task(self.board, created_by=self.other)
+
+    def test_non_member_is_forbidden(self):
+        self.assertEqual(
+            self.client.get(f"/api/boards/{self.board.id}/").status_code,
+            403,
+        )
+        self.assertEqual(
+            self.client.get(f"/api/tasks/{self.task.id}/").status_code, 403
+        )
+        response = self.client.get(f"/api/tasks/{self.task.id}/comments/")
+        self.assertEqual(response.status_code, 403)
+        response = self.client.post(
+            "/api/tasks/",
+            {"board": self.board.id, "title": "t", "description": "d"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_missing_objects_are_not_found(self):
+        self.assertEqual(self.client.get("/api/boards/999/").status_code, 404)
+        response = self.client.get("/api/tasks/999/comments/")
+        self.assertEqual(response.status_code, 404)
+        response = self.client.post(
+            "/api/tasks/",
+            {"board": 999, "title": "t", "description": "d"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_detail_access_is_checked_in_the_object_query(self):
+        task_url = f"/api/tasks/{self.task.id}/"
+        for url, status in [
+            (f"/api/boards/{self.board.id}/", 403),
+            (task_url, 403),
+            ("/api/boards/999/", 404),
+            ("/api/tasks/999/", 404),
+        ]:
+            cache.clear()
+            self.client = APIClient()
+            self.client.force_authenticate(self.user)
+            with self.subTest(url=url), self.assertNumQueries(1):
+                self.assertEqual(self.client.get(url).status_code, status)
+
+        # Members may read but not delete others' tasks; owners may
+        self.board.members.add(self.user)
+        self.assertEqual(self.client.get(task_url).status_code, 200)
+        self.assertEqual(self.client.delete(task_url).status_code, 403)
+        self.client.force_authenticate(self.other)
+        self.assertEqual(self.client.delete(task_url).status_code, 204)
+
+    def test_comment_delete_is_one_lookup_query(self):
+        own = self.task.comments.create(content="c", author=self.user)
+        theirs = self.task.comments.create(content="c", author=self.other)
+        url = f"/api/tasks/{self.task.id}/comments/"
+        for comment_url, status in [
+            (f"{url}{theirs.id}/", 403),
+            (f"{url}999/", 404),
+        ]:
+            cache.clear()
+            with self.subTest(url=comment_url), self.assertNumQueries(1):
+                response = self.client.delete(comment_url)
+                self.assertEqual(response.status_code, status)
+
+        # Authors may delete their comments without board access, and
+        # under any task id, as before
+        elsewhere = self.make_task(self.board, created_by=self.other)
+        response = self.client.delete(
+            f"/api/tasks/{elsewhere.id}/comments/{own.id}/"
+        )
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Comment.objects.filter(pk=own.pk).exists())
+
+    def test_membership_changes_invalidate_access(self):
+        url = f"/api/boards/{self.board.id}/"
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.board.members.add(self.user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.board.members.remove(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.user.member_boards.add(self.board)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.board.members.clear()
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_serializer_update_invalidates_removed_member(self):
+        self.board.members.add(self.user)
+        url = f"/api/boards/{self.board.id}/"
+        self.assertEqual(self.client.get(url).status_code, 200)
+        owner = APIClient()
+        owner.force_authenticate(self.other)
+        response = owner.patch(url, {"members": []}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_access_is_cached_between_requests(self):
+        self.board.members.add(self.user)
+        url = f"/api/tasks/{self.task.id}/"
+        self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_new_and_deleted_boards(self):
+        response = self.client.post(
+            "/api/boards/", {"title": "mine", "members": []}, format="json"
+        )
+        url = f"/api/boards/{response.data['id']}/"
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class LRUCacheTests(TestCase):
+    def test_evicts_least_recently_used(self):
+        lru = LRUCache(max_entries=2)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual((lru.get("a"), lru.get("c")), (1, 3))
+
+    def test_expired_entries_are_missing(self):
+        lru = LRUCache(max_entries=2, ttl=-1)
+        lru.set("a", 1)
+        self.assertIsNone(lru.get("a"))
+        self.assertEqual(len(lru), 0)
+
+    def test_evicts_beyond_max_bytes(self):
+        lru = LRUCache(max_entries=10, max_bytes=5)
+        lru.set("a", b"123")
+        lru.set("b", b"45")
+        lru.set("c", b"6")
+        self.assertIsNone(lru.get("a"))
+        self.assertEqual(lru.size, 3)
+        # Values larger than the cap are not kept at all
+        lru.set("b", b"123456")
+        self.assertIsNone(lru.get("b"))
+        self.assertEqual((lru.get("c"), lru.size), (b"6", 1))
+
+
+class CachedTokenAuthenticationTests(APITestBase):
+    url = "/api/tasks/assigned-to-me/"
+
+    def setUp(self):
+        super().setUp()
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token}")
+
+    def test_token_lookup_is_cached(self):
+        with self.assertNumQueries(2):
+            self.client.get(self.url)
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_invalid_token_is_rejected(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token nope")
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_logout_evicts_token(self):
+        self.client.get(self.url)
+        self.assertEqual(self.client.post("/api/logout/").status_code, 204)
+        self.assertFalse(Token.objects.exists())
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_rotation_evicts_token(self):
+        self.client.get(self.url)
+        self.token.delete()
+        Token.objects.create(user=self.user)
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_deactivation_evicts_user(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    @override_settings(KANMIND_TOKEN_CACHE_ALIAS="default")
+    def test_shared_entries_keep_their_expiry(self):
+        cache.clear()
+        self.client.get(self.url)
+        entry = cache.get(SHARED_KEY.format(self.token.key))
+        self.assertEqual(entry[:2], (self.user.pk, True))
+        # A process without a local copy takes the shared one
+        local_tokens.clear()
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        # and drops it when the shared entry expires, not TTL later
+        with mock.patch("kanmind_app.api.authentication.time") as clock:
+            clock.time.return_value = entry[2]
+            with self.assertNumQueries(2):
+                response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+
+class HashingPoolTests(TestCase):
+    def test_runs_in_worker_thread(self):
+        pool = HashingPool(workers=1)
+        self.addCleanup(pool.shutdown)
+        name = pool.run(lambda: threading.current_thread().name)
+        self.assertTrue(name.startswith("kanmind-hash"))
+
+    def test_rejects_when_saturated(self):
+        pool = HashingPool(workers=1, queue_size=0, timeout=0.01)
+        self.addCleanup(pool.shutdown)
+        started, release = threading.Event(), threading.Event()
+
+        def block():
+            started.set()
+            release.wait(5)
+
+        worker = threading.Thread(target=pool.run, args=(block,))
+        worker.start()
+        started.wait(5)
+        with self.assertRaises(HashingUnavailable):
+            pool.run(lambda: None)
+        release.set()
+        worker.join()
+        self.assertIsNone(pool.run(lambda: None))
+
+
+@override_settings(
+    PASSWORD_HASHERS=["kanmind_app.hashing.KanMindPBKDF2PasswordHasher"],
+    KANMIND_PBKDF2_ITERATIONS=1000,
+    KANMIND_AUTH_HASH_WORKERS=2,
+)
+class AuthPathTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        registry.clear()
+        self.client = APIClient()
+
+    def login(self, password="Secret-pass-1"):
+        return self.client.post(
+            "/api/login/",
+            {"email": "jane@example.com", "password": password},
+            format="json",
+        )
+
+    def register(self):
+        return self.client.post(
+            "/api/registration/",
+            {
+                "email": "jane@example.com",
+                "fullname": "Jane Doe",
+                "password": "Secret-pass-1",
+                "repeated_password": "Secret-pass-1",
+            },
+            format="json",
+        )
+
+    def test_register_and_login_record_latency(self):
+        response = self.register()
+        self.assertEqual(response.status_code, 201)
+        self.assertIn("auth;dur=", response["Server-Timing"])
+        self.assertTrue(
+            User.objects.get().password.startswith("pbkdf2_sha256$1000$")
+        )
+        self.assertEqual(self.login().status_code, 200)
+        self.assertEqual(self.login("wrong").status_code, 400)
+        summary = registry.summary(
+            "kanmind_auth_request_seconds", endpoint="login", status=200
+        )
+        self.assertEqual(summary.count, 1)
+        hashes = registry.summary("kanmind_auth_hash_seconds")
+        self.assertEqual(hashes.count, 3)
+
+    def test_outdated_hash_is_replaced_on_login(self):
+        self.register()
+        with self.settings(KANMIND_PBKDF2_ITERATIONS=2000):
+            self.assertEqual(self.login().status_code, 200)
+            password = User.objects.get().password
+        self.assertTrue(password.startswith("pbkdf2_sha256$2000$"))
+
+    def test_full_hashing_pool_is_503(self):
+        self.register()
+        with mock.patch(
+            "kanmind_app.hashing.HashingPool.run",
+            side_effect=HashingUnavailable,
+        ):
+            response = self.login()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.json()["detail"],
+            "Too many concurrent logins, please retry shortly.",
+        )
+        summary = registry.summary(
+            "kanmind_auth_request_seconds", endpoint="login", status=503
+        )
+        self.assertEqual(summary.count, 1)
+
+
+class ConditionalGetTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board("b")
+        self.task = self.make_task(self.board)
+        self.url = f"/api/boards/{self.board.id}/"
+
+    def etag(self, url=None):
+        response = self.client.get(url or self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Last-Modified", response)
+        return response["ETag"]
+
+    def test_matching_etag_skips_serialization(self):
+        etag = self.etag()
+        # board lookup only; board access is cached by the first GET
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_writes_change_the_etag(self):
+        etag = self.etag()
+        writes = [
+            lambda: self.make_task(self.board),
+            lambda: self.task.comments.create(content="c", author=self.user),
+            lambda: self.task.comments.all().delete(),
+            lambda: self.board.members.add(self.make_user("m")),
+            lambda: self.task.delete(),
+        ]
+        for write in writes:
+            write()
+            new_etag = self.etag()
+            self.assertNotEqual(new_etag, etag)
+            etag = new_etag
+
+    def test_non_member_gets_403_not_304(self):
+        etag = self.etag()
+        other = APIClient()
+        other.force_authenticate(self.make_user("other"))
+        response = other.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 403)
+
+    def test_task_detail_etag(self):
+        url = f"/api/tasks/{self.task.id}/"
+        etag = self.etag(url)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.task.comments.create(content="c", author=self.user)
+        self.assertNotEqual(self.etag(url), etag)
+
+
+class InProcessBrokerTests(TestCase):
+    async def test_publish_and_resume(self):
+        broker = InProcessBroker(buffer_size=2, queue_size=10)
+        live = broker.subscribe(1)
+        first = broker.publish(1, "task.created", {"id": 1})
+        broker.publish(2, "task.created", {"id": 2})
+        self.assertEqual(await live.get(1), first)
+
+        broker.publish(1, "task.updated", {"id": 1})
+        resumed = broker.subscribe(1, last_event_id=first.id)
+        self.assertEqual((await resumed.get(1)).type, "task.updated")
+
+    async def test_lost_events_ask_for_resync(self):
+        broker = InProcessBroker(buffer_size=1, queue_size=10)
+        first = broker.publish(1, "task.created", {"id": 1})
+        broker.publish(1, "task.updated", {"id": 1})
+        broker.publish(1, "task.deleted", {"id": 1})
+        self.assertIsNone(await broker.subscribe(1, first.id).get(1))
+        # an id from before a restart
+        self.assertIsNone(await broker.subscribe(1, 1000).get(1))
+
+    async def test_evicted_board_buffer_asks_for_resync(self):
+        broker = InProcessBroker(queue_size=10, max_boards=1)
+        first = broker.publish(1, "task.created", {"id": 1})
+        broker.publish(1, "task.updated", {"id": 1})
+        broker.publish(2, "task.created", {"id": 2})
+        self.assertIsNone(await broker.subscribe(1, first.id).get(1))
+
+    async def test_slow_subscriber_overflows(self):
+        broker = InProcessBroker(queue_size=2)
+        subscription = broker.subscribe(1)
+        for n in range(3):
+            broker.publish(1, "task.created", {"id": n})
+        await asyncio.sleep(0)
+        self.assertIsNone(await subscription.get(1))
+        broker.publish(1, "task.created", {"id": 3})
+        await asyncio.sleep(0)
+        self.assertTrue(subscription.queue.empty())
+
+
+class BoardEventStreamTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.board = self.make_board("Board", members=[self.user])
+        self.url = f"/api/boards/{self.board.id}/events/"
+        self.token = Token.objects.create(user=self.user)
+
+    def test_writes_publish_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            task = self.make_task(self.board)
+            task.comments.create(content="c", author=self.user)
+        self.assertEqual(len(callbacks), 2)
+
+        with mock.patch.object(get_broker(), "publish") as publish:
+            for callback in callbacks:
+                callback()
+        self.assertEqual(
+            [call.args[:2] for call in publish.call_args_list],
+            [(self.board.id, "task.created"),
+             (self.board.id, "comment.created")],
+        )
+
+    def test_requires_asgi(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 501)
+
+    async def test_requires_board_access(self):
+        client = AsyncClient()
+        response = await client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+        other = await User.objects.acreate(
+            email="other@example.com", fullname="other"
+        )
+        other_token = await Token.objects.acreate(user=other)
+        auth = {"Authorization": f"Token {other_token.key}"}
+        response = await client.get(self.url, headers=auth)
+        self.assertEqual(response.status_code, 403)
+        response = await client.get("/api/boards/999/events/", headers=auth)
+        self.assertEqual(response.status_code, 404)
+        # The API token is not accepted in the URL
+        response = await client.get(self.url, {"token": self.token.key})
+        self.assertEqual(response.status_code, 401)
+
+    def test_ticket(self):
+        url = f"{self.url}ticket/"
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, 201)
+        ticket = response.data["ticket"]
+        self.assertEqual(ticket_user_id(ticket, self.board.id), self.user.id)
+        # Bound to the board, and short-lived
+        self.assertIsNone(ticket_user_id(ticket, self.board.id + 1))
+        with self.settings(KANMIND_EVENT_TICKET_MAX_AGE=-1):
+            self.assertIsNone(ticket_user_id(ticket, self.board.id))
+        self.assertIsNone(ticket_user_id(ticket + "x", self.board.id))
+
+        other = APIClient()
+        other.force_authenticate(self.make_user("other"))
+        self.assertEqual(other.post(url).status_code, 403)
+        self.assertEqual(
+            other.post("/api/boards/999/events/ticket/").status_code, 404
+        )
+
+    async def test_streams_with_a_ticket(self):
+        client = AsyncClient()
+        ticket = issue_ticket(self.user.id, self.board.id)
+        response = await client.get(self.url, {"ticket": ticket})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+        get_broker().publish(self.board.id, "board.deleted", {})
+        await anext(stream)
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+
+        response = await client.get(self.url, {"ticket": "forged"})
+        self.assertEqual(response.status_code, 401)
+        response = await client.get(
+            "/api/boards/999/events/", {"ticket": ticket}
+        )
+        self.assertEqual(response.status_code, 401)
+        self.user.is_active = False
+        await self.user.asave()
+        response = await client.get(self.url, {"ticket": ticket})
+        self.assertEqual(response.status_code, 401)
+
+    async def test_streams_board_events(self):
+        response = await AsyncClient().get(
+            self.url, headers={"Authorization": f"Token {self.token.key}"}
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = aiter(response.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")
+
+        other = get_broker().publish(self.board.id + 1, "task.created", {})
+        event = get_broker().publish(
+            self.board.id, "task.created", {"id": 7}
+        )
+        frame = await anext(stream)
+        self.assertNotIn(f"id: {other.id}\n".encode(), frame)
+        self.assertEqual(frame, event.encode().encode())
+
+        get_broker().publish(self.board.id, "board.deleted", {})
+        await anext(stream)
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+
+
+class TaskBulkTests(APITestBase):
+    url = "/api/tasks/bulk/"
+
+    def setUp(self):
+        super().setUp()
+        self.member = self.make_user("member")
+        self.board = self.make_board("Board", members=[self.member])
+        self.other_board = self.make_board("Other", owner=self.member)
+
+    def items(self, count):
+        return [
+            {
+                "title": f"Task {n}",
+                "description": "Imported",
+                "board": self.board.id,
+                "assignee_id": self.member.id,
+            }
+            for n in range(count)
+        ]
+
+    def test_create_costs_the_same_for_any_size(self):
+        queries = []
+        for count in (1, 20):
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post(
+                    self.url, self.items(count), format="json"
+                )
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(len(response.data), count)
+            queries.append(len(ctx.captured_queries))
+        self.assertEqual(queries[0], queries[1])
+        self.assertEqual(
+            response.data[0]["assignee"]["id"], self.member.id
+        )
+        self.assertEqual(self.board.tasks.count(), 21)
+
+    def test_invalid_items_are_reported_and_nothing_is_written(self):
+        items = self.items(3)
+        items[0]["board"] = self.other_board.id
+        items[1]["board"] = 999
+        items[2]["assignee_id"] = 999
+        response = self.client.post(
+            self.url, items + self.items(1), format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("board", response.data[0])
+        self.assertIn("does not exist", response.data[1]["board"][0])
+        self.assertIn("assignee_id", response.data[2])
+        self.assertEqual(response.data[3], {})
+        self.assertFalse(Task.objects.exists())
+
+    def test_move_tasks(self):
+        tasks = [self.make_task(self.board) for _ in range(3)]
+        version = self.board.updated_at
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": task.id, "status": "done", "priority": "high"}
+                for task in tasks
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            {task["status"] for task in response.data}, {"done"}
+        )
+        self.assertEqual(
+            self.board.tasks.filter(status="done", priority="high").count(),
+            3,
+        )
+        self.board.refresh_from_db()
+        self.assertGreater(self.board.updated_at, version)
+
+    def test_update_checks_every_task(self):
+        task = self.make_task(self.board)
+        hidden = self.make_task(
+            self.make_board("Hidden", owner=self.member),
+            created_by=self.member,
+        )
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": task.id, "status": "done"},
+                {"id": task.id, "status": "review"},
+                {"id": hidden.id, "status": "done"},
+                {"id": 999, "status": "done"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            [str(errors["id"][0]) for errors in response.data],
+            [
+                "Duplicate task.",
+                "Duplicate task.",
+                "You do not have permission to perform this action.",
+                "Not found.",
+            ],
+        )
+
+    def test_delete_tasks_with_comments(self):
+        own = self.make_task(self.board)
+        own.comments.create(content="c", author=self.user)
+        members = self.make_task(self.board, created_by=self.member)
+        response = self.client.delete(
+            self.url, [{"id": own.id}, {"id": members.id}], format="json"
+        )
+        # the board owner may delete any of its tasks
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(self.board.tasks.exists())
+
+        task = self.make_task(self.board)
+        client = APIClient()
+        client.force_authenticate(self.member)
+        response = client.delete(self.url, [{"id": task.id}], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(Task.objects.filter(pk=task.pk).exists())
+
+    def test_publishes_one_event_per_task(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(self.url, self.items(3), format="json")
+        with mock.patch.object(get_broker(), "publish") as publish:
+            for callback in callbacks:
+                callback()
+        self.assertEqual(
+            [call.args[1] for call in publish.call_args_list],
+            ["task.created"] * 3,
+        )
+
+
+class CommentCountTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.task = self.make_task(self.make_board("b"))
+        self.url = f"/api/tasks/{self.task.id}/comments/"
+
+    def comments_count(self):
+        return Task.objects.values_list("comments_count", flat=True).get(
+            pk=self.task.pk
+        )
+
+    def test_api_writes_keep_the_count(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        for _ in range(2):
+            self.client.post(self.url, {"content": "c"}, format="json")
+        self.assertEqual(self.comments_count(), 2)
+
+        # saving an instance loaded before the comments keeps the count
+        stale.title = "Renamed"
+        stale.save()
+        self.assertEqual(self.comments_count(), 2)
+
+        comment = self.task.comments.first()
+        self.client.delete(f"{self.url}{comment.id}/")
+        self.assertEqual(self.comments_count(), 1)
+        response = self.client.get(f"/api/tasks/{self.task.id}/")
+        self.assertEqual(response.data["comments_count"], 1)
+
+    def test_reconcile_command(self):
+        self.task.comments.create(content="c", author=self.user)
+        Task.objects.update(comments_count=5)
+        with self.assertRaises(CommandError):
+            call_command(
+                "reconcile_comment_counts", "--check", stdout=StringIO()
+            )
+        call_command("reconcile_comment_counts", stdout=StringIO())
+        self.assertEqual(self.comments_count(), 1)
+
+
+class ConcurrentCommentCountTests(TransactionTestCase):
+    """Comments created from parallel connections are all counted."""
+
+    def test_concurrent_creates(self):
+        user = User.objects.create_user(
+            email="owner@example.com", password="pw", fullname="Owner User"
+        )
+        board = Board.objects.create(owner=user, title="b")
+        task = Task.objects.create(
+            board=board, title="t", description="", created_by=user
+        )
+        threads, per_thread = 8, 5
+        barrier = threading.Barrier(threads)
+        errors = []
+
+        def create_comment():
+            while True:
+                try:
+                    return Comment.objects.create(
+                        task_id=task.pk, author=user, content="c"
+                    )
+                except OperationalError as exc:
+                    # SQLite has one writer at a time, retry like a
+                    # client would
+                    if "locked" not in str(exc):
+                        raise
+                    time.sleep(0.001)
+
+        def create_comments():
+            try:
+                barrier.wait()
+                for _ in range(per_thread):
+                    create_comment()
+            except Exception as exc:  # reported by the assertion below
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        workers = [
+            threading.Thread(target=create_comments) for _ in range(threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(errors, [])
+        task.refresh_from_db()
+        self.assertEqual(task.comments_count, threads * per_thread)
+        self.assertEqual(task.comments.count(), threads * per_thread)
+
+
+class TaskFilterTests(APITestBase):
+    url = "/api/tasks/"
+
+    def setUp(self):
+        super().setUp()
+        self.member = self.make_user("m")
+        self.board = self.make_board("b", members=[self.member])
+        self.foreign = self.make_board("f", owner=self.member)
+        self.make_task(self.foreign, title="Foreign", created_by=self.member)
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [task["title"] for task in response.data["results"]]
+
+    def test_only_accessible_boards_are_listed(self):
+        self.make_task(self.board, title="Mine")
+        self.assertEqual(self.titles(), ["Mine"])
+        self.assertEqual(self.titles(board=self.foreign.id), [])
+
+    def test_filters(self):
+        self.make_task(
+            self.board, title="A", status="done", assignee=self.member
+        )
+        self.make_task(
+            self.board,
+            title="B",
+            priority="high",
+            reviewer=self.member,
+            due_date="2026-03-01",
+        )
+        self.make_task(self.board, title="C", due_date="2026-05-01")
+        self.assertEqual(self.titles(status="done"), ["A"])
+        self.assertEqual(self.titles(priority="high"), ["B"])
+        self.assertEqual(self.titles(assignee=self.member.id), ["A"])
+        self.assertEqual(self.titles(reviewer=self.member.id), ["B"])
+        self.assertEqual(self.titles(due_date="2026-05-01"), ["C"])
+        self.assertEqual(
+            self.titles(
+                due_date_after="2026-02-01", due_date_before="2026-04-01"
+            ),
+            ["B"],
+        )
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in ({"status": "later"}, {"ordering": "title"}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
+
+    def test_search(self):
+        self.make_task(self.board, title="Fix login", description="Token")
+        self.make_task(self.board, title="Docs", description="Login page")
+        self.make_task(self.board, title="Other", description="")
+        self.assertEqual(self.titles(search="login"), ["Fix login", "Docs"])
+        self.assertEqual(self.titles(search="login token"), ["Fix login"])
+        self.assertEqual(len(self.titles(search="")), 3)
+
+    def test_ordering_pages_through_nulls_and_ties(self):
+        dates = [None, "2026-01-02", "2026-01-01", None, "2026-01-01"]
+        for n, due_date in enumerate(dates):
+            self.make_task(self.board, title=str(n), due_date=due_date)
+        for ordering, expected in (
+            ("due_date", ["2", "4", "1", "0", "3"]),
+            ("-due_date", ["3", "0", "1", "4", "2"]),
+        ):
+            titles = []
+            response = self.client.get(
+                self.url, {"ordering": ordering, "page_size": 2}
+            )
+            while True:
+                titles += [t["title"] for t in response.data["results"]]
+                if not response.data["next"]:
+                    break
+                response = self.client.get(response.data["next"])
+            self.assertEqual(titles, expected)
+
+        response = self.client.get(self.url, {"ordering": "priority"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_ordering_pages_past_the_offset_cutoff(self):
+        # More ties than CursorPagination.offset_cutoff (1000)
+        Task.objects.bulk_create(
+            Task(board=self.board, title=str(n), created_by=self.user)
+            for n in range(1100)
+        )
+        expected = list(
+            Task.objects.filter(board=self.board)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        for ordering, order in (("status", 1), ("-status", -1)):
+            with self.subTest(ordering=ordering):
+                ids, pages = [], []
+                response = self.client.get(
+                    self.url, {"ordering": ordering, "page_size": 200}
+                )
+                while True:
+                    pages.append(response.data["results"])
+                    ids += [task["id"] for task in response.data["results"]]
+                    if not response.data["next"]:
+                        break
+                    response = self.client.get(response.data["next"])
+                self.assertEqual(len(pages), 6)
+                self.assertEqual(ids, expected[::order])
+
+                # and back again through the previous links
+                for page in reversed(pages[:-1]):
+                    response = self.client.get(response.data["previous"])
+                    self.assertEqual(response.data["results"], page)
+                self.assertIsNone(response.data["previous"])
+
+
+class AsyncViewTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.token = Token.objects.create(user=self.user)
+        self.async_client = APIClient()
+        self.async_client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.token.key}"
+        )
+        self.board = self.make_board("b", members=[self.user])
+        self.task = self.make_task(self.board, assignee=self.user)
+
+    def assertSameResults(self, path):
+        expected = self.client.get(f"/api/{path}").json()["results"]
+        response = self.async_client.get(f"/api/async/{path}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], expected)
+
+    def test_bodies_match_the_drf_views(self):
+        self.make_board("other")
+        self.task.comments.create(content="c", author=self.user)
+        for path in [
+            "boards/",
+            "tasks/assigned-to-me/",
+            "tasks/reviewing/",
+            f"tasks/{self.task.id}/comments/",
+        ]:
+            with self.subTest(path=path):
+                self.assertSameResults(path)
+
+        for query in (
+            "",
+            "?view=summary",
+            "?view=columns&page_size=1",
+            "?status=to-do&page_size=1",
+        ):
+            with self.subTest(query=query):
+                path = f"boards/{self.board.id}/{query}"
+                expected = self.client.get(f"/api/{path}").json()
+                response = self.async_client.get(f"/api/async/{path}")
+                self.assertEqual(response.json(), expected)
+
+    def test_keyset_pages_both_ways(self):
+        for i in range(4):
+            self.task.comments.create(content=str(i), author=self.user)
+        url = f"/api/async/tasks/{self.task.id}/comments/?page_size=3"
+        first = self.async_client.get(url).json()
+        self.assertIsNone(first["previous"])
+        second = self.async_client.get(first["next"]).json()
+        self.assertEqual([c["content"] for c in second["results"]], ["3"])
+        self.assertIsNone(second["next"])
+        back = self.async_client.get(second["previous"]).json()
+        self.assertEqual(back["results"], first["results"])
+        self.assertIsNone(back["previous"])
+        self.assertIsNotNone(back["next"])
+
+        response = self.async_client.get(url + "&cursor=bogus")
+        self.assertEqual(response.status_code, 404)
+
+    def test_forged_cursors_are_not_found(self):
+        for path, key in [
+            ("boards/", ["x"]),
+            ("boards/", [1, 2]),
+            ("tasks/assigned-to-me/", [None]),
+            (f"tasks/{self.task.id}/comments/", ["garbage", 1]),
+            (f"tasks/{self.task.id}/comments/", ["2026-01-01T00:00:00", 1]),
+        ]:
+            with self.subTest(path=path, key=key):
+                response = self.async_client.get(
+                    f"/api/async/{path}", {"cursor": forged_cursor(key)}
+                )
+                self.assertEqual(response.status_code, 404)
+        for params in ({}, {"ordering": "due_date"}):
+            for key in (["x"], ["x", 1], [None, None], {"id": 1}):
+                with self.subTest(params=params, key=key):
+                    response = self.client.get(
+                        "/api/tasks/", {**params, "cursor": forged_cursor(key)}
+                    )
+                    self.assertEqual(response.status_code, 404)
+
+    def test_conditional_get(self):
+        url = f"/api/async/boards/{self.board.id}/"
+        etag = self.async_client.get(url)["ETag"]
+        response = self.async_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_errors(self):
+        response = APIClient().get("/api/async/boards/")
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response["WWW-Authenticate"], "Token")
+
+        other = APIClient()
+        other_token = Token.objects.create(user=self.make_user("other"))
+        other.credentials(HTTP_AUTHORIZATION=f"Token {other_token.key}")
+        for path in [
+            f"boards/{self.board.id}/",
+            f"tasks/{self.task.id}/comments/",
+        ]:
+            response = other.get(f"/api/async/{path}")
+            self.assertEqual(response.status_code, 403)
+        response = other.get("/api/async/tasks/999/comments/")
+        self.assertEqual(response.status_code, 404)
+
+        response = self.async_client.post("/api/async/boards/", {})
+        self.assertEqual(response.status_code, 405)
+
+
+class CompiledSerializerTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.other = self.make_user("other")
+        self.board = self.make_board("b", members=[self.user, self.other])
+        self.make_task(
+            self.board,
+            assignee=self.user,
+            due_date=datetime.date(2026, 1, 31),
+            priority="high",
+        )
+        task = self.make_task(self.board, reviewer=self.other)
+        task.comments.create(content="c", author=self.other)
+
+    def assertSameOutput(self, compiled, expected):
+        # Key order included
+        self.assertEqual(
+            [list(item.items()) for item in compiled],
+            [list(item.items()) for item in expected],
+        )
+
+    def test_matches_the_serializers(self):
+        tasks = task_queryset().order_by("pk")
+        comments = Comment.objects.order_by("pk")
+        users = User.objects.order_by("pk")
+        for compiled, serializer, queryset in [
+            (CompiledTaskSerializer(), TaskSerializer, tasks),
+            (CompiledCommentSerializer(), CommentSerializer, comments),
+            (CompiledUserSerializer(), UserSerializer, users),
+        ]:
+            with self.subTest(serializer=serializer.__name__):
+                self.assertSameOutput(
+                    compiled.data(compiled.values(queryset)),
+                    serializer(queryset, many=True).data,
+                )
+
+    def test_sparse_fieldset_skips_joins(self):
+        compiled = CompiledTaskSerializer({"id", "title", "unknown"})
+        rows = compiled.values(task_queryset())
+        self.assertNotIn("JOIN", str(rows.query))
+        self.assertEqual(
+            [list(row) for row in compiled.data(rows)], [["id", "title"]] * 2
+        )
+
+    def test_board_detail(self):
+        expected = BoardFullSerializer(
+            board_detail_queryset().get(pk=self.board.pk)
+        ).data
+        with self.assertNumQueries(2):
+            data = board_full_data(self.board)
+        self.assertEqual(data, expected)
+
+
+class FastJSONTests(TestCase):
+    data = {
+        "text": "Grüße \u2028",
+        "amount": Decimal("1.50"),
+        "day": datetime.date(2026, 1, 31),
+        "at": datetime.datetime(
+            2026, 1, 31, 9, 30, 0, 123456, tzinfo=datetime.timezone.utc
+        ),
+        "time": datetime.time(9, 30, 0, 123456),
+        "lazy": gettext_lazy("Not found."),
+        1: [None, True, 1.5],
+    }
+
+    def test_renders_like_drf(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data),
+            JSONRenderer().render(self.data),
+        )
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, "application/json; indent=2"),
+            JSONRenderer().render(self.data, "application/json; indent=2"),
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b"")
+
+    def test_wide_integers_fall_back_to_drf(self):
+        data = {"id": 2**64, "at": self.data["at"]}
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
+
+    def test_parses_like_drf(self):
+        body = '{"title": "Grüße", "ids": [1, 2], "due_date": null}'
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(body.encode())),
+            JSONParser().parse(BytesIO(body.encode())),
+        )
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title": '))
+
+
+class BoardCacheTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.member = self.make_user("member")
+        self.board = self.make_board("b", members=[self.member])
+        self.task = self.make_task(self.board)
+        self.url = f"/api/boards/{self.board.id}/"
+        registry.clear()
+
+    def lookups(self, result):
+        return registry.counter_value(
+            "kanmind_board_cache_total", tier="local", result=result
+        )
+
+    def test_repeated_gets_are_served_from_cache(self):
+        first = self.client.get(self.url)
+        self.assertEqual(self.lookups("miss"), 1)
+        member = APIClient()
+        member.force_authenticate(self.member)
+        member.get(self.url)
+        # board lookup only; access is cached by the first GET
+        with self.assertNumQueries(1):
+            response = member.get(self.url)
+        self.assertEqual(self.lookups("hit"), 2)
+        self.assertEqual(response.content, first.content)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.data["id"], self.board.id)
+
+    def test_permissions_are_checked_per_request(self):
+        self.client.get(self.url)
+        other = APIClient()
+        other.force_authenticate(self.make_user("other"))
+        self.assertEqual(other.get(self.url).status_code, 403)
+
+    def rename_board(self):
+        self.board.refresh_from_db()
+        self.board.title = "renamed"
+        self.board.save()
+
+    def test_writes_invalidate(self):
+        writes = [
+            lambda: self.make_task(self.board, title="new"),
+            lambda: self.task.comments.create(content="c", author=self.user),
+            lambda: self.board.members.add(self.make_user("m")),
+            self.rename_board,
+            lambda: self.task.delete(),
+        ]
+        body = self.client.get(self.url).content
+        for write in writes:
+            write()
+            self.assertNotIn(self.board.pk, local_bodies._data)
+            new_body = self.client.get(self.url).content
+            self.assertNotEqual(new_body, body)
+            body = new_body
+
+    def test_user_changes_invalidate(self):
+        self.client.get(self.url)
+        self.member.fullname = "New Name"
+        self.member.save(update_fields=["fullname"])
+        self.assertContains(self.client.get(self.url), "New Name")
+
+    def test_indented_json_is_rendered(self):
+        response = self.client.get(
+            self.url, HTTP_ACCEPT="application/json; indent=2"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'\n  "id"', response.content)
+
+
+@override_settings(
+    KANMIND_READ_REPLICAS=["replica"],
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+)
+class ReplicaRoutingTests(TransactionTestCase):
+    """Routing against a second SQLite database standing in as replica.
+
+    Nothing is replicated to it, so a read shows which database served
+    it. The alias only exists while these tests run, so it is added
+    (and allowed) after the test runner's checks and database setup.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        connections.settings["replica"] = connections.configure_settings(
+            {
+                "default": connections.settings["default"],
+                "replica": {
+                    "ENGINE": "django.db.backends.sqlite3",
+                    "NAME": "file:kanmind_replica?mode=memory&cache=shared",
+                },
+            }
+        )["replica"]
+        cls.databases = {"default", "replica"}
+        call_command("migrate", database="replica", verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections["replica"].connection.close()
+        del connections["replica"]
+        del connections.settings["replica"]
+
+    def setUp(self):
+        cache.clear()
+        local_tokens.clear()
+        local_bodies.clear()
+        self.user = User.objects.create_user(
+            email="owner@example.com", password="pw", fullname="Owner User"
+        )
+        self.board = Board.objects.create(owner=self.user, title="b")
+        token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    def board_ids(self):
+        response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 200)
+        return [board["id"] for board in response.data["results"]]
+
+    def test_safe_requests_read_from_a_replica(self):
+        self.assertEqual(self.board_ids(), [])
+        with override_settings(KANMIND_READ_REPLICAS=[]):
+            self.assertEqual(self.board_ids(), [self.board.id])
+
+    def test_writers_are_pinned_to_the_primary(self):
+        response = self.client.post(
+            "/api/tasks/",
+            {"board": self.board.id, "title": "t", "description": "d"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.board_ids(), [self.board.id])
+        # Once the pin expires, reads go back to the replica
+        cache.clear()
+        self.assertEqual(self.board_ids(), [])
+
+    def test_router(self):
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Board), "default")
+        token = _routing.set(RequestRouting("replica"))
+        try:
+            self.assertEqual(router.db_for_read(Board), "replica")
+            self.assertEqual(router.db_for_read(Token), "default")
+            with transaction.atomic():
+                self.assertEqual(router.db_for_read(Board), "default")
+            router.db_for_write(Board)
+            self.assertEqual(router.db_for_read(Board), "default")
+        finally:
+            _routing.reset(token)
+
+
+class RequestMetricsTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        registry.clear()
+        self.board = self.make_board("b")
+
+    def test_server_timing_and_metrics(self):
+        response = self.client.get("/api/boards/")
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        self.assertIn("app;dur=", timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("render;dur=", timing)
+        labels = {"view": "api/boards/", "method": "GET"}
+        summary = registry.summary(
+            "kanmind_request_seconds", status="2xx", **labels
+        )
+        self.assertEqual(summary.count, 1)
+        queries = registry.summary("kanmind_request_queries", **labels)
+        self.assertGreaterEqual(queries.total, 1)
+        size = registry.summary("kanmind_response_bytes", **labels)
+        self.assertEqual(size.total, len(response.content))
+
+    async def test_async_requests(self):
+        token = await Token.objects.acreate(user=self.user)
+        response = await AsyncClient().get(
+            "/api/async/tasks/assigned-to-me/",
+            headers={"Authorization": f"Token {token.key}"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("serialize;dur=", response["Server-Timing"])
+        queries = registry.summary(
+            "kanmind_request_queries",
+            view="api/async/tasks/assigned-to-me/",
+            method="GET",
+        )
+        self.assertGreaterEqual(queries.total, 2)
+
+    def test_repeated_query_shapes_are_flagged(self):
+        def view(request):
+            for pk in range(6):
+                list(Task.objects.filter(pk=pk))
+            list(Task.objects.filter(pk__in=[1, 2, 3]))
+            return HttpResponse()
+
+        middleware = RequestMetricsMiddleware(view)
+        with self.assertLogs("kanmind.requests", "WARNING") as logs:
+            middleware(RequestFactory().get("/x"))
+        event = json.loads(logs.records[0].getMessage())
+        self.assertEqual(event["event"], "n_plus_one")
+        self.assertEqual(len(event["queries"]), 1)
+        self.assertEqual(event["queries"][0]["count"], 6)
+        self.assertEqual(
+            registry.counter_value(
+                "kanmind_n_plus_one_total", view="unmatched", method="GET"
+            ),
+            1,
+        )
+
+    def test_phase_outside_a_request(self):
+        with phase("serialize"):
+            pass
+
+    def test_metrics_endpoint(self):
+        client = APIClient()
+        self.assertEqual(client.get("/metrics").status_code, 404)
+        with override_settings(KANMIND_METRICS_TOKEN="s3cret"):
+            self.assertEqual(client.get("/metrics").status_code, 401)
+            client.credentials(HTTP_AUTHORIZATION="Bearer wrong")
+            self.assertEqual(client.get("/metrics").status_code, 401)
+            self.client.get("/api/boards/")
+            client.credentials(HTTP_AUTHORIZATION="Bearer s3cret")
+            response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        body = response.content.decode()
+        self.assertIn("# TYPE kanmind_request_seconds summary", body)
+        self.assertIn(
+            'kanmind_request_seconds_count{method="GET",status="2xx",'
+            'view="api/boards/"} 1',
+            body,
+        )
+
+    def test_expose_escapes_labels(self):
+        registry.inc("kanmind_test_total", 2, title='a"b\\c')
+        self.assertIn(
+            'kanmind_test_total{title="a\\"b\\\\c"} 2', registry.expose()
+        )
+
+
+@override_settings(KANMIND_SYNC_OVERLAP_SECONDS=0)
+class BoardChangesTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.member = self.make_user("m")
+        self.board = self.make_board("b", members=[self.member])
+        self.task = self.make_task(self.board)
+        self.comment = self.task.comments.create(
+            content="c", author=self.user
+        )
+        self.comment_id = self.comment.id
+        self.url = f"/api/boards/{self.board.id}/changes/"
+
+    def sync(self, cursor=None, status=200):
+        params = {} if cursor is None else {"since": cursor}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+    def test_full_sync_without_cursor(self):
+        data = self.sync()
+        self.assertEqual(
+            [task["id"] for task in data["tasks"]], [self.task.id]
+        )
+        self.assertEqual(data["tasks"][0]["comments_count"], 1)
+        self.assertEqual(data["comments"][0]["task"], self.task.id)
+        self.assertEqual(
+            [member["id"] for member in data["members"]], [self.member.id]
+        )
+
+    def test_returns_only_the_churn(self):
+        cursor = self.sync()["cursor"]
+        data = self.sync(cursor)
+        self.assertEqual(data["tasks"], [])
+        self.assertIsNone(data["members"])
+
+        other = self.make_task(self.board, title="other")
+        self.task.comments.create(content="new", author=self.member)
+        self.comment.delete()
+        self.board.members.add(self.user)
+        data = self.sync(cursor)
+        self.assertEqual(
+            sorted(task["id"] for task in data["tasks"]),
+            [self.task.id, other.id],
+        )
+        self.assertEqual(
+            [comment["content"] for comment in data["comments"]], ["new"]
+        )
+        self.assertEqual(data["deleted"]["comments"], [self.comment_id])
+        self.assertEqual(len(data["members"]), 2)
+
+        cursor = data["cursor"]
+        other_id = other.id
+        other.delete()
+        data = self.sync(cursor)
+        self.assertEqual(
+            data["deleted"], {"tasks": [other_id], "comments": []}
+        )
+        self.assertIsNone(data["members"])
+
+    def test_deleting_a_board_owner(self):
+        # The owner's board goes; their rows on another board leave
+        # tombstones there
+        other_board = self.make_board("o", owner=self.member)
+        kept = self.make_task(other_board, created_by=self.member)
+        gone = self.make_task(other_board)
+        comment = kept.comments.create(content="c", author=self.user)
+        expected = {
+            (other_board.id, "task", gone.id),
+            (other_board.id, "comment", comment.id),
+        }
+        self.user.delete()
+        self.assertFalse(Board.objects.filter(pk=self.board.id).exists())
+        self.assertEqual(
+            set(Tombstone.objects.values_list("board", "kind", "object_id")),
+            expected,
+        )
+        self.assertEqual(rebuild_board_stats(fix=False), [])
+        kept.refresh_from_db()
+        self.assertEqual(kept.comments_count, 0)
+
+    def test_bulk_writes_and_renames_are_changes(self):
+        cursor = self.sync()["cursor"]
+        self.task.status = "done"
+        update_tasks([self.task], ["status"])
+        self.assertEqual(len(self.sync(cursor)["tasks"]), 1)
+
+        cursor = self.sync()["cursor"]
+        self.user.fullname = "Renamed User"
+        self.user.save()
+        data = self.sync(cursor)
+        self.assertEqual(
+            data["tasks"][0]["created_by"]["fullname"], "Renamed User"
+        )
+        self.assertEqual(len(data["comments"]), 1)
+
+        cursor = self.sync()["cursor"]
+        task_id = self.task.id
+        delete_tasks([self.task])
+        self.assertEqual(self.sync(cursor)["deleted"]["tasks"], [task_id])
+
+    def test_reload_required(self):
+        self.sync("not-a-cursor", status=400)
+        self.sync("1", status=410)
+        cursor = self.sync()["cursor"]
+        self.make_task(self.board)
+        self.make_task(self.board)
+        with override_settings(KANMIND_SYNC_MAX_CHANGES=1):
+            self.sync(cursor, status=410)
+
+    def test_prune_tombstones(self):
+        self.make_task(self.board).delete()
+        Tombstone.objects.update(deleted_at=retention_horizon())
+        self.comment.delete()
+        call_command("prune_tombstones", stdout=StringIO())
+        self.assertEqual(
+            list(Tombstone.objects.values_list("kind", "object_id")),
+            [("comment", self.comment_id)],
+        )
+
+    def test_permissions(self):
+        stranger = self.make_user("s")
+        self.client.force_authenticate(stranger)
+        self.sync(status=403)
+        self.url = "/api/boards/999/changes/"
+        self.sync(status=404)
+
+
+class BoardViewTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.member = self.make_user("m")
+        self.board = self.make_board("b", members=[self.member])
+        self.url = f"/api/boards/{self.board.id}/"
+        self.todo = [self.make_task(self.board) for _ in range(5)]
+        self.done = self.make_task(self.board, status="done")
+
+    def get(self, query, client=None):
+        response = (client or self.client).get(self.url + query)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_summary_reads_the_counters(self):
+        with self.assertNumQueries(1):  # board with its stats and access
+            data = self.get("?view=summary")
+        self.assertEqual(data["member_count"], 1)
+        self.assertEqual(data["task_count"], 6)
+        self.assertEqual(
+            data["columns"],
+            [
+                {"status": "to-do", "count": 5},
+                {"status": "in-progress", "count": 0},
+                {"status": "review", "count": 0},
+                {"status": "done", "count": 1},
+            ],
+        )
+
+    def test_columns_window(self):
+        full = self.get("")
+        with self.assertNumQueries(3):  # board, task windows, members
+            data = self.get("?view=columns&page_size=2")
+        self.assertEqual(data["members"], full["members"])
+        columns = {column["status"]: column for column in data["columns"]}
+        self.assertEqual(list(columns), [s for s, _ in Task.STATUS_CHOICES])
+        self.assertEqual(columns["to-do"]["tasks"], full["tasks"][:2])
+        self.assertEqual(columns["to-do"]["count"], 5)
+        self.assertEqual(columns["done"]["tasks"], full["tasks"][5:])
+        self.assertIsNone(columns["done"]["next"])
+        self.assertEqual(columns["review"]["tasks"], [])
+
+        # Following "next" walks the rest of the column
+        tasks, url = [], columns["to-do"]["next"]
+        while url:
+            page = self.client.get(url).json()
+            self.assertEqual(page["status"], "to-do")
+            tasks += page["tasks"]
+            url = page["next"]
+        self.assertEqual(tasks, full["tasks"][2:5])
+
+    def test_status_fetch(self):
+        data = self.get(f"?status=to-do&after={self.todo[3].id}")
+        self.assertEqual(
+            [task["id"] for task in data["tasks"]], [self.todo[4].id]
+        )
+        self.assertEqual(data["count"], 5)
+        self.assertIsNone(data["next"])
+
+        for query in ["?status=later", "?view=all", "?page_size=0"]:
+            response = self.client.get(self.url + query)
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_variants_have_their_own_etags(self):
+        etags = {
+            self.client.get(self.url + query)["ETag"]
+            for query in [
+                "",
+                "?view=summary",
+                "?view=columns",
+                "?view=columns&page_size=5",
+                "?status=done",
+                "?status=done&after=1",
+            ]
+        }
+        self.assertEqual(len(etags), 6)
+        response = self.client.get(
+            self.url + "?view=summary",
+            HTTP_IF_NONE_MATCH=self.client.get(self.url + "?view=summary")[
+                "ETag"
+            ],
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_async_view_matches(self):
+        token = Token.objects.create(user=self.user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+        for query in ["?view=summary", "?view=columns&page_size=2"]:
+            expected = self.get(query)
+            response = client.get(f"/api/async/boards/{self.board.id}/{query}")
+            data = response.json()
+            for column in data.get("columns", []):
+                if column.get("next"):
+                    # Links point at the endpoint that made them
+                    column["next"] = column["next"].replace("/async", "")
+            self.assertEqual(data, expected)
+
+
+@override_settings(KANMIND_ARCHIVE_CHUNK_SIZE=2)
+class BoardArchiveTests(APITestBase):
+    def setUp(self):
+        super().setUp()
+        self.member = self.make_user("m")
+        self.board = self.make_board("b", members=[self.member])
+        for i in range(3):
+            task = self.make_task(
+                self.board,
+                title=f"t{i}",
+                description="d",
+                status="done",
+                priority="high",
+                assignee=self.member,
+                due_date=datetime.date(2026, 1, i + 1),
+            )
+            task.comments.create(content=f"c{i}", author=self.member)
+        self.make_task(self.board, description="d", reviewer=self.member)
+
+    def export(self, board_id=None):
+        response = self.client.get(
+            f"/api/boards/{board_id or self.board.id}/export/"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        chunks = list(response.streaming_content)
+        return b"".join(chunks), len(chunks)
+
+    def import_(self, archive, status=201, title="copy"):
+        response = self.client.post(
+            f"/api/boards/import/?title={title}",
+            archive,
+            content_type="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, status, response.content)
+        return response.json()
+
+    def test_round_trip(self):
+        archive, chunks = self.export()
+        lines = archive.splitlines()
+        self.assertEqual(len(lines), 1 + 1 + 4 + 3)
+        self.assertEqual(chunks, 5)  # chunks of two records
+        # Datetimes are written as the API writes them
+        self.assertTrue(json.loads(lines[-1])["created_at"].endswith("Z"))
+
+        result = self.import_(archive)
+        self.assertEqual(
+            (result["members"], result["tasks"], result["comments"]),
+            (1, 4, 3),
+        )
+        copy = Board.objects.get(pk=result["id"])
+        self.assertEqual(copy.owner, self.user)
+        original, imported = board_full_data(self.board), board_full_data(copy)
+        self.assertEqual(imported["members"], original["members"])
+        for task in original["tasks"] + imported["tasks"]:
+            del task["id"], task["board"]
+        self.assertEqual(imported["tasks"], original["tasks"])
+        self.assertEqual(
+            list(
+                Comment.objects.filter(task__board=copy)
+                .order_by("pk")
+                .values_list("content", "created_at", "author")
+            ),
+            list(
+                Comment.objects.filter(task__board=self.board)
+                .order_by("pk")
+                .values_list("content", "created_at", "author")
+            ),
+        )
+        self.assertEqual(rebuild_board_stats(fix=False), [])
+        self.assertEqual(copy.stats.done_count, 3)
+
+        # The import's own export matches, up to ids and the title
+        self.assertEqual(len(self.export(copy.pk)[0].splitlines()), 9)
+
+    def test_bad_archives_write_nothing(self):
+        archive, _ = self.export()
+        boards = Board.objects.count()
+        lines = archive.splitlines()
+
+        error = self.import_(b"\n".join(lines[1:]), status=400)
+        self.assertEqual(error["line"], "1")
+        broken = lines[:4] + [b"{not json"] + lines[4:]
+        self.assertEqual(self.import_(b"\n".join(broken), 400)["line"], "5")
+        bad_status = lines[2].replace(b'"done"', b'"later"')
+        error = self.import_(b"\n".join([lines[0], bad_status]), 400)
+        self.assertIn("status", str(error["detail"]))
+        self.import_(archive, status=400, title="b")  # title taken
+        self.member.delete()
+        error = self.import_(archive, status=400)
+        self.assertIn("user", str(error["detail"]))
+        self.assertEqual(Board.objects.count(), boards)
+
+    def test_export_requires_access(self):
+        self.client.force_authenticate(self.make_user("s"))
+        response = self.client.get(f"/api/boards/{self.board.id}/export/")
+        self.assertEqual(response.status_code, 403)
+
+
+# Size of the RouteBudgetTests data set, see kanmind_app.seeding
+SEED_SCALE = int(os.environ.get("KANMIND_SEED_SCALE", 1))
+
+# (queries, milliseconds) per request of seeding.route_requests(), with
+# cold caches. Query counts must not grow with the data; latencies are
+# generous ceilings meant to catch order-of-magnitude regressions.
+ROUTE_BUDGETS = {
+    ("POST", "registration/"): (7, 250),
+    ("POST", "login/"): (3, 250),
+    ("POST", "logout/"): (2, 100),
+    ("GET", "email-check/"): (3, 100),
+    ("GET", "boards/"): (2, 100),
+    ("POST", "boards/"): (11, 150),
+    ("GET", "boards/<int:board_id>/"): (4, 250),
+    ("PATCH", "boards/<int:board_id>/"): (7, 150),
+    ("GET", "boards/<int:board_id>/changes/"): (5, 100),
+    ("GET", "boards/<int:board_id>/export/"): (5, 1000),
+    ("POST", "boards/<int:board_id>/events/ticket/"): (2, 100),
+    ("POST", "boards/import/"): (32, 2000),
+    ("GET", "tasks/"): (3, 150),
+    ("POST", "tasks/"): (9, 150),
+    ("POST", "tasks/bulk/"): (9, 250),
+    ("PATCH", "tasks/bulk/"): (10, 250),
+    ("DELETE", "tasks/bulk/"): (12, 250),
+    ("GET", "tasks/<int:task_id>/"): (2, 100),
+    ("PATCH", "tasks/<int:task_id>/"): (8, 150),
+    ("DELETE", "tasks/<int:task_id>/"): (8, 150),
+    ("GET", "tasks/assigned-to-me/"): (2, 100),
+    ("GET", "tasks/reviewing/"): (2, 100),
+    ("GET", "tasks/<int:task_id>/comments/"): (4, 100),
+    ("GET", "tasks/<int:task_id>/comments/timeline/"): (4, 100),
+    ("POST", "tasks/<int:task_id>/comments/"): (9, 150),
+    ("DELETE", "tasks/<int:task_id>/comments/<int:comment_id>/"): (6, 150),
+    ("GET", "async/boards/"): (2, 150),
+    ("GET", "async/boards/<int:board_id>/"): (4, 250),
+    ("GET", "async/tasks/assigned-to-me/"): (2, 150),
+    ("GET", "async/tasks/reviewing/"): (2, 150),
+    ("GET", "async/tasks/<int:task_id>/comments/"): (3, 150),
+}
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class RouteBudgetTests(TestCase):
+    """Every API route against ROUTE_BUDGETS, on seeding.seed() data.
+
+    KANMIND_SEED_SCALE=N runs the suite on N times the data; the query
+    counts must stay the same.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed(SEED_SCALE)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Token {self.data.token.key}"
+        )
+
+    def test_every_route_has_a_budget(self):
+        requests = route_requests(self.data)
+        routes = {pattern.pattern._route for pattern in urlpatterns}
+        routes.discard("boards/<int:board_id>/events/")  # never finishes
+        self.assertEqual({request.route for request in requests}, routes)
+        self.assertEqual(
+            {(request.method, request.route) for request in requests},
+            set(ROUTE_BUDGETS),
+        )
+
+    def test_routes_stay_within_budget(self):
+        for request in route_requests(self.data):
+            queries, ms = ROUTE_BUDGETS[request.method, request.route]
+            with self.subTest(method=request.method, route=request.route):
+                response, count, elapsed = replay(self.client, request)
+                body = None if response.streaming else response.content
+                self.assertLess(response.status_code, 300, body)
+                self.assertEqual(count, queries, "query budget")
+                self.assertLess(elapsed * 1000, ms, "latency budget")
+
+    def test_seeded_counters(self):
+        self.assertEqual(rebuild_board_stats(fix=False), [])
+        self.assertEqual(self.data.task.comments_count, 2)
+        self.assertEqual(self.data.board.members.count(), 30)
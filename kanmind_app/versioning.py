@@ -0,0 +1,29 @@
+"""Board-level versioning.
+
+``Board.updated_at`` is the version of everything rendered under a
+board. Task, comment and membership writes bump it through the signal
+handlers in ``kanmind_app.signals``, so a board's version is a single
+indexed column read, and bumping it also evicts the board's cached
+detail body (kanmind_app.board_cache).
+"""
+
+from django.utils import timezone
+
+from kanmind_app.board_cache import evict_boards
+from kanmind_app.models import Board
+
+
+def touch_boards(board_ids, members=False):
+    """Bump the version of the given boards.
+
+    ``members=True`` also records a membership change (see
+    kanmind_app.sync).
+    """
+    board_ids = set(board_ids)
+    if board_ids:
+        now = timezone.now()
+        fields = {"updated_at": now}
+        if members:
+            fields["members_updated_at"] = now
+        Board.objects.filter(pk__in=board_ids).update(**fields)
+        evict_boards(board_ids)
@@ -1,3 +1,24 @@
-from django.shortcuts import render
+import hmac
 
-# Create your views here.
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+from kanmind_app.metrics import registry
+
+
+def metrics(request):
+    """This process' metrics, for Prometheus.
+
+    Requires ``Authorization: Bearer <KANMIND_METRICS_TOKEN>``; without
+    a configured token the endpoint does not exist. Other worker
+    processes' metrics are not included.
+    """
+    token = settings.KANMIND_METRICS_TOKEN
+    if not token:
+        raise Http404
+    given = request.headers.get("Authorization", "")
+    if not hmac.compare_digest(given.encode(), f"Bearer {token}".encode()):
+        return HttpResponse(status=401, headers={"WWW-Authenticate": "Bearer"})
+    return HttpResponse(
+        registry.expose(), content_type="text/plain; version=0.0.4"
+    )